@@ -0,0 +1,58 @@
+"""
+Command-line tool to examine a batch of positions without a display, e.g.
+
+    python analyse.py positions.epd --format csv --workers 0 > status.csv
+
+It reads one FEN or EPD record per line from a file or the standard input and writes the number of legal moves and
+the check, mate and stalemate status of the side to move for every position, as JSON lines or CSV.
+Lines that cannot be read are reported with an error instead of stopping the batch.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from game.core.analysis import AnalysisResult, analyse_lines
+
+
+def write_json_lines(results, output):
+    """
+    Args:
+        results (Iterable[AnalysisResult]): results to write
+        output (TextIO): stream to write to
+    """
+    for result in results:
+        output.write(json.dumps(result._asdict()) + "\n")
+
+
+def write_csv(results, output):
+    """
+    Args:
+        results (Iterable[AnalysisResult]): results to write
+        output (TextIO): stream to write to
+    """
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(AnalysisResult._fields)
+    writer.writerows(results)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Examines a batch of positions in FEN or EPD.")
+    parser.add_argument("input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+                        help="file with one position per line (default: the standard input)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json", help="output format (default: json)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes to examine the positions in, 0 for one per CPU")
+    parser.add_argument("--chunk-size", type=int, default=256, help="number of lines sent to a worker at once")
+    args = parser.parse_args(arguments)
+
+    results = analyse_lines(args.input, args.workers or None, args.chunk_size)
+    if args.format == "csv":
+        write_csv(results, sys.stdout)
+    else:
+        write_json_lines(results, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
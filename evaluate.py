@@ -0,0 +1,61 @@
+"""
+Command-line tool to benchmark the static evaluation of the engine, e.g.
+
+    python evaluate.py 3 --fen "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+It walks the legal move tree of the position down to the given depth and evaluates every position on the way, once
+by scanning the board of a `Position` and once incrementally with an `EvaluatedPosition`. It prints the score of the
+position and the positions evaluated per second by both, including the time to make and unmake the moves.
+"""
+
+import argparse
+import time
+
+from game.core import movegen
+from game.core.evaluation import EvaluatedPosition, evaluate
+from game.core.position import Position, START_FEN
+
+
+def evaluate_tree(position, depth):
+    """
+    Evaluates the position and every position below it in the legal move tree.
+
+    Args:
+        position (Position): root of the tree, which is restored afterwards
+        depth (int): depth of the tree in plies
+
+    Returns:
+        tuple(int, int): number of positions evaluated and the sum of their scores
+    """
+    count, total = 1, evaluate(position)
+    if depth > 0:
+        for move in movegen.legal_moves(position):
+            position.make_move(move)
+            nodes, score = evaluate_tree(position, depth - 1)
+            position.unmake_move()
+            count += nodes
+            total += score
+    return count, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the static evaluation over the legal move tree.")
+    parser.add_argument("depth", type=int, nargs="?", default=3, help="depth of the tree in plies (default: 3)")
+    parser.add_argument("--fen", default=START_FEN, help="position to start from (default: the initial position)")
+    args = parser.parse_args()
+
+    print(f"Score: {evaluate(EvaluatedPosition.from_fen(args.fen))}")
+    results = []
+    for name, position_class in (("Full", Position), ("Incremental", EvaluatedPosition)):
+        start = time.perf_counter()
+        count, total = evaluate_tree(position_class.from_fen(args.fen), args.depth)
+        elapsed = time.perf_counter() - start
+        results.append(total)
+        print(f"{name}: {count} positions in {elapsed:.3f} s, "
+              f"{count / elapsed if elapsed > 0 else 0:.0f} positions per second")
+    if results[0] != results[1]:
+        print("The incremental scores differ from the full evaluation")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import time
 
 import pygame
 
+from game.core.position import to_coords, to_square
+
 
 class Board:
     """
@@ -32,28 +34,121 @@ class Board:
         self.dark_color = (111, 143, 114)
         self.light_color = (173, 189, 143)
         self.text_color = (120, 218, 127)
+        self.move_marker_color = (80, 80, 80)
+
+        # A selected figure is drawn a bit bigger than a square, so redrawn areas are extended by this margin
+        self.overflow = 10
+        self.background = None
+        # What has been drawn on every square in the last frame, None if the whole board has to be drawn
+        self.drawn_squares = None
 
     def draw(self):
         """
         Runs all draw-methods. This class is only used through this method.
+        The first frame draws the whole board; after that only the squares whose figure, selection or move marker
+        has changed are drawn again and updated on the screen.
+        """
+        squares = self.get_square_states()
+        if self.drawn_squares is None:
+            self.display.blit(self.get_background(), (0, 0))
+            self.draw_selected_figures_moves()
+            self.draw_figures()
+            pygame.display.flip()
+        else:
+            changed = [square for square in range(64) if squares[square] != self.drawn_squares[square]]
+            if changed:
+                pygame.display.update([self.redraw_square(square, squares) for square in changed])
+        self.drawn_squares = squares
+
+    def invalidate(self):
+        """
+        Makes the next frame draw the whole board, e.g. after the window has been covered.
+        """
+        self.drawn_squares = None
+
+    def get_background(self):
+        """
+        Returns:
+            pygame.Surface: the squares and the coordinates of the board, rendered once and then reused
+        """
+        if self.background is None:
+            self.background = pygame.Surface((self.width, self.height))
+            self.draw_board(self.background)
+            self.draw_board_coordinates(self.background)
+        return self.background
+
+    def get_square_states(self):
+        """
+        Describes what has to be drawn on every square: the figure, whether it is selected and whether a possible
+        move of the selected figure is marked on it.
+
+        Returns:
+            list[tuple(Figure or None, bool, bool)]: states indexed by square
         """
-        self.draw_board()
-        self.draw_board_coordinates()
-        self.draw_selected_figures_moves()
-        self.draw_figures()
-        pygame.display.flip()
+        marked = set()
+        if self.game.selected_figure is not None:
+            marked = {to_square(*move) for move in self.game.selected_figure.get_legal_moves()}
+        return [
+            (figure, figure is not None and figure.is_selected, square in marked)
+            for square, figure in enumerate(self.game.squares)
+        ]
+
+    def redraw_square(self, square, squares):
+        """
+        Draws one square again from the background, together with the move markers and figures of the
+        neighbouring squares that reach into it.
+
+        Args:
+            square (int): the square to draw
+            squares (list[tuple(Figure or None, bool, bool)]): states of all squares, see `get_square_states`
+
+        Returns:
+            pygame.Rect: the area of the screen that has been drawn
+        """
+        x, y = to_coords(square)
+        area = pygame.Rect(
+            x * self.field_side + self.coordinates_width, y * self.field_side + self.coordinates_width,
+            self.field_side + self.overflow, self.field_side + self.overflow
+        ).clip(self.display.get_rect())
+        neighbours = [
+            to_square(x + d_x, y + d_y) for d_y in (-1, 0, 1) for d_x in (-1, 0, 1)
+            if 0 <= x + d_x <= 7 and 0 <= y + d_y <= 7
+        ]
+
+        self.display.set_clip(area)
+        self.display.blit(self.get_background(), area, area)
+        for neighbour in neighbours:
+            if squares[neighbour][2]:
+                self.draw_move_marker(to_coords(neighbour))
+        for neighbour in neighbours:
+            if squares[neighbour][0] is not None:
+                squares[neighbour][0].draw()
+        self.display.set_clip(None)
+        return area
+
+    def draw_move_marker(self, coords):
+        """
+        Draws a circle marking a possible move of the selected figure.
 
-    def draw_board(self):
+        Args:
+            coords (tuple(int, int)): board coordinates of the move
+        """
+        pygame.draw.circle(self.display, self.move_marker_color, (coords[0] * 100 + 85, coords[1] * 100 + 85), 20)
+
+    def draw_board(self, surface):
         """
         Draws the squares of the board.
+
+        Args:
+            surface (pygame.Surface): surface to draw on
         """
-        self.display.fill(self.dark_color)
+        surface.fill(self.dark_color)
         x_field_position = self.coordinates_width
         y_field_position = self.coordinates_width
 
         for _ in range(32):
             pygame.draw.rect(
-                self.display,
+                surface,
                 self.light_color,
                 pygame.Rect(x_field_position, y_field_position, self.field_side, self.field_side)
             )
@@ -67,9 +162,12 @@ class Board:
                 x_field_position = self.coordinates_width
                 y_field_position += self.field_side
 
-    def draw_board_coordinates(self):
+    def draw_board_coordinates(self, surface):
         """
         Draws the coordinates on the side of the board.
+
+        Args:
+            surface (pygame.Surface): surface to draw on
         """
         y_pos = 65
         x_pos = 75
@@ -79,8 +177,8 @@ class Board:
             if y_pos == 830:
                 y_pos = 30
             letter = self.font.render(chr(number), True, self.light_color)
-            self.display.blit(letter, (845, y_pos))
-            self.display.blit(letter, (10, y_pos))
+            surface.blit(letter, (845, y_pos))
+            surface.blit(letter, (10, y_pos))
             y_pos += 100
 
         # Displaying letters on top and bottom of the field
@@ -88,8 +186,8 @@ class Board:
             if x_pos == 840:
                 x_pos = 40
             num = self.font.render(chr(symbol), True, self.light_color)
-            self.display.blit(num, (x_pos, 830))
-            self.display.blit(num, (x_pos, -5))
+            surface.blit(num, (x_pos, 830))
+            surface.blit(num, (x_pos, -5))
             x_pos += 100
 
     def draw_figures(self):
@@ -0,0 +1,127 @@
+"""
+analysis.py
+This module provides:
+- `AnalysisResult`: a named tuple with the number of legal moves and the check, mate and stalemate status of one
+  position of a batch
+- `parse_line(line)`: a method to read a position and its EPD id from a line with a FEN or an EPD record
+- `analyse_line(number, line)`: a method to examine one line of a batch
+- `analyse_lines(lines, workers)`: a generator that examines a stream of lines, optionally in worker processes
+
+The lines are read lazily and at most a few chunks of them are in flight at a time, so a batch of any size is
+processed in constant memory. The answers are the same as the ones of `GameStatusHandler`.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import NamedTuple, Optional
+
+from game.core.cache import compute_status
+from game.core.position import Position, KING
+
+
+class AnalysisResult(NamedTuple):
+    """
+    Status of the side to move in one position of a batch. If the line could not be read, `error` describes why and
+    the other fields are empty.
+    """
+    line: int
+    fen: Optional[str]
+    id: Optional[str]
+    legal_moves: Optional[int]
+    check: Optional[bool]
+    mate: Optional[bool]
+    stalemate: Optional[bool]
+    error: Optional[str] = None
+
+
+def parse_line(line):
+    """
+    Reads a position from a line with either a FEN or an EPD record. An EPD record consists of the first four
+    fields of a FEN followed by operations separated by semicolons, e.g. `... w KQkq - bm Nf3; id "opening 1";`.
+
+    Args:
+        line (str): the line to read
+
+    Returns:
+        tuple(Position, str or None): the position and the value of the "id" operation of an EPD record
+
+    Raises:
+        ValueError: The line contains neither a valid FEN nor a valid EPD record, or the position does not have one
+            king of each color.
+    """
+    fields = line.split(maxsplit=4)
+    epd_id = None
+    if len(fields) == 5 and not all(field.isdigit() for field in fields[4].split()):
+        for operation in fields[4].split(";"):
+            opcode, _, operand = operation.strip().partition(" ")
+            if opcode == "id":
+                epd_id = operand.strip().strip('"')
+        line = " ".join(fields[:4])
+
+    position = Position.from_fen(line)
+    if position.board.count(KING) != 1 or position.board.count(-KING) != 1:
+        raise ValueError(f"The position does not have exactly one king of each color: {line!r}")
+    return position, epd_id
+
+
+def analyse_line(number, line):
+    """
+    Args:
+        number (int): number of the line in the input, for reference in the result
+        line (str): a line with a FEN or an EPD record
+
+    Returns:
+        AnalysisResult: the status of the position in the line, or the reason why it could not be read
+    """
+    try:
+        position, epd_id = parse_line(line)
+    except ValueError as error:
+        return AnalysisResult(number, None, None, None, None, None, None, str(error))
+    status = compute_status(position)
+    return AnalysisResult(number, position.to_fen(), epd_id, len(status.legal_moves), status.check, status.mate,
+                          status.stalemate)
+
+
+def _analyse_chunk(chunk):
+    return [analyse_line(number, line) for number, line in chunk]
+
+
+def _numbered_positions(lines):
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield number, line
+
+
+def analyse_lines(lines, workers=1, chunk_size=256):
+    """
+    Examines a stream of lines with FEN or EPD records one by one. Empty lines and lines starting with "#" are
+    skipped. With more than one worker, chunks of lines are examined in worker processes; only a couple of chunks
+    per worker are read ahead, and the results keep the order of the input.
+
+    Args:
+        lines (Iterable[str]): the lines to examine, e.g. an open file
+        workers (int or None): number of worker processes, the number of CPUs if None, no processes if 1
+        chunk_size (int): number of lines sent to a worker process at once
+
+    Yields:
+        AnalysisResult: the status of every position in the order of the input
+    """
+    numbered = _numbered_positions(lines)
+    if workers == 1:
+        for number, line in numbered:
+            yield analyse_line(number, line)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        read_ahead = 2 * workers
+        pending = deque()
+        while chunk := list(islice(numbered, chunk_size)):
+            pending.append(executor.submit(_analyse_chunk, chunk))
+            if len(pending) >= read_ahead:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
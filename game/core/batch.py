@@ -0,0 +1,281 @@
+"""
+batch.py
+This module provides vectorised queries over many positions at once with NumPy:
+- `BatchResult`: a named tuple with the material balance, mobility and check flags of a batch of positions
+- `boards_from_positions(positions)`: a method to stack the boards of positions into an N x 64 array
+- `boards_from_bytes(data)`: a method to read a batch of boards from 64 bytes per position
+- `bitboards_from_boards(boards)`: a method to pack a batch of boards into bitboards
+- `material(batch)`, `mobility(batch)` and `in_check(batch)`: the single queries over a batch of positions
+- `analyse_batch(batch)`: a method to answer all the queries for a batch of positions
+
+A batch is either an N x 64 array of int8 with the squares and pieces of `Position.board`, one position per row,
+or an N x 2 x 7 array of uint64 with the bitboards of `BitboardPosition.pieces`. The queries work on the bitboards of
+all the positions at once, so the shifts, fills and population counts are single NumPy operations on arrays of N
+numbers instead of Python loops over the positions, which makes them suitable for labelling millions of positions.
+They do not need the side to move, castling rights or the en passant square: the answers are given for both sides,
+indexed by the side / color.
+
+NumPy is an optional dependency of the project. The module can be imported without it, but the queries raise
+ImportError then.
+"""
+
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from game.core.position import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+
+# Material of the piece types in centipawns, indexed by the piece type
+PIECE_VALUES = (0, 100, 320, 330, 500, 900, 0)
+
+# Number of moves of a pawn to the last row, one for every promotion piece
+PROMOTION_MOVES = 4
+
+ALL_SQUARES = (1 << 64) - 1
+FILE_A = 0x0101010101010101
+FILE_B = FILE_A << 1
+FILE_G = FILE_A << 6
+FILE_H = FILE_A << 7
+# Rows of the board from the top, like the `y` coordinate
+ROWS = [0xFF << (8 * row) for row in range(8)]
+
+# Shifts of the bitboards in squares, with the squares that a shift may not reach because it would wrap around
+# the board to the other side; bit `n` stands for the square with index `n`, so `+1` is a step towards the h-file
+# and `+8` a step towards the first rank
+KNIGHT_SHIFTS = ((-17, FILE_H), (-15, FILE_A), (-10, FILE_G | FILE_H), (-6, FILE_A | FILE_B),
+                 (6, FILE_G | FILE_H), (10, FILE_A | FILE_B), (15, FILE_H), (17, FILE_A))
+ROOK_SHIFTS = ((-8, 0), (8, 0), (-1, FILE_H), (1, FILE_A))
+BISHOP_SHIFTS = ((-9, FILE_H), (-7, FILE_A), (7, FILE_H), (9, FILE_A))
+KING_SHIFTS = ROOK_SHIFTS + BISHOP_SHIFTS
+
+# Masks of the population count without `numpy.bitwise_count`
+POPCOUNT_MASKS = (0x5555555555555555, 0x3333333333333333, 0x0F0F0F0F0F0F0F0F, 0x0101010101010101)
+
+
+class BatchResult(NamedTuple):
+    """
+    Answers for a batch of N positions. `material` is the material balance in centipawns from the point of view of
+    white, with shape (N,). `mobility` and `in_check` have the shape (N, 2) and are indexed by the side / color.
+    """
+    material: "np.ndarray"
+    mobility: "np.ndarray"
+    in_check: "np.ndarray"
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The batch queries need NumPy, install it with `pip install numpy`")
+
+
+def boards_from_positions(positions):
+    """
+    Args:
+        positions (Iterable[Position]): positions, e.g. from `Position.from_fen`
+
+    Returns:
+        np.ndarray: N x 64 array of int8 with the boards of the positions
+
+    Raises:
+        ImportError: NumPy is not installed.
+    """
+    _require_numpy()
+    boards = np.array([position.board for position in positions], dtype=np.int8)
+    return boards.reshape(-1, 64)
+
+
+def boards_from_bytes(data):
+    """
+    Args:
+        data (bytes): 64 bytes per position, every byte a piece of `Position.board` as a signed 8-bit number
+
+    Returns:
+        np.ndarray: N x 64 array of int8 with the boards of the positions
+
+    Raises:
+        ImportError: NumPy is not installed.
+        ValueError: The length of the data is not a multiple of 64.
+    """
+    _require_numpy()
+    if len(data) % 64:
+        raise ValueError(f"Expected 64 bytes per board, got {len(data)} bytes")
+    return np.frombuffer(bytearray(data), dtype=np.int8).reshape(-1, 64)
+
+
+def bitboards_from_boards(boards):
+    """
+    Args:
+        boards (array_like): N x 64 boards
+
+    Returns:
+        np.ndarray: N x 2 x 7 array of uint64, the bitboards indexed by the position, the side / color and the piece
+        type like `BitboardPosition.pieces`
+
+    Raises:
+        ImportError: NumPy is not installed.
+        ValueError: The boards do not have the shape N x 64.
+    """
+    _require_numpy()
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim != 2 or boards.shape[1] != 64:
+        raise ValueError(f"Expected an N x 64 array of boards, got the shape {boards.shape}")
+    bitboards = np.zeros((len(boards), 2, 7), dtype=np.uint64)
+    for kind in range(PAWN, KING + 1):
+        for color, piece in ((WHITE, kind), (BLACK, -kind)):
+            bits = np.packbits(boards == piece, axis=1, bitorder="little")
+            bitboards[:, color, kind] = bits.view("<u8")[:, 0]
+    return bitboards
+
+
+def _as_bitboards(batch):
+    _require_numpy()
+    if np.ndim(batch) != 3:
+        return bitboards_from_boards(batch)
+    bitboards = np.asarray(batch, dtype=np.uint64)
+    if bitboards.shape[1:] != (2, 7):
+        raise ValueError(f"Expected an N x 2 x 7 array of bitboards, got the shape {bitboards.shape}")
+    return bitboards
+
+
+def _popcount(bitboards):
+    # number of squares of every bitboard; older NumPy versions add up the bits in ever wider groups
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bitboards).astype(np.int32)
+    ones, twos, fours, bytes_ = (np.uint64(mask) for mask in POPCOUNT_MASKS)
+    bitboards = bitboards - ((bitboards >> np.uint64(1)) & ones)
+    bitboards = (bitboards & twos) + ((bitboards >> np.uint64(2)) & twos)
+    bitboards = (bitboards + (bitboards >> np.uint64(4))) & fours
+    return ((bitboards * bytes_) >> np.uint64(56)).astype(np.int32)
+
+
+def _shift(bitboards, shift, wrapped):
+    shifted = bitboards << np.uint64(shift) if shift > 0 else bitboards >> np.uint64(-shift)
+    return shifted & np.uint64(ALL_SQUARES ^ wrapped) if wrapped else shifted
+
+
+def _slide(pieces, shift, wrapped, empty):
+    # squares reached from the pieces along one direction up to and including the first occupied square,
+    # with a fill that doubles its distance in every step
+    passable = empty & np.uint64(ALL_SQUARES ^ wrapped)
+    reached = pieces
+    for distance in (1, 2, 4):
+        reached = reached | (passable & _shift(reached, shift * distance, 0))
+        passable = passable & _shift(passable, shift * distance, 0)
+    return _shift(reached, shift, wrapped)
+
+
+def material(batch):
+    """
+    Args:
+        batch (array_like): N x 64 boards or N x 2 x 7 bitboards
+
+    Returns:
+        np.ndarray: material balance in centipawns from the point of view of white, with shape (N,)
+
+    Raises:
+        ImportError: NumPy is not installed.
+        ValueError: The batch does not have one of the shapes.
+    """
+    counts = _popcount(_as_bitboards(batch))
+    return (counts[:, WHITE] - counts[:, BLACK]) @ np.array(PIECE_VALUES, dtype=np.int32)
+
+
+def mobility(batch):
+    """
+    Counts the pseudo-legal moves of both sides like `game.core.movegen.piece_moves`, without castling and en passant,
+    which depend on more than the board. A move to the last row counts once for every promotion piece.
+    The rays of two sliders in the same direction never overlap, so the moves are counted for all the pieces of a
+    kind at once.
+
+    Args:
+        batch (array_like): N x 64 boards or N x 2 x 7 bitboards
+
+    Returns:
+        np.ndarray: number of moves with shape (N, 2), indexed by the side / color
+
+    Raises:
+        ImportError: NumPy is not installed.
+        ValueError: The batch does not have one of the shapes.
+    """
+    bitboards = _as_bitboards(batch)
+    occupied = [np.bitwise_or.reduce(bitboards[:, color], axis=1) for color in (BLACK, WHITE)]
+    empty = ~(occupied[WHITE] | occupied[BLACK])
+    counts = np.zeros((len(bitboards), 2), dtype=np.int32)
+
+    for side in (WHITE, BLACK):
+        pieces = bitboards[:, side]
+        targets = ~occupied[side]
+        moves = 0
+        for kind, shifts in ((KNIGHT, KNIGHT_SHIFTS), (KING, KING_SHIFTS)):
+            for shift, wrapped in shifts:
+                moves = moves + _popcount(_shift(pieces[:, kind], shift, wrapped) & targets)
+        for kind, shifts in ((ROOK, ROOK_SHIFTS), (BISHOP, BISHOP_SHIFTS)):
+            sliders = pieces[:, kind] | pieces[:, QUEEN]
+            for shift, wrapped in shifts:
+                moves = moves + _popcount(_slide(sliders, shift, wrapped, empty) & targets)
+
+        forward, double_row, last_row = (-8, ROWS[5], ROWS[0]) if side == WHITE else (8, ROWS[2], ROWS[7])
+        single = _shift(pieces[:, PAWN], forward, 0) & empty
+        pawn_targets = [single, _shift(single & np.uint64(double_row), forward, 0) & empty]
+        for shift, wrapped in ((forward - 1, FILE_H), (forward + 1, FILE_A)):
+            pawn_targets.append(_shift(pieces[:, PAWN], shift, wrapped) & occupied[1 - side])
+        for pawn_target in pawn_targets:
+            moves = moves + _popcount(pawn_target) + \
+                (PROMOTION_MOVES - 1) * _popcount(pawn_target & np.uint64(last_row))
+        counts[:, side] = moves
+    return counts
+
+
+def in_check(batch):
+    """
+    Args:
+        batch (array_like): N x 64 boards or N x 2 x 7 bitboards
+
+    Returns:
+        np.ndarray: array of bool with shape (N, 2), indexed by the side / color, whether the king of the side is
+        attacked; False if the side has no king
+
+    Raises:
+        ImportError: NumPy is not installed.
+        ValueError: The batch does not have one of the shapes.
+    """
+    bitboards = _as_bitboards(batch)
+    empty = ~np.bitwise_or.reduce(bitboards.reshape(len(bitboards), -1), axis=1)
+    checks = np.zeros((len(bitboards), 2), dtype=bool)
+
+    for side in (WHITE, BLACK):
+        king = bitboards[:, side, KING]
+        enemies = bitboards[:, 1 - side]
+        # the attackers are looked for from the king, in the opposite direction of their moves
+        attackers = np.zeros(len(bitboards), dtype=np.uint64)
+        for kind, shifts in ((KNIGHT, KNIGHT_SHIFTS), (KING, KING_SHIFTS)):
+            for shift, wrapped in shifts:
+                attackers |= _shift(king, shift, wrapped) & enemies[:, kind]
+        forward = -8 if side == WHITE else 8
+        for shift, wrapped in ((forward - 1, FILE_H), (forward + 1, FILE_A)):
+            attackers |= _shift(king, shift, wrapped) & enemies[:, PAWN]
+        for kind, shifts in ((ROOK, ROOK_SHIFTS), (BISHOP, BISHOP_SHIFTS)):
+            sliders = enemies[:, kind] | enemies[:, QUEEN]
+            for shift, wrapped in shifts:
+                attackers |= _slide(king, shift, wrapped, empty) & sliders
+        checks[:, side] = attackers != 0
+    return checks
+
+
+def analyse_batch(batch):
+    """
+    Args:
+        batch (array_like): N x 64 boards, e.g. from `boards_from_positions` or `FenConverter.fens_to_boards`,
+            or N x 2 x 7 bitboards
+
+    Returns:
+        BatchResult: material balance, mobility and check flags of all the positions
+
+    Raises:
+        ImportError: NumPy is not installed.
+        ValueError: The batch does not have one of the shapes.
+    """
+    bitboards = _as_bitboards(batch)
+    return BatchResult(material(bitboards), mobility(bitboards), in_check(bitboards))
@@ -0,0 +1,467 @@
+"""
+bitboard.py
+This module provides an optional bitboard backend for the rules of the game:
+- `BitboardPosition(Position)`: a position that keeps 64-bit occupancies per piece type and color
+- `knight_attacks`, `king_attacks`, `pawn_attacks`, `bishop_attacks`, `rook_attacks` and `queen_attacks`:
+attack queries over precomputed tables and classical ray lookups
+- `piece_moves`, `pseudo_legal_moves`, `legal_moves`, `is_square_attacked`, `is_check`, `is_mate` and
+`is_stalemate`: the same move and status queries as `game.core.movegen`, working on a `BitboardPosition`
+
+Bit `n` of a bitboard stands for the square with index `n`.
+
+The moves of all the pieces of a kind are generated from their bitboards, the pawns with a few shifts for all of them
+at once, and king moves are verified without making them. Even so, bit operations on Python integers cost about as
+much as the list lookups of `game.core.movegen`: measured with `game.core.perft.perft(..., rules=bitboard)` on
+CPython 3.11, the backend counts about 600,000 nodes per second from the initial position and 750,000 from Kiwipete,
+1.2 to 1.4 times slower than `game.core.movegen`, and the single attack queries are equally fast. Its use is as a
+second, independent implementation of the rules and for the bitboards of the pieces.
+"""
+
+from game.core import movegen
+from game.core.position import (
+    Position, WHITE, BLACK, EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+    to_coords, to_square, piece_color, changed_squares,
+)
+
+ALL_SQUARES = (1 << 64) - 1
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+# Rows of the board from the top, like the `y` coordinate
+ROWS = tuple(0xFF << (8 * row) for row in range(8))
+
+
+def squares_of(bitboard):
+    """
+    Iterates over the squares set in a bitboard, from the lowest square index to the highest.
+
+    Args:
+        bitboard (int): the bitboard
+
+    Yields:
+        int: square index
+    """
+    while bitboard:
+        lowest = bitboard & -bitboard
+        yield lowest.bit_length() - 1
+        bitboard ^= lowest
+
+
+def _to_bitboard(squares):
+    bitboard = 0
+    for square in squares:
+        bitboard |= 1 << square
+    return bitboard
+
+
+def _build_ray_masks(d_x, d_y):
+    masks = []
+    for square in range(64):
+        x, y = to_coords(square)
+        squares = []
+        x, y = x + d_x, y + d_y
+        while 0 <= x <= 7 and 0 <= y <= 7:
+            squares.append(to_square(x, y))
+            x, y = x + d_x, y + d_y
+        masks.append(_to_bitboard(squares))
+    return tuple(masks)
+
+
+KNIGHT_ATTACKS = tuple(_to_bitboard(targets) for targets in movegen.KNIGHT_STEPS)
+KING_ATTACKS = tuple(_to_bitboard(targets) for targets in movegen.KING_STEPS)
+# Squares attacked by a pawn of the given color: PAWN_ATTACKS[color][square]
+PAWN_ATTACKS = tuple(tuple(_to_bitboard(targets) for targets in captures) for captures in movegen.PAWN_CAPTURES)
+
+# Rays going towards higher square indices find their first blocker with the lowest set bit,
+# the rays going towards lower square indices with the highest set bit.
+_ROOK_RAYS_UP = (_build_ray_masks(1, 0), _build_ray_masks(0, 1))
+_ROOK_RAYS_DOWN = (_build_ray_masks(-1, 0), _build_ray_masks(0, -1))
+_BISHOP_RAYS_UP = (_build_ray_masks(1, 1), _build_ray_masks(-1, 1))
+_BISHOP_RAYS_DOWN = (_build_ray_masks(1, -1), _build_ray_masks(-1, -1))
+
+
+def _slider_attacks(square, occupied, rays_up, rays_down):
+    # the four rays are unrolled, the loops over them cost more than the lookups
+    (first, second), (third, fourth) = rays_up, rays_down
+    attacks = first[square]
+    blockers = attacks & occupied
+    if blockers:
+        attacks ^= first[(blockers & -blockers).bit_length() - 1]
+    ray = second[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= second[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = third[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= third[blockers.bit_length() - 1]
+    attacks |= ray
+    ray = fourth[square]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= fourth[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def knight_attacks(square):
+    """
+    Args:
+        square (int): square of the knight
+
+    Returns:
+        int: bitboard of the squares attacked by a knight
+    """
+    return KNIGHT_ATTACKS[square]
+
+
+def king_attacks(square):
+    """
+    Args:
+        square (int): square of the king
+
+    Returns:
+        int: bitboard of the squares attacked by a king
+    """
+    return KING_ATTACKS[square]
+
+
+def pawn_attacks(square, color):
+    """
+    Args:
+        square (int): square of the pawn
+        color (int): side / color of the pawn
+
+    Returns:
+        int: bitboard of the squares attacked by a pawn
+    """
+    return PAWN_ATTACKS[color][square]
+
+
+def rook_attacks(square, occupied):
+    """
+    Args:
+        square (int): square of the rook
+        occupied (int): bitboard of all the pieces on the board
+
+    Returns:
+        int: bitboard of the squares attacked by a rook, including the first blocker on every ray
+    """
+    return _slider_attacks(square, occupied, _ROOK_RAYS_UP, _ROOK_RAYS_DOWN)
+
+
+def bishop_attacks(square, occupied):
+    """
+    Args:
+        square (int): square of the bishop
+        occupied (int): bitboard of all the pieces on the board
+
+    Returns:
+        int: bitboard of the squares attacked by a bishop, including the first blocker on every ray
+    """
+    return _slider_attacks(square, occupied, _BISHOP_RAYS_UP, _BISHOP_RAYS_DOWN)
+
+
+def queen_attacks(square, occupied):
+    """
+    Args:
+        square (int): square of the queen
+        occupied (int): bitboard of all the pieces on the board
+
+    Returns:
+        int: bitboard of the squares attacked by a queen, including the first blocker on every ray
+    """
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+class BitboardPosition(Position):
+    """
+    Position that keeps bitboards of every piece type and color, and of all the pieces of each color, in sync with
+    the board while moves are made and unmade.
+    """
+
+    __slots__ = ("pieces", "occupied", "toggles")
+
+    def __init__(self, board=None, turn=WHITE, castling=0, en_passant=None, halfmove_clock=0, fullmove_number=1):
+        super().__init__(board, turn, castling, en_passant, halfmove_clock, fullmove_number)
+        # pieces[color][kind] and occupied[color]
+        self.pieces = [[0] * 7, [0] * 7]
+        self.occupied = [0, 0]
+        for square, piece in enumerate(self.board):
+            if piece != EMPTY:
+                self._toggle(piece_color(piece), abs(piece), 1 << square)
+        # bits toggled by every move of the undo stack, as (color, kind, bit)
+        self.toggles = []
+
+    def _toggle(self, color, kind, bit):
+        self.pieces[color][kind] ^= bit
+        self.occupied[color] ^= bit
+
+    def make_move(self, move):
+        board = self.board
+        squares = changed_squares(board, move, self.en_passant)
+        previous = [board[square] for square in squares]
+        super().make_move(move)
+
+        toggles = []
+        for square, piece in zip(squares, previous):
+            new_piece = board[square]
+            if piece != new_piece:
+                bit = 1 << square
+                if piece != EMPTY:
+                    toggles.append((WHITE, piece, bit) if piece > 0 else (BLACK, -piece, bit))
+                if new_piece != EMPTY:
+                    toggles.append((WHITE, new_piece, bit) if new_piece > 0 else (BLACK, -new_piece, bit))
+        for color, kind, bit in toggles:
+            self._toggle(color, kind, bit)
+        self.toggles.append(toggles)
+
+    def unmake_move(self):
+        # toggling the same bits again takes them back
+        for color, kind, bit in self.toggles.pop():
+            self._toggle(color, kind, bit)
+        return super().unmake_move()
+
+
+def is_square_attacked(position, square, by_side):
+    """
+    Looks outward from the square for pieces of the given side that attack it.
+
+    Args:
+        position (BitboardPosition): position to examine
+        square (int): square to examine
+        by_side (int): side / color of the attacking pieces
+
+    Returns:
+        bool: True if any piece of the given side attacks the square, False if not
+    """
+    return _is_attacked(position, square, by_side, position.occupied[WHITE] | position.occupied[BLACK])
+
+
+def _is_attacked(position, square, by_side, occupied):
+    # the same as `is_square_attacked`, with the sliders blocked by the given occupancy
+    pieces = position.pieces[by_side]
+    if KNIGHT_ATTACKS[square] & pieces[KNIGHT] or KING_ATTACKS[square] & pieces[KING]:
+        return True
+    if PAWN_ATTACKS[1 - by_side][square] & pieces[PAWN]:
+        return True
+    queens = pieces[QUEEN]
+    if _slider_attacks(square, occupied, _ROOK_RAYS_UP, _ROOK_RAYS_DOWN) & (pieces[ROOK] | queens):
+        return True
+    return bool(_slider_attacks(square, occupied, _BISHOP_RAYS_UP, _BISHOP_RAYS_DOWN) & (pieces[BISHOP] | queens))
+
+
+def piece_moves(position, square):
+    """
+    Generates the pseudo-legal moves of the piece on the given square, like `game.core.movegen.piece_moves`.
+
+    Args:
+        position (BitboardPosition): position to generate the moves in
+        square (int): square of the piece
+
+    Returns:
+        list[tuple(int, int, int)]: moves of the piece
+    """
+    piece = position.board[square]
+    if piece == EMPTY:
+        return []
+    color = piece_color(piece)
+    kind = abs(piece)
+    own = position.occupied[color]
+    occupied = own | position.occupied[1 - color]
+
+    if kind == PAWN:
+        moves = []
+        _add_pawn_moves(position, square, color, occupied, moves)
+        return moves
+    if kind == KNIGHT:
+        targets = KNIGHT_ATTACKS[square]
+    elif kind == KING:
+        targets = KING_ATTACKS[square]
+    elif kind == BISHOP:
+        targets = bishop_attacks(square, occupied)
+    elif kind == ROOK:
+        targets = rook_attacks(square, occupied)
+    else:
+        targets = queen_attacks(square, occupied)
+
+    moves = [(square, target, 0) for target in squares_of(targets & ~own)]
+    if kind == KING:
+        _add_castling_moves(position, square, color, occupied, moves)
+    return moves
+
+
+def _add_pawn_moves(position, square, color, occupied, moves):
+    forward, start_row, last_row = (-8, 6, 0) if color == WHITE else (8, 1, 7)
+    targets = []
+
+    target = square + forward
+    if 0 <= target < 64 and not occupied >> target & 1:
+        targets.append(target)
+        if square // 8 == start_row and not occupied >> (target + forward) & 1:
+            moves.append((square, target + forward, 0))
+
+    enemies = position.occupied[1 - color]
+    if position.en_passant is not None and color == position.turn:
+        enemies |= 1 << position.en_passant
+    targets.extend(squares_of(PAWN_ATTACKS[color][square] & enemies))
+
+    for target in targets:
+        if target // 8 == last_row:
+            moves.extend((square, target, promotion) for promotion in movegen.PROMOTIONS)
+        else:
+            moves.append((square, target, 0))
+
+
+def _add_all_pawn_moves(position, color, pawns, occupied, moves):
+    # the targets of all the pawns are shifted at once; the offset leads from a target back to its start square
+    empty = ~occupied & ALL_SQUARES
+    enemies = position.occupied[1 - color]
+    if position.en_passant is not None:
+        enemies |= 1 << position.en_passant
+    if color == WHITE:
+        single = pawns >> 8 & empty
+        last_row = ROWS[0]
+        targets = ((8, single), (16, (single & ROWS[5]) >> 8 & empty),
+                   (9, pawns >> 9 & ~FILE_H & enemies), (7, pawns >> 7 & ~FILE_A & enemies))
+    else:
+        single = pawns << 8 & empty
+        last_row = ROWS[7]
+        targets = ((-8, single), (-16, (single & ROWS[2]) << 8 & empty),
+                   (-7, pawns << 7 & ~FILE_H & enemies), (-9, pawns << 9 & ~FILE_A & enemies))
+
+    for offset, bitboard in targets:
+        moves += [(target + offset, target, 0) for target in squares_of(bitboard & ~last_row)]
+        for target in squares_of(bitboard & last_row):
+            moves.extend((target + offset, target, promotion) for promotion in movegen.PROMOTIONS)
+
+
+def _add_castling_moves(position, square, color, occupied, moves):
+    for right, king_start, king_target, between, passed in movegen.CASTLING_MOVES:
+        if not position.castling & right or square != king_start:
+            continue
+        if any(occupied >> between_square & 1 for between_square in between):
+            continue
+        if not any(is_square_attacked(position, passed_square, 1 - color) for passed_square in passed):
+            moves.append((square, king_target, 0))
+
+
+def pseudo_legal_moves(position):
+    """
+    Generates the moves of all the pieces of a kind at once from their bitboards, without reading the board.
+
+    Args:
+        position (BitboardPosition): position to generate the moves in
+
+    Returns:
+        list[tuple(int, int, int)]: pseudo-legal moves of the side to move
+    """
+    color = position.turn
+    pieces = position.pieces[color]
+    own = position.occupied[color]
+    occupied = own | position.occupied[1 - color]
+    moves = []
+
+    _add_all_pawn_moves(position, color, pieces[PAWN], occupied, moves)
+    for square in squares_of(pieces[KNIGHT]):
+        moves += [(square, target, 0) for target in squares_of(KNIGHT_ATTACKS[square] & ~own)]
+    for square in squares_of(pieces[BISHOP] | pieces[QUEEN]):
+        moves += [(square, target, 0) for target in squares_of(
+            _slider_attacks(square, occupied, _BISHOP_RAYS_UP, _BISHOP_RAYS_DOWN) & ~own)]
+    for square in squares_of(pieces[ROOK] | pieces[QUEEN]):
+        moves += [(square, target, 0) for target in squares_of(
+            _slider_attacks(square, occupied, _ROOK_RAYS_UP, _ROOK_RAYS_DOWN) & ~own)]
+    for square in squares_of(pieces[KING]):
+        moves += [(square, target, 0) for target in squares_of(KING_ATTACKS[square] & ~own)]
+        _add_castling_moves(position, square, color, occupied, moves)
+    return moves
+
+
+def is_check(position, given_side):
+    """
+    Args:
+        position (BitboardPosition): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the king of the side is attacked, False if not
+    """
+    king = position.pieces[given_side][KING]
+    if not king:
+        raise RuntimeError("There is no king of the given color on the board")
+    return is_square_attacked(position, king.bit_length() - 1, 1 - given_side)
+
+
+def is_legal(position, move):
+    """
+    Args:
+        position (BitboardPosition): position the move is performed in
+        move (tuple(int, int, int)): the move
+
+    Returns:
+        bool: True if the move does not leave the king of the moving side in check, False if not
+    """
+    start, target, _ = move
+    piece = position.board[start]
+    color = piece_color(piece)
+    if abs(piece) == KING:
+        # the king is safe if its target is not attacked once it has left the start square, so the move does not
+        # have to be made; a castling rook cannot block an attack on the target that does not pass the start
+        occupied = (position.occupied[WHITE] | position.occupied[BLACK]) ^ (1 << start)
+        return not _is_attacked(position, target, 1 - color, occupied)
+    position.make_move(move)
+    in_check = is_check(position, color)
+    position.unmake_move()
+    return not in_check
+
+
+def legal_moves(position, square=None):
+    """
+    Args:
+        position (BitboardPosition): position to generate the moves in
+        square (int or None): if given, only the moves of the piece on this square are generated
+
+    Returns:
+        list[tuple(int, int, int)]: legal moves of the side to move
+    """
+    if square is None:
+        return movegen.filter_legal(position, pseudo_legal_moves(position), is_legal)
+    moves = piece_moves(position, square)
+    if piece_color(position.board[square]) != position.turn:
+        return [move for move in moves if is_legal(position, move)]
+    return movegen.filter_legal(position, moves, is_legal)
+
+
+def has_legal_moves(position, given_side):
+    """
+    Args:
+        position (BitboardPosition): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the side has at least one legal move, False if not
+    """
+    return bool(legal_moves(movegen.with_turn(position, given_side)))
+
+
+def is_mate(position, given_side):
+    """
+    Args:
+        position (BitboardPosition): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the side is in mate, False if not
+    """
+    return is_check(position, given_side) and not has_legal_moves(position, given_side)
+
+
+def is_stalemate(position, given_side):
+    """
+    Args:
+        position (BitboardPosition): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the side is in stalemate, False if not
+    """
+    return not is_check(position, given_side) and not has_legal_moves(position, given_side)
@@ -0,0 +1,85 @@
+"""
+cache.py
+This module provides:
+- `PositionStatus`: a named tuple with the check, mate and stalemate status and the legal moves of a position
+- `StatusCache`: a bounded least-recently-used cache of `PositionStatus` keyed by the Zobrist key of the position
+"""
+
+from collections import OrderedDict
+from typing import NamedTuple
+
+from game.core import movegen
+
+
+class PositionStatus(NamedTuple):
+    """
+    Status of the side to move in a position.
+    """
+    check: bool
+    mate: bool
+    stalemate: bool
+    legal_moves: tuple
+
+
+def compute_status(position, rules=movegen):
+    """
+    Args:
+        position (Position): the position to examine
+        rules (module): module evaluating the rules, `game.core.movegen` or `game.core.bitboard` for a
+            `BitboardPosition`
+
+    Returns:
+        PositionStatus: status of the side to move
+    """
+    legal_moves = tuple(rules.legal_moves(position))
+    check = rules.is_check(position, position.turn)
+    return PositionStatus(check, check and not legal_moves, not check and not legal_moves, legal_moves)
+
+
+class StatusCache:
+    """
+    Remembers the status of recently examined positions. When the cache is full, the least recently used entry is
+    replaced.
+    """
+
+    def __init__(self, capacity=4096, rules=movegen):
+        """
+        Args:
+            capacity (int): maximal number of positions to remember
+            rules (module): module evaluating the rules of the positions, see `compute_status`
+        """
+        self.capacity = capacity
+        self.rules = rules
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, position):
+        """
+        Returns the status of the position, computing it only if the position is not in the cache.
+
+        Args:
+            position (Position): the position to examine
+
+        Returns:
+            PositionStatus: status of the side to move
+        """
+        status = self.entries.get(position.key)
+        if status is not None:
+            self.hits += 1
+            self.entries.move_to_end(position.key)
+            return status
+
+        self.misses += 1
+        status = compute_status(position, self.rules)
+        self.entries[position.key] = status
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return status
+
+    def clear(self):
+        """Forgets all the positions."""
+        self.entries.clear()
@@ -0,0 +1,52 @@
+"""
+draws.py
+This module provides:
+- `is_insufficient_material(position)`: a method to check whether neither side can mate anymore
+- `is_fifty_move_rule(position)`: a method to check whether fifty moves have been played without capture or pawn move
+- the reasons of a draw besides stalemate, as they are displayed at the end of a game
+
+Threefold repetition needs the positions before the current one and is counted by `game.core.record.GameRecord`.
+"""
+
+from game.core.position import EMPTY, KNIGHT, BISHOP, KING
+
+THREEFOLD_REPETITION = "threefold repetition"
+FIFTY_MOVE_RULE = "fifty-move rule"
+INSUFFICIENT_MATERIAL = "insufficient material"
+
+
+def is_insufficient_material(position):
+    """
+    Checks whether no sequence of legal moves can lead to a mate: only kings are left, or kings with a single
+    knight or bishop, or kings with any number of bishops that all stand on squares of the same color.
+
+    Args:
+        position (Position): position to examine
+
+    Returns:
+        bool: True if neither side can mate, False if not
+    """
+    knights = 0
+    bishop_square_colors = set()
+    for square, piece in enumerate(position.board):
+        kind = abs(piece)
+        if kind == BISHOP:
+            bishop_square_colors.add((square % 8 + square // 8) % 2)
+        elif kind == KNIGHT:
+            knights += 1
+        elif piece != EMPTY and kind != KING:
+            return False
+    if knights == 0:
+        return len(bishop_square_colors) <= 1
+    return knights == 1 and not bishop_square_colors
+
+
+def is_fifty_move_rule(position):
+    """
+    Args:
+        position (Position): position to examine
+
+    Returns:
+        bool: True if both sides have made fifty moves without a capture or a pawn move, False if not
+    """
+    return position.halfmove_clock >= 100
@@ -0,0 +1,208 @@
+"""
+evaluation.py
+This module provides:
+- `evaluate(position)`: a method to score a position by material and piece-square tables, tapered by the game phase
+- `EvaluatedPosition(Position)`: a position that keeps the sums of the evaluation in sync while moves are made
+and unmade, so `evaluate` does not have to scan the board
+- `score_board(board)`: a method to compute the sums of the evaluation of a board from scratch
+
+Every piece is worth its material plus a bonus for its square, once for the middle game and once for the endgame.
+The game phase goes from `MAX_PHASE` with all the knights, bishops, rooks and queens on the board down to 0 without
+them, and the score is the blend of the middle game and the endgame sums weighted by the phase.
+The tables are flat lists indexed by `(piece + KING) * 64 + square` and hold the values from the point of view of
+white, so the values of black pieces are negative.
+"""
+
+from game.core.position import Position, WHITE, EMPTY, PAWN, KING, changed_squares
+
+# Material of the piece types in centipawns, indexed by the piece type
+MIDDLE_GAME_VALUES = (0, 82, 337, 365, 477, 1025, 0)
+END_GAME_VALUES = (0, 94, 281, 297, 512, 936, 0)
+
+# Contribution of the piece types to the game phase, indexed by the piece type
+PHASE_VALUES = (0, 0, 1, 1, 2, 4, 0)
+MAX_PHASE = 24
+
+# Bonuses of the squares for white pieces, from a8 to h1 like the squares of the board
+PAWN_SQUARES = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+PAWN_END_GAME_SQUARES = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    15, 15, 15, 15, 15, 15, 15, 15,
+    5, 5, 5, 5, 5, 5, 5, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0,
+)
+KNIGHT_SQUARES = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+BISHOP_SQUARES = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+ROOK_SQUARES = (
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+)
+QUEEN_SQUARES = (
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+)
+KING_SQUARES = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+)
+KING_END_GAME_SQUARES = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+
+MIDDLE_GAME_SQUARES = (None, PAWN_SQUARES, KNIGHT_SQUARES, BISHOP_SQUARES, ROOK_SQUARES, QUEEN_SQUARES, KING_SQUARES)
+END_GAME_SQUARES = (None, PAWN_END_GAME_SQUARES, KNIGHT_SQUARES, BISHOP_SQUARES, ROOK_SQUARES, QUEEN_SQUARES,
+                    KING_END_GAME_SQUARES)
+
+
+def _build_table(values, square_tables):
+    # black pieces use the table of white mirrored vertically, with the sign of the value flipped
+    table = [0] * 13 * 64
+    for kind in range(PAWN, KING + 1):
+        for square in range(64):
+            value = values[kind] + square_tables[kind][square]
+            table[(KING + kind) * 64 + square] = value
+            table[(KING - kind) * 64 + (square ^ 56)] = -value
+    return table
+
+
+# MIDDLE_GAME_TABLE[(piece + KING) * 64 + square]: material plus square bonus of a piece for the middle game
+MIDDLE_GAME_TABLE = _build_table(MIDDLE_GAME_VALUES, MIDDLE_GAME_SQUARES)
+END_GAME_TABLE = _build_table(END_GAME_VALUES, END_GAME_SQUARES)
+# PHASE_TABLE[piece + KING]: contribution of a piece to the game phase
+PHASE_TABLE = [PHASE_VALUES[abs(piece)] for piece in range(-KING, KING + 1)]
+
+
+def score_board(board):
+    """
+    Args:
+        board (list[int]): 64 pieces indexed by square
+
+    Returns:
+        tuple(int, int, int): sums of the middle game and the endgame values from the point of view of white,
+        and the game phase
+    """
+    middle_game = end_game = phase = 0
+    for square, piece in enumerate(board):
+        if piece != EMPTY:
+            index = (piece + KING) * 64 + square
+            middle_game += MIDDLE_GAME_TABLE[index]
+            end_game += END_GAME_TABLE[index]
+            phase += PHASE_TABLE[piece + KING]
+    return middle_game, end_game, phase
+
+
+def evaluate(position):
+    """
+    Args:
+        position (Position): position to score; an `EvaluatedPosition` is scored without scanning the board
+
+    Returns:
+        int: score in centipawns from the point of view of the side to move
+    """
+    if isinstance(position, EvaluatedPosition):
+        middle_game, end_game, phase = position.middle_game, position.end_game, position.phase
+    else:
+        middle_game, end_game, phase = score_board(position.board)
+    if phase > MAX_PHASE:
+        # promotions can add more pieces than a game starts with
+        phase = MAX_PHASE
+    score = middle_game * phase + end_game * (MAX_PHASE - phase)
+    return (score if position.turn == WHITE else -score) // MAX_PHASE
+
+
+class EvaluatedPosition(Position):
+    """
+    Position that keeps the middle game sum, the endgame sum and the phase of `evaluate` in sync with the board.
+    `make_move` only looks up the squares that the move changes and `unmake_move` restores the previous sums.
+    """
+
+    __slots__ = ("middle_game", "end_game", "phase", "scores")
+
+    def __init__(self, board=None, turn=WHITE, castling=0, en_passant=None, halfmove_clock=0, fullmove_number=1):
+        super().__init__(board, turn, castling, en_passant, halfmove_clock, fullmove_number)
+        self.middle_game, self.end_game, self.phase = score_board(self.board)
+        # sums of the evaluation before every move of the undo stack
+        self.scores = []
+
+    def make_move(self, move):
+        board = self.board
+        squares = changed_squares(board, move, self.en_passant)
+        previous = [board[square] for square in squares]
+        self.scores.append((self.middle_game, self.end_game, self.phase))
+        super().make_move(move)
+
+        middle_game, end_game, phase = self.middle_game, self.end_game, self.phase
+        for square, piece in zip(squares, previous):
+            new_piece = board[square]
+            if piece != new_piece:
+                if piece != EMPTY:
+                    index = (piece + KING) * 64 + square
+                    middle_game -= MIDDLE_GAME_TABLE[index]
+                    end_game -= END_GAME_TABLE[index]
+                    phase -= PHASE_TABLE[piece + KING]
+                if new_piece != EMPTY:
+                    index = (new_piece + KING) * 64 + square
+                    middle_game += MIDDLE_GAME_TABLE[index]
+                    end_game += END_GAME_TABLE[index]
+                    phase += PHASE_TABLE[new_piece + KING]
+        self.middle_game, self.end_game, self.phase = middle_game, end_game, phase
+
+    def unmake_move(self):
+        self.middle_game, self.end_game, self.phase = self.scores.pop()
+        return super().unmake_move()
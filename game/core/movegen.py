@@ -0,0 +1,418 @@
+"""
+movegen.py
+This module provides:
+- `piece_moves(position, square)`: a method to generate the pseudo-legal moves of one piece
+- `pseudo_legal_moves(position)` and `legal_moves(position)`: methods to generate the moves of the side to move
+- `attacked_squares(position, by_side)` and `is_square_attacked(position, square, by_side)`: attack queries
+- `is_check`, `is_mate` and `is_stalemate`: status queries
+
+Moves are tuples `(start, target, promotion)` of square indices and the promotion piece type (0 if none).
+All the functions work on a `Position` and never touch pygame.
+"""
+
+from game.core.position import (
+    WHITE, BLACK, EMPTY, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING,
+    WHITE_SHORT, WHITE_LONG, BLACK_SHORT, BLACK_LONG,
+    to_square, to_coords,
+)
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, -1), (0, 1))
+BISHOP_DIRECTIONS = ((1, -1), (-1, -1), (1, 1), (-1, 1))
+KNIGHT_OFFSETS = ((-1, -2), (1, -2), (2, -1), (2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1))
+KING_OFFSETS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+PROMOTIONS = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+
+def _build_rays(directions):
+    rays = []
+    for square in range(64):
+        x, y = to_coords(square)
+        square_rays = []
+        for d_x, d_y in directions:
+            ray = []
+            temp_x, temp_y = x + d_x, y + d_y
+            while 0 <= temp_x <= 7 and 0 <= temp_y <= 7:
+                ray.append(to_square(temp_x, temp_y))
+                temp_x += d_x
+                temp_y += d_y
+            if ray:
+                square_rays.append(tuple(ray))
+        rays.append(tuple(square_rays))
+    return tuple(rays)
+
+
+def _build_steps(offsets):
+    steps = []
+    for square in range(64):
+        x, y = to_coords(square)
+        steps.append(tuple(
+            to_square(x + d_x, y + d_y) for d_x, d_y in offsets if 0 <= x + d_x <= 7 and 0 <= y + d_y <= 7
+        ))
+    return tuple(steps)
+
+
+# Precomputed target squares for every square of the board
+ROOK_RAYS = _build_rays(ROOK_DIRECTIONS)
+BISHOP_RAYS = _build_rays(BISHOP_DIRECTIONS)
+QUEEN_RAYS = tuple(ROOK_RAYS[square] + BISHOP_RAYS[square] for square in range(64))
+KNIGHT_STEPS = _build_steps(KNIGHT_OFFSETS)
+KING_STEPS = _build_steps(KING_OFFSETS)
+# Squares attacked by a pawn of the given color: PAWN_CAPTURES[color][square]
+PAWN_CAPTURES = (_build_steps(((-1, 1), (1, 1))), _build_steps(((-1, -1), (1, -1))))
+
+SLIDER_RAYS = {BISHOP: BISHOP_RAYS, ROOK: ROOK_RAYS, QUEEN: QUEEN_RAYS}
+
+# (castling right, king start, king target, squares to be empty, squares the king must not be attacked on)
+CASTLING_MOVES = (
+    (WHITE_SHORT, 60, 62, (61, 62), (60, 61, 62)),
+    (WHITE_LONG, 60, 58, (57, 58, 59), (60, 59, 58)),
+    (BLACK_SHORT, 4, 6, (5, 6), (4, 5, 6)),
+    (BLACK_LONG, 4, 2, (1, 2, 3), (4, 3, 2)),
+)
+
+
+def attacked_squares(position, by_side):
+    """
+    Collects all the squares attacked by the pieces of a side. The map is built on demand and not kept up to date
+    while moves are made: building it for one side costs several times a `make_move` and `unmake_move` pair,
+    while castling and the legality filter only ask about a few squares, which `is_square_attacked` answers faster.
+
+    Args:
+        position (Position): position to examine
+        by_side (int): side / color of the attacking pieces
+
+    Returns:
+        set[int]: attacked squares
+    """
+    board = position.board
+    attacked = set()
+    for square, piece in enumerate(board):
+        if piece == EMPTY or (piece > 0) != (by_side == WHITE):
+            continue
+        kind = abs(piece)
+        if kind == PAWN:
+            attacked.update(PAWN_CAPTURES[by_side][square])
+        elif kind == KNIGHT:
+            attacked.update(KNIGHT_STEPS[square])
+        elif kind == KING:
+            attacked.update(KING_STEPS[square])
+        else:
+            for ray in SLIDER_RAYS[kind][square]:
+                for target in ray:
+                    attacked.add(target)
+                    if board[target] != EMPTY:
+                        break
+    return attacked
+
+
+def is_square_attacked(position, square, by_side):
+    """
+    Looks outward from the square along the rays and the knight, pawn and king patterns for pieces of the given side
+    that attack it.
+
+    Args:
+        position (Position): position to examine
+        square (int): square to examine
+        by_side (int): side / color of the attacking pieces
+
+    Returns:
+        bool: True if any piece of the given side attacks the square, False if not
+    """
+    board = position.board
+    sign = 1 if by_side == WHITE else -1
+
+    for target in KNIGHT_STEPS[square]:
+        if board[target] == sign * KNIGHT:
+            return True
+    for target in KING_STEPS[square]:
+        if board[target] == sign * KING:
+            return True
+    for target in PAWN_CAPTURES[1 - by_side][square]:
+        if board[target] == sign * PAWN:
+            return True
+
+    for rays, kind in ((ROOK_RAYS, ROOK), (BISHOP_RAYS, BISHOP)):
+        for ray in rays[square]:
+            for target in ray:
+                piece = board[target]
+                if piece != EMPTY:
+                    if piece == sign * kind or piece == sign * QUEEN:
+                        return True
+                    break
+    return False
+
+
+def piece_moves(position, square):
+    """
+    Generates the pseudo-legal moves of the piece on the given square: the moves follow the movement rules of the
+    piece and the other pieces on the board, but may leave its own king in check.
+
+    Args:
+        position (Position): position to generate the moves in
+        square (int): square of the piece
+
+    Returns:
+        list[tuple(int, int, int)]: moves of the piece
+    """
+    board = position.board
+    piece = board[square]
+    if piece == EMPTY:
+        return []
+    color = WHITE if piece > 0 else BLACK
+    kind = abs(piece)
+    moves = []
+
+    if kind == PAWN:
+        _add_pawn_moves(position, square, color, moves)
+    elif kind == KNIGHT or kind == KING:
+        for target in (KNIGHT_STEPS if kind == KNIGHT else KING_STEPS)[square]:
+            if board[target] * piece <= 0:
+                moves.append((square, target, 0))
+        if kind == KING:
+            _add_castling_moves(position, square, color, moves)
+    else:
+        for ray in SLIDER_RAYS[kind][square]:
+            for target in ray:
+                occupant = board[target]
+                if occupant == EMPTY:
+                    moves.append((square, target, 0))
+                    continue
+                if occupant * piece < 0:
+                    moves.append((square, target, 0))
+                break
+
+    return moves
+
+
+def _add_pawn_moves(position, square, color, moves):
+    board = position.board
+    forward, start_row, last_row = (-8, 6, 0) if color == WHITE else (8, 1, 7)
+    targets = []
+
+    target = square + forward
+    if 0 <= target < 64 and board[target] == EMPTY:
+        targets.append(target)
+        if square // 8 == start_row and board[target + forward] == EMPTY:
+            moves.append((square, target + forward, 0))
+
+    for target in PAWN_CAPTURES[color][square]:
+        occupant = board[target]
+        if occupant != EMPTY and (occupant > 0) != (color == WHITE):
+            targets.append(target)
+        elif target == position.en_passant and color == position.turn:
+            targets.append(target)
+
+    for target in targets:
+        if target // 8 == last_row:
+            moves.extend((square, target, promotion) for promotion in PROMOTIONS)
+        else:
+            moves.append((square, target, 0))
+
+
+def _add_castling_moves(position, square, color, moves):
+    board = position.board
+    for right, king_start, king_target, between, passed in CASTLING_MOVES:
+        if not position.castling & right or square != king_start:
+            continue
+        if any(board[between_square] != EMPTY for between_square in between):
+            continue
+        if not any(is_square_attacked(position, passed_square, 1 - color) for passed_square in passed):
+            moves.append((square, king_target, 0))
+
+
+def pseudo_legal_moves(position):
+    """
+    Args:
+        position (Position): position to generate the moves in
+
+    Returns:
+        list[tuple(int, int, int)]: pseudo-legal moves of the side to move
+    """
+    moves = []
+    white = position.turn == WHITE
+    for square, piece in enumerate(position.board):
+        if piece != EMPTY and (piece > 0) == white:
+            moves.extend(piece_moves(position, square))
+    return moves
+
+
+def is_legal(position, move):
+    """
+    Args:
+        position (Position): position the move is performed in
+        move (tuple(int, int, int)): the move
+
+    Returns:
+        bool: True if the move does not leave the king of the moving side in check, False if not
+    """
+    color = WHITE if position.board[move[0]] > 0 else BLACK
+    position.make_move(move)
+    in_check = is_check(position, color)
+    position.unmake_move()
+    return not in_check
+
+
+def checks_and_pins(position, given_side):
+    """
+    Finds the pieces giving check to the king of a side and the pieces of the side that are pinned to it.
+
+    Args:
+        position (Position): position to examine
+        given_side (int): side / color of the king
+
+    Returns:
+        tuple(set[int] or None, dict[int, set[int]]): the squares a non-king move has to end on to answer the check
+        (None if there is no check, empty if it is a double check), and for every pinned piece the squares it can
+        move to without leaving the pin ray
+    """
+    board = position.board
+    king = position.kings[given_side]
+    sign = 1 if given_side == WHITE else -1
+    checkers = 0
+    check_mask = None
+    pins = {}
+
+    for rays, kind in ((ROOK_RAYS, ROOK), (BISHOP_RAYS, BISHOP)):
+        for ray in rays[king]:
+            own_piece = None
+            for index, target in enumerate(ray):
+                piece = board[target]
+                if piece == EMPTY:
+                    continue
+                if piece * sign > 0:
+                    if own_piece is not None:
+                        break
+                    own_piece = target
+                    continue
+                if piece == -sign * kind or piece == -sign * QUEEN:
+                    if own_piece is None:
+                        checkers += 1
+                        check_mask = set(ray[:index + 1])
+                    else:
+                        pins[own_piece] = set(ray[:index + 1])
+                break
+
+    for steps, enemy in ((KNIGHT_STEPS[king], -sign * KNIGHT), (PAWN_CAPTURES[given_side][king], -sign * PAWN)):
+        for target in steps:
+            if board[target] == enemy:
+                checkers += 1
+                check_mask = {target}
+
+    if checkers > 1:
+        check_mask = set()
+    return check_mask, pins
+
+
+def filter_legal(position, moves, probe=None):
+    """
+    Keeps the pseudo-legal moves of the side to move that do not leave its king in check. The checkers and pins
+    are computed once; only king moves and en passant are made and unmade on the position to be verified.
+
+    Args:
+        position (Position): position the moves are performed in
+        moves (list[tuple(int, int, int)]): pseudo-legal moves of the side to move
+        probe (Callable or None): function verifying a single move by making it, `is_legal` if not given
+
+    Returns:
+        list[tuple(int, int, int)]: legal moves
+    """
+    probe = probe or is_legal
+    board = position.board
+    king = position.kings[position.turn]
+    if king is None:
+        return [move for move in moves if probe(position, move)]
+
+    check_mask, pins = checks_and_pins(position, position.turn)
+    en_passant = position.en_passant
+    legal = []
+    for move in moves:
+        start, target, _ = move
+        if start == king or (target == en_passant and abs(board[start]) == PAWN):
+            if probe(position, move):
+                legal.append(move)
+        elif (check_mask is None or target in check_mask) and (start not in pins or target in pins[start]):
+            legal.append(move)
+    return legal
+
+
+def legal_moves(position, square=None):
+    """
+    Args:
+        position (Position): position to generate the moves in
+        square (int or None): if given, only the moves of the piece on this square are generated
+
+    Returns:
+        list[tuple(int, int, int)]: legal moves of the side to move
+    """
+    if square is None:
+        return filter_legal(position, pseudo_legal_moves(position))
+    moves = piece_moves(position, square)
+    if position.board[square] * (1 if position.turn == WHITE else -1) < 0:
+        return [move for move in moves if is_legal(position, move)]
+    return filter_legal(position, moves)
+
+
+def is_check(position, given_side):
+    """
+    Args:
+        position (Position): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the king of the side is attacked, False if not
+    """
+    king_square = position.kings[given_side]
+    if king_square is None:
+        raise RuntimeError("There is no king of the given color on the board")
+    return is_square_attacked(position, king_square, 1 - given_side)
+
+
+def with_turn(position, given_side):
+    """
+    Args:
+        position (Position): position to examine
+        given_side (int): side / color that should be to move
+
+    Returns:
+        Position: the position itself if the side is to move, otherwise a copy where the side is to move
+    """
+    if position.turn == given_side:
+        return position
+    return type(position)(position.board, given_side, position.castling)
+
+
+def has_legal_moves(position, given_side):
+    """
+    Args:
+        position (Position): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the side has at least one legal move, False if not
+    """
+    return bool(legal_moves(with_turn(position, given_side)))
+
+
+def is_mate(position, given_side):
+    """
+    Args:
+        position (Position): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the side is in mate, False if not
+    """
+    return is_check(position, given_side) and not has_legal_moves(position, given_side)
+
+
+def is_stalemate(position, given_side):
+    """
+    Args:
+        position (Position): position to examine
+        given_side (int): side / color to examine for
+
+    Returns:
+        bool: True if the side is in stalemate, False if not
+    """
+    return not is_check(position, given_side) and not has_legal_moves(position, given_side)
@@ -0,0 +1,117 @@
+"""
+perft.py
+This module provides:
+- `perft(position, depth, rules)`: a method to count the leaf nodes of the legal move tree of a position
+- `divide(position, depth, rules)`: a method to count the leaf nodes below every legal move of a position
+- `parallel_divide(position, depth, workers)`: `divide` with the root moves split across worker processes
+- `move_to_uci(move)`: a method to write a move in coordinate notation, e.g. "e2e4" or "a7a8q"
+
+Perft is the standard way to verify a move generator: the node counts of well-known positions are published,
+and any difference points to a bug in the generation of moves. The moves are generated by `game.core.movegen`,
+or by `game.core.bitboard` for a `BitboardPosition` with `rules=bitboard`.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from game.core import movegen
+from game.core.position import Position, PIECE_LETTERS, square_name
+
+
+def move_to_uci(move):
+    """
+    Args:
+        move (tuple(int, int, int)): start square, target square and the promotion piece type (0 if none)
+
+    Returns:
+        str: the move in coordinate notation
+    """
+    start, target, promotion = move
+    return square_name(start) + square_name(target) + (PIECE_LETTERS[promotion] if promotion else "")
+
+
+def perft(position, depth, rules=movegen):
+    """
+    Counts the leaf nodes of the legal move tree of the given depth. The position is restored afterwards.
+
+    Args:
+        position (Position): root position
+        depth (int): depth of the tree in plies; at 0 or less the position itself is the only leaf node
+        rules (module): module generating the legal moves, `game.core.movegen` or `game.core.bitboard`
+
+    Returns:
+        int: number of leaf nodes
+    """
+    if depth <= 0:
+        return 1
+    moves = rules.legal_moves(position)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1, rules)
+        position.unmake_move()
+    return nodes
+
+
+def _check_depth(depth):
+    # there are no root moves to divide the nodes among below a depth of 1
+    if depth < 1:
+        raise ValueError(f"The depth has to be at least 1, got {depth}")
+
+
+def divide(position, depth, rules=movegen):
+    """
+    Counts the leaf nodes below every legal move of the position.
+
+    Args:
+        position (Position): root position
+        depth (int): depth of the tree in plies, at least 1
+        rules (module): module generating the legal moves, `game.core.movegen` or `game.core.bitboard`
+
+    Returns:
+        dict[tuple(int, int, int), int]: number of leaf nodes for every root move
+
+    Raises:
+        ValueError: The depth is less than 1.
+    """
+    _check_depth(depth)
+    counts = {}
+    for move in rules.legal_moves(position):
+        position.make_move(move)
+        counts[move] = perft(position, depth - 1, rules)
+        position.unmake_move()
+    return counts
+
+
+def _perft_fen(fen, depth):
+    return perft(Position.from_fen(fen), depth)
+
+
+def parallel_divide(position, depth, workers=None):
+    """
+    Counts the leaf nodes below every legal move of the position like `divide`, with the root moves split across
+    worker processes. The positions after the root moves are sent to the workers as FEN strings.
+
+    Args:
+        position (Position): root position
+        depth (int): depth of the tree in plies, at least 1
+        workers (int or None): number of worker processes, the number of CPUs if not given
+
+    Returns:
+        dict[tuple(int, int, int), int]: number of leaf nodes for every root move
+
+    Raises:
+        ValueError: The depth is less than 1.
+    """
+    _check_depth(depth)
+    fens = {}
+    for move in movegen.legal_moves(position):
+        position.make_move(move)
+        fens[move] = position.to_fen()
+        position.unmake_move()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {move: executor.submit(_perft_fen, fen, depth - 1) for move, fen in fens.items()}
+        return {move: future.result() for move, future in futures.items()}
@@ -0,0 +1,424 @@
+"""
+position.py
+This module provides:
+- `Position`: a pure-data description of a chess position, which the rules of the game run against.
+- `to_square(x, y)` and `to_coords(square)`: methods to convert between board coordinates and square indices.
+- `square_name(square)` and `parse_square(name)`: methods to convert between square indices and algebraic notation.
+- `changed_squares(board, move, en_passant)`: a method to find the squares whose pieces a move changes.
+- `START_FEN`: the FEN of the initial position.
+
+The module does not depend on pygame, so positions can be analysed without a display.
+Squares are indexed from 0 to 63 in the same order as the board coordinates of the game: `x` is the file
+(0 is "A") and `y` is the row from the top of the board (0 is the eighth rank), so `square = y * 8 + x`.
+Pieces are stored as signed integers: positive for white, negative for black and 0 for an empty square.
+"""
+
+from game.core import zobrist
+
+WHITE, BLACK = 1, 0
+EMPTY = 0
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(1, 7)
+
+WHITE_SHORT, WHITE_LONG, BLACK_SHORT, BLACK_LONG = 1, 2, 4, 8
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Letters of the piece types in FEN, indexed by the piece type
+PIECE_LETTERS = " pnbrqk"
+
+# Squares a symbol of the FEN piece placement stands for: a piece or a run of empty squares
+FEN_SYMBOLS = {str(count): [EMPTY] * count for count in range(1, 9)}
+for _kind, _letter in enumerate(PIECE_LETTERS[1:], 1):
+    FEN_SYMBOLS[_letter.upper()] = [_kind]
+    FEN_SYMBOLS[_letter] = [-_kind]
+# Letters of the castling rights in FEN, in the order they are written
+FEN_CASTLING_LETTERS = (("K", WHITE_SHORT), ("Q", WHITE_LONG), ("k", BLACK_SHORT), ("q", BLACK_LONG))
+FEN_CASTLING_RIGHTS = dict(FEN_CASTLING_LETTERS)
+
+# Squares of the kings and rooks before castling: (king, rook, castling right)
+CASTLING_ROOKS = (
+    (60, 63, WHITE_SHORT),
+    (60, 56, WHITE_LONG),
+    (4, 7, BLACK_SHORT),
+    (4, 0, BLACK_LONG),
+)
+
+# Castling rights that survive a move from or to a square
+CASTLING_MASK = [15] * 64
+for _king_square, _rook_square, _right in CASTLING_ROOKS:
+    CASTLING_MASK[_king_square] &= ~_right
+    CASTLING_MASK[_rook_square] &= ~_right
+
+
+def to_square(x, y):
+    """
+    Converts board coordinates into a square index.
+
+    Args:
+        x (int): x coordinate on the board
+        y (int): y coordinate on the board
+
+    Returns:
+        int: square index from 0 to 63
+    """
+    return y * 8 + x
+
+
+def to_coords(square):
+    """
+    Converts a square index into board coordinates.
+
+    Args:
+        square (int): square index from 0 to 63
+
+    Returns:
+        tuple(int, int): board coordinates
+    """
+    return square % 8, square // 8
+
+
+def square_name(square):
+    """
+    Args:
+        square (int): square index from 0 to 63
+
+    Returns:
+        str: name of the square in algebraic notation, e.g. "e4"
+    """
+    return "abcdefgh"[square % 8] + str(8 - square // 8)
+
+
+def parse_square(name):
+    """
+    Args:
+        name (str): name of the square in algebraic notation, e.g. "e4"
+
+    Returns:
+        int: square index from 0 to 63
+    """
+    return to_square("abcdefgh".index(name[0]), 8 - int(name[1]))
+
+
+def make_piece(kind, color):
+    """
+    Args:
+        kind (int): type of the piece (PAWN, KNIGHT, BISHOP, ROOK, QUEEN or KING)
+        color (int): side / color of the piece
+
+    Returns:
+        int: the piece as it is stored on the board
+    """
+    return kind if color == WHITE else -kind
+
+
+def piece_color(piece):
+    """
+    Args:
+        piece (int): a non-empty piece as it is stored on the board
+
+    Returns:
+        int: side / color of the piece
+    """
+    return WHITE if piece > 0 else BLACK
+
+
+def changed_squares(board, move, en_passant):
+    """
+    Args:
+        board (list[int]): the board before the move, or after it when the move is taken back
+        move (tuple(int, int, int)): start square, target square and the promotion piece type (0 if none)
+        en_passant (int or None): en passant square of the position before the move
+
+    Returns:
+        tuple(int, ...): the squares whose pieces change with the move, including the rook of a castling and
+        the pawn taken en passant
+    """
+    start, target, _ = move
+    piece = board[start] or board[target]
+    kind = abs(piece)
+    if kind == PAWN and target == en_passant:
+        return start, target, target + (8 if piece > 0 else -8)
+    if kind == KING and abs(target - start) == 2:
+        return (start, target, target + 1, target - 1) if target > start else (start, target, target + 1, target - 2)
+    return start, target
+
+
+class Position:
+    """
+    Square-indexed board together with the side to move, castling rights, the en passant square and the move clocks.
+    `key` is the Zobrist key of the position (see `game.core.zobrist`); the clocks are not a part of it.
+    Moves are performed in place with `make_move` and taken back with `unmake_move`, which use an undo stack.
+    """
+
+    __slots__ = ("board", "turn", "castling", "en_passant", "halfmove_clock", "fullmove_number", "kings", "history",
+                 "key")
+
+    def __init__(self, board=None, turn=WHITE, castling=0, en_passant=None, halfmove_clock=0, fullmove_number=1):
+        """
+        Args:
+            board (list[int]): 64 pieces indexed by square, empty board if not given
+            turn (int): side / color to move
+            castling (int): castling rights as a combination of WHITE_SHORT, WHITE_LONG, BLACK_SHORT and BLACK_LONG
+            en_passant (int or None): square a pawn can move to when taking en passant
+            halfmove_clock (int): plies since the last capture or pawn move
+            fullmove_number (int): number of the move, starting at 1 and increased after every move of black
+        """
+        self.board = list(board) if board is not None else [EMPTY] * 64
+        self.turn = int(turn)
+        self.castling = castling
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.fullmove_number = fullmove_number
+        self.kings = [None, None]
+        self.history = []
+        for square, piece in enumerate(self.board):
+            if abs(piece) == KING:
+                self.kings[piece_color(piece)] = square
+        # Zobrist key of the position, updated incrementally by `make_move`
+        self.key = zobrist.compute_key(self)
+
+    @classmethod
+    def from_figures(cls, figures, turn=WHITE, en_passant=None, halfmove_clock=0, fullmove_number=1):
+        """
+        Builds a position from the figures of a game. Castling rights are taken from the `been_moved` flags of
+        the kings and rooks standing on their initial squares.
+
+        Args:
+            figures (Iterable[Figure]): figures on the board
+            turn (int): side / color to move
+            en_passant (Pawn or None): pawn that has just been moved two squares to the front
+            halfmove_clock (int): plies since the last capture or pawn move
+            fullmove_number (int): number of the move
+
+        Returns:
+            Position: the position of the figures
+        """
+        board = [EMPTY] * 64
+        unmoved = set()
+        for figure in figures:
+            square = to_square(figure.x, figure.y)
+            board[square] = make_piece(figure.kind, figure.color)
+            if not figure.been_moved:
+                unmoved.add(square)
+
+        castling = 0
+        for king_square, rook_square, right in CASTLING_ROOKS:
+            color = WHITE if right in (WHITE_SHORT, WHITE_LONG) else BLACK
+            if board[king_square] == make_piece(KING, color) and board[rook_square] == make_piece(ROOK, color) \
+                    and king_square in unmoved and rook_square in unmoved:
+                castling |= right
+
+        en_passant_square = None
+        if en_passant is not None:
+            en_passant_square = to_square(en_passant.x, en_passant.y + en_passant.factor)
+
+        return cls(board, turn, castling, en_passant_square, halfmove_clock, fullmove_number)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Builds a position from a FEN string. The fields after the piece placement are optional and default to
+        white to move, no castling rights, no en passant square and the clocks of a new game. Castling rights
+        whose king or rook does not stand on its initial square are dropped. The en passant square has to be on the
+        row behind a pawn that has just moved two squares.
+
+        Args:
+            fen (str): the FEN, e.g. "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+        Returns:
+            Position: the position described by the FEN
+
+        Raises:
+            ValueError: The FEN is malformed.
+        """
+        fields = fen.split()
+        if not 1 <= len(fields) <= 6:
+            raise ValueError(f"Invalid number of fields in FEN: {fen!r}")
+        fields += ["w", "-", "-", "0", "1"][len(fields) - 1:]
+        placement, turn, castling_field, en_passant_field, halfmove_clock, fullmove_number = fields
+
+        board = []
+        rows = placement.split("/")
+        try:
+            for row in rows:
+                row_start = len(board)
+                for symbol in row:
+                    board += FEN_SYMBOLS[symbol]
+                if len(board) - row_start != 8:
+                    raise ValueError(f"Invalid row in FEN: {row!r}")
+        except KeyError as error:
+            raise ValueError(f"Invalid piece placement in FEN: {placement!r}") from error
+        if len(rows) != 8:
+            raise ValueError(f"Invalid piece placement in FEN: {placement!r}")
+
+        if turn not in ("w", "b"):
+            raise ValueError(f"Invalid side to move in FEN: {turn!r}")
+
+        castling = 0
+        if castling_field != "-":
+            for letter in castling_field:
+                right = FEN_CASTLING_RIGHTS.get(letter)
+                if right is None or castling & right:
+                    raise ValueError(f"Invalid castling rights in FEN: {castling_field!r}")
+                castling |= right
+        # rights without the king and the rook on their initial squares cannot be used
+        for king_square, rook_square, right in CASTLING_ROOKS:
+            color = WHITE if right in (WHITE_SHORT, WHITE_LONG) else BLACK
+            if board[king_square] != make_piece(KING, color) or board[rook_square] != make_piece(ROOK, color):
+                castling &= ~right
+
+        en_passant = None
+        if en_passant_field != "-":
+            # the square is behind a pawn of the side that has just moved, on its third row
+            row, behind, pawn = ("6", 8, -PAWN) if turn == "w" else ("3", -8, PAWN)
+            if len(en_passant_field) != 2 or en_passant_field[0] not in "abcdefgh" or en_passant_field[1] != row \
+                    or board[parse_square(en_passant_field) + behind] != pawn:
+                raise ValueError(f"Invalid en passant square in FEN: {en_passant_field!r}")
+            en_passant = parse_square(en_passant_field)
+
+        if not (halfmove_clock.isdigit() and fullmove_number.isdigit()) or int(fullmove_number) < 1:
+            raise ValueError(f"Invalid move clocks in FEN: {halfmove_clock!r} {fullmove_number!r}")
+
+        return cls(board, WHITE if turn == "w" else BLACK, castling, en_passant, int(halfmove_clock),
+                   int(fullmove_number))
+
+    def to_fen(self):
+        """
+        Returns:
+            str: the position in FEN with all six fields: piece placement, side to move, castling rights,
+            en passant square, halfmove clock and fullmove number
+        """
+        rows = []
+        for row in range(8):
+            text = ""
+            empty_count = 0
+            for piece in self.board[row * 8:row * 8 + 8]:
+                if piece == EMPTY:
+                    empty_count += 1
+                    continue
+                if empty_count:
+                    text += str(empty_count)
+                    empty_count = 0
+                letter = PIECE_LETTERS[abs(piece)]
+                text += letter.upper() if piece > 0 else letter
+            if empty_count:
+                text += str(empty_count)
+            rows.append(text)
+
+        castling = "".join(letter for letter, right in FEN_CASTLING_LETTERS if self.castling & right)
+        en_passant = square_name(self.en_passant) if self.en_passant is not None else "-"
+        return f"{'/'.join(rows)} {'w' if self.turn == WHITE else 'b'} {castling or '-'} {en_passant} " \
+               f"{self.halfmove_clock} {self.fullmove_number}"
+
+    def copy(self):
+        """
+        Returns:
+            Position: an independent copy of this position
+        """
+        return type(self)(self.board, self.turn, self.castling, self.en_passant, self.halfmove_clock,
+                          self.fullmove_number)
+
+    def piece_at(self, coords):
+        """
+        Args:
+            coords (tuple(int, int)): board coordinates
+
+        Returns:
+            int: the piece in the given coordinates, EMPTY if there is none
+        """
+        return self.board[to_square(*coords)]
+
+    def make_move(self, move):
+        """
+        Performs a move on this position in place and remembers how to take it back with `unmake_move`.
+        The move is not checked for legality. Castling moves the rook as well, en passant removes the taken pawn
+        and promotions replace the pawn. The halfmove clock is reset by captures and pawn moves.
+
+        Args:
+            move (tuple(int, int, int)): start square, target square and the promotion piece type (0 if none)
+        """
+        start, target, promotion = move
+        board = self.board
+        piece = board[start]
+        color = piece_color(piece)
+        kind = abs(piece)
+        captured = board[target]
+
+        self.history.append((move, captured, self.castling, self.en_passant, self.key, self.halfmove_clock))
+
+        keys = zobrist.PIECE_KEYS
+        moved = make_piece(promotion, color) if promotion else piece
+        board[start] = EMPTY
+        board[target] = moved
+        key = self.key ^ keys[piece][start] ^ keys[moved][target] ^ zobrist.BLACK_TO_MOVE_KEY
+        if captured:
+            key ^= keys[captured][target]
+
+        new_en_passant = None
+        self.halfmove_clock = 0 if captured or kind == PAWN else self.halfmove_clock + 1
+        if color == BLACK:
+            self.fullmove_number += 1
+        if kind == PAWN:
+            if target == self.en_passant:
+                taken_square = target + (8 if color == WHITE else -8)
+                key ^= keys[board[taken_square]][taken_square]
+                board[taken_square] = EMPTY
+            elif abs(target - start) == 16:
+                new_en_passant = (start + target) // 2
+        elif kind == KING:
+            self.kings[color] = target
+            if abs(target - start) == 2:
+                rook_start, rook_target = (target + 1, target - 1) if target > start else (target - 2, target + 1)
+                rook = board[rook_start]
+                board[rook_target] = rook
+                board[rook_start] = EMPTY
+                key ^= keys[rook][rook_start] ^ keys[rook][rook_target]
+
+        castling = self.castling & CASTLING_MASK[start] & CASTLING_MASK[target]
+        key ^= zobrist.CASTLING_KEYS[self.castling] ^ zobrist.CASTLING_KEYS[castling]
+        if self.en_passant is not None:
+            key ^= zobrist.EN_PASSANT_KEYS[self.en_passant % 8]
+        if new_en_passant is not None:
+            key ^= zobrist.EN_PASSANT_KEYS[new_en_passant % 8]
+
+        self.castling = castling
+        self.en_passant = new_en_passant
+        self.turn = 1 - color
+        self.key = key
+
+    def unmake_move(self):
+        """
+        Takes back the last move performed with `make_move`, restoring the captured piece, the castling rights,
+        the en passant square, the clocks and the Zobrist key of the previous position.
+
+        Returns:
+            tuple(int, int, int): the move that has been taken back
+        """
+        move, captured, castling, en_passant, self.key, self.halfmove_clock = self.history.pop()
+        start, target, promotion = move
+        board = self.board
+        piece = board[target]
+        color = piece_color(piece)
+        kind = PAWN if promotion else abs(piece)
+
+        board[start] = make_piece(PAWN, color) if promotion else piece
+        board[target] = captured
+
+        if kind == PAWN:
+            if target == en_passant:
+                board[target + (8 if color == WHITE else -8)] = make_piece(PAWN, 1 - color)
+        elif kind == KING:
+            self.kings[color] = start
+            if target - start == 2:
+                board[target + 1] = board[target - 1]
+                board[target - 1] = EMPTY
+            elif start - target == 2:
+                board[target - 2] = board[target + 1]
+                board[target + 1] = EMPTY
+
+        self.castling = castling
+        self.en_passant = en_passant
+        self.turn = color
+        if color == BLACK:
+            self.fullmove_number -= 1
+        return move
@@ -0,0 +1,163 @@
+"""
+record.py
+This module provides:
+- `GameRecord`: the moves of a game together with snapshots of its positions, to get to any ply of the game quickly
+
+A snapshot of the position is kept every `checkpoint_interval` plies, so the position after any ply is restored by
+replaying at most `checkpoint_interval - 1` moves from the nearest snapshot instead of all the moves from the start.
+The Zobrist keys of all the positions are counted as well, so repetitions are found without replaying the game.
+"""
+
+from collections import Counter
+
+from game.core.position import Position, START_FEN
+
+
+class GameRecord:
+    """
+    Moves played from a start position with snapshots of the positions in between.
+    Ply 0 is the start position and ply `n` the position after the first `n` moves.
+    """
+
+    def __init__(self, fen=START_FEN, checkpoint_interval=16, position_class=Position):
+        """
+        Args:
+            fen (str): FEN of the start position
+            checkpoint_interval (int): number of plies between two snapshots
+            position_class (type): class of the positions to create, e.g. `BitboardPosition`
+
+        Raises:
+            ValueError: The FEN is malformed or the checkpoint interval is not positive.
+        """
+        if checkpoint_interval < 1:
+            raise ValueError("The checkpoint interval has to be at least 1")
+        self.checkpoint_interval = checkpoint_interval
+        self.moves = []
+        # checkpoints[i] is the position after i * checkpoint_interval plies
+        self.checkpoints = [position_class.from_fen(fen)]
+        # position after the last move, which the next move is made in
+        self.tip = self.checkpoints[0].copy()
+        # keys[i] is the Zobrist key of the position after i plies, key_counts counts how often every key occurs
+        self.keys = [self.tip.key]
+        self.key_counts = Counter(self.keys)
+
+    def __len__(self):
+        return len(self.moves)
+
+    @property
+    def start_fen(self):
+        """
+        Returns:
+            str: FEN of the start position
+        """
+        return self.checkpoints[0].to_fen()
+
+    @classmethod
+    def from_moves(cls, moves, fen=START_FEN, checkpoint_interval=16):
+        """
+        Args:
+            moves (Iterable[tuple(int, int, int)]): moves played from the start position
+            fen (str): FEN of the start position
+            checkpoint_interval (int): number of plies between two snapshots
+
+        Returns:
+            GameRecord: record of the moves
+        """
+        record = cls(fen, checkpoint_interval)
+        for move in moves:
+            record.append(move)
+        return record
+
+    def append(self, move):
+        """
+        Adds a move after the last move of the record. The move is not checked for legality.
+
+        Args:
+            move (tuple(int, int, int)): start square, target square and the promotion piece type (0 if none)
+        """
+        self.tip.make_move(move)
+        self.moves.append(move)
+        self.keys.append(self.tip.key)
+        self.key_counts[self.tip.key] += 1
+        if len(self.moves) % self.checkpoint_interval == 0:
+            self.checkpoints.append(self.tip.copy())
+
+    def truncate(self, ply):
+        """
+        Forgets the moves after the given ply, e.g. when a different move is played there.
+
+        Args:
+            ply (int): number of moves to keep
+        """
+        if ply >= len(self.moves):
+            return
+        self.tip = self.position_at(ply)
+        self.key_counts.subtract(self.keys[ply + 1:])
+        del self.keys[ply + 1:]
+        del self.moves[ply:]
+        del self.checkpoints[ply // self.checkpoint_interval + 1:]
+
+    def position_at(self, ply, history=0):
+        """
+        Restores the position after the given number of moves from the nearest snapshot.
+
+        Args:
+            ply (int): number of moves from the start, from 0 to `len(record)`
+            history (int): number of moves before the ply that have to be on the undo stack of the position, e.g.
+                the halfmove clock to detect repetitions; fewer if the game has fewer moves
+
+        Returns:
+            Position: an independent copy of the position after `ply` moves
+
+        Raises:
+            IndexError: The ply is not in the record.
+        """
+        if not 0 <= ply <= len(self.moves):
+            raise IndexError(f"Ply {ply} is not in the record of {len(self.moves)} plies")
+        if ply == len(self.moves) and history <= 0:
+            return self.tip.copy()
+        checkpoint = max(ply - history, 0) // self.checkpoint_interval
+        position = self.checkpoints[checkpoint].copy()
+        for move in self.moves[checkpoint * self.checkpoint_interval:ply]:
+            position.make_move(move)
+        return position
+
+    def repetitions(self, ply=None):
+        """
+        Counts how often the position after the given ply has occurred in the game up to that ply. Positions are
+        the same if the same pieces stand on the same squares with the same side to move, castling rights and
+        en passant square.
+
+        Args:
+            ply (int or None): number of moves from the start, the last move of the record if not given
+
+        Returns:
+            int: number of occurrences of the position, at least 1
+        """
+        if ply is None or ply == len(self.moves):
+            return self.key_counts[self.keys[-1]]
+        return self.keys[:ply + 1].count(self.keys[ply])
+
+    def positions_at(self, plies):
+        """
+        Restores the positions after several plies at once. The plies are visited in increasing order and every
+        position continues from the previous one if that is closer than the nearest snapshot.
+
+        Args:
+            plies (Iterable[int]): numbers of moves from the start
+
+        Yields:
+            tuple(int, Position): every ply in increasing order with the position after it, which stays valid only
+            until the next position is yielded
+        """
+        position, current = None, None
+        for ply in sorted(plies):
+            if not 0 <= ply <= len(self.moves):
+                raise IndexError(f"Ply {ply} is not in the record of {len(self.moves)} plies")
+            checkpoint = ply // self.checkpoint_interval
+            if position is None or current < checkpoint * self.checkpoint_interval:
+                position, current = self.checkpoints[checkpoint].copy(), checkpoint * self.checkpoint_interval
+            for move in self.moves[current:ply]:
+                position.make_move(move)
+            current = ply
+            yield ply, position
@@ -0,0 +1,112 @@
+"""
+san.py
+This module provides:
+- `move_to_san(position, move)`: a method to write a move in Standard Algebraic Notation, e.g. "Nbd7" or "exd8=Q+"
+- `parse_san(position, san)`: a method to find the legal move that a move in Standard Algebraic Notation stands for
+
+Both methods are built on the legal move generator of `game.core.movegen`, so disambiguation only considers the
+moves that are actually legal, as the notation requires. The position is restored after use.
+"""
+
+import re
+
+from game.core import movegen
+from game.core.position import PAWN, KING, PIECE_LETTERS, make_piece, square_name, parse_square
+
+SAN_PATTERN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+
+
+def move_to_san(position, move, legal_moves=None):
+    """
+    Args:
+        position (Position): position before the move, with the side of the move to move
+        move (tuple(int, int, int)): a legal move in the position
+        legal_moves (list[tuple(int, int, int)] or None): the legal moves of the position, if they are known already
+
+    Returns:
+        str: the move in Standard Algebraic Notation with a "+" or "#" suffix for check and mate
+    """
+    start, target, promotion = move
+    kind = abs(position.board[start])
+
+    if kind == KING and abs(target - start) == 2:
+        san = "O-O" if target > start else "O-O-O"
+    else:
+        capture = position.board[target] != 0 or (kind == PAWN and target == position.en_passant)
+        if kind == PAWN:
+            san = square_name(start)[0] + "x" if capture else ""
+        else:
+            san = PIECE_LETTERS[kind].upper() + _disambiguation(position, move, legal_moves) + ("x" if capture else "")
+        san += square_name(target)
+        if promotion:
+            san += "=" + PIECE_LETTERS[promotion].upper()
+
+    position.make_move(move)
+    if movegen.is_check(position, position.turn):
+        san += "+" if movegen.legal_moves(position) else "#"
+    position.unmake_move()
+    return san
+
+
+def _disambiguation(position, move, legal_moves):
+    start, target, _ = move
+    piece = position.board[start]
+    if legal_moves is None:
+        legal_moves = movegen.legal_moves(position)
+    others = [other for other, other_target, _ in legal_moves
+              if other_target == target and other != start and position.board[other] == piece]
+    if not others:
+        return ""
+    name = square_name(start)
+    if all(other % 8 != start % 8 for other in others):
+        return name[0]
+    if all(other // 8 != start // 8 for other in others):
+        return name[1]
+    return name
+
+
+def parse_san(position, san):
+    """
+    Finds the legal move written in Standard Algebraic Notation. Check and mate suffixes and annotations like "!?"
+    are ignored, castling may be written with zeros and the "=" before a promotion piece may be left out.
+
+    Args:
+        position (Position): position before the move
+        san (str): the move, e.g. "e4", "Nxf7+", "O-O-O" or "e8=Q#"
+
+    Returns:
+        tuple(int, int, int): start square, target square and the promotion piece type (0 if none)
+
+    Raises:
+        ValueError: The move is malformed, illegal or ambiguous in the position.
+    """
+    text = san.rstrip("+#!?")
+
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        king_square = position.kings[position.turn]
+        if king_square is not None:
+            move = (king_square, king_square + (2 if len(text) == 3 else -2), 0)
+            if move in movegen.legal_moves(position, king_square):
+                return move
+        raise ValueError(f"Illegal castling in the position: {san!r}")
+
+    match = SAN_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid move in SAN: {san!r}")
+    letter, from_file, from_rank, target_name, promotion_letter = match.groups()
+    kind = PIECE_LETTERS.index(letter.lower()) if letter else PAWN
+    target = parse_square(target_name)
+    promotion = PIECE_LETTERS.index(promotion_letter.lower()) if promotion_letter else 0
+
+    # only the moves of the pieces that match the notation are checked for legality
+    piece = make_piece(kind, position.turn)
+    candidates = [
+        move for square, board_piece in enumerate(position.board) if board_piece == piece
+        and (from_file is None or square_name(square)[0] == from_file)
+        and (from_rank is None or square_name(square)[1] == from_rank)
+        for move in movegen.piece_moves(position, square) if move[1] == target and move[2] == promotion
+    ]
+    candidates = movegen.filter_legal(position, candidates)
+    if len(candidates) != 1:
+        raise ValueError(f"{'Ambiguous' if candidates else 'Illegal'} move in the position: {san!r}")
+    return candidates[0]
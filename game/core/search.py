@@ -0,0 +1,290 @@
+"""
+search.py
+This module provides:
+- `Searcher`: a chess engine that finds the best move of a position with a negamax alpha-beta search
+- `SearchInfo`: a named tuple with the result of one iteration of the search
+
+The search deepens iteratively until the maximal depth or the time limit is reached. The moves are ordered by the
+move stored in the transposition table, captures by most valuable victim / least valuable attacker (MVV-LVA),
+killer moves and the history heuristic. Captures are searched further in a quiescence search at the horizon.
+The search runs on `Position` and does not need the figures of a game or pygame. Positions are scored by
+`game.core.evaluation.evaluate`, which is much faster on an `EvaluatedPosition`.
+"""
+
+import time
+from typing import NamedTuple, Optional
+
+from game.core import movegen
+from game.core.evaluation import evaluate
+from game.core.position import EMPTY, PAWN
+
+# Values of the piece types in centipawns for the ordering of captures, indexed by the piece type
+PIECE_VALUES = (0, 100, 320, 330, 500, 900, 0)
+
+MATE_SCORE = 100000
+# Scores above this are mates found in the search
+MATE_BOUND = MATE_SCORE - 1000
+INFINITY = MATE_SCORE + 1
+
+# Kinds of scores in the transposition table
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Ordering scores of the moves: the transposition table move first, then captures and promotions, then killers
+TABLE_MOVE_ORDER = 1 << 30
+CAPTURE_ORDER = 1 << 20
+KILLER_ORDER = 1 << 19
+
+# The clock and the stop condition are checked every this many nodes
+CHECK_INTERVAL = 1024
+# Maximal distance from the root, including check extensions
+MAX_PLY = 128
+
+
+class SearchInfo(NamedTuple):
+    """
+    Result of a search up to a depth. `score` is in centipawns from the point of view of the side to move; mates
+    are scored `MATE_SCORE` minus the number of plies to the mate. `nps` are the nodes searched per second.
+    """
+    move: Optional[tuple]
+    score: int
+    depth: int
+    nodes: int
+    time: float
+    nps: float
+    pv: list
+
+
+class _SearchAborted(Exception):
+    pass
+
+
+class Searcher:
+    """
+    Negamax alpha-beta search with iterative deepening, a transposition table and a quiescence search.
+    The transposition table and the history heuristic are kept between searches.
+    """
+
+    def __init__(self, table_size=1 << 18, evaluation=evaluate):
+        """
+        Args:
+            table_size (int): number of entries of the transposition table, a power of two
+            evaluation (Callable[[Position], int]): static evaluation from the point of view of the side to move
+        """
+        self.table = [None] * table_size
+        self.table_mask = table_size - 1
+        self.evaluation = evaluation
+        # history[start * 64 + target]: how often a quiet move has caused a cutoff, weighted by the depth
+        self.history = [0] * 64 * 64
+        self.killers = []
+        self.nodes = 0
+        self.deadline = None
+        self.stop_event = None
+
+    def clear(self):
+        """Forgets the transposition table and the history of earlier searches."""
+        self.table = [None] * len(self.table)
+        self.history = [0] * 64 * 64
+
+    def search(self, position, max_depth=64, time_limit=None, stop_event=None, on_iteration=None):
+        """
+        Searches the best move of the position, one depth after another. If the time runs out or the stop event
+        is set, the result of the last finished depth is returned. The position is restored afterwards.
+
+        Args:
+            position (Position): position to search, with its undo stack for the detection of repetitions
+            max_depth (int): maximal depth in plies
+            time_limit (float or None): seconds the search may take, no limit if None
+            stop_event (threading.Event or None): event that stops the search when it is set
+            on_iteration (Callable[[SearchInfo], None] or None): called after every finished depth
+
+        Returns:
+            SearchInfo: best move, score, principal variation and statistics of the deepest finished search;
+            the move is None if the side to move has no legal move
+        """
+        start_time = time.perf_counter()
+        self.deadline = start_time + time_limit if time_limit is not None else None
+        self.stop_event = stop_event
+        self.nodes = 0
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        history_length = len(position.history)
+
+        root_moves = movegen.legal_moves(position)
+        best = SearchInfo(root_moves[0] if root_moves else None, 0, 0, 0, 0.0, 0.0, root_moves[:1])
+        if len(root_moves) <= 1:
+            return best
+
+        for depth in range(1, min(max_depth, MAX_PLY // 2) + 1):
+            try:
+                score = self._negamax(position, depth, -INFINITY, INFINITY, 0)
+            except _SearchAborted:
+                while len(position.history) > history_length:
+                    position.unmake_move()
+                break
+            elapsed = time.perf_counter() - start_time
+            pv = self._principal_variation(position, depth)
+            best = SearchInfo(pv[0] if pv else best.move, score, depth, self.nodes, elapsed,
+                              self.nodes / elapsed if elapsed > 0 else 0.0, pv)
+            if on_iteration is not None:
+                on_iteration(best)
+            if abs(score) > MATE_BOUND:
+                break
+        if best.depth == 0:
+            elapsed = time.perf_counter() - start_time
+            best = best._replace(nodes=self.nodes, time=elapsed, nps=self.nodes / elapsed if elapsed > 0 else 0.0)
+        return best
+
+    def _check_stop(self):
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise _SearchAborted()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise _SearchAborted()
+
+    def _negamax(self, position, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self._check_stop()
+
+        if ply and (position.halfmove_clock >= 100 or _is_repetition(position)):
+            return 0
+        if ply >= MAX_PLY:
+            return self.evaluation(position)
+
+        in_check = movegen.is_check(position, position.turn)
+        if in_check:
+            depth += 1
+        if depth <= 0:
+            return self._quiescence(position, alpha, beta, ply)
+
+        key = position.key
+        index = key & self.table_mask
+        entry = self.table[index]
+        table_move = None
+        if entry is not None and entry[0] == key:
+            _, entry_depth, entry_score, flag, table_move = entry
+            if entry_depth >= depth and ply:
+                entry_score = _score_from_table(entry_score, ply)
+                if flag == EXACT or (flag == LOWER_BOUND and entry_score >= beta) or \
+                        (flag == UPPER_BOUND and entry_score <= alpha):
+                    return entry_score
+
+        moves = movegen.legal_moves(position)
+        if not moves:
+            return -MATE_SCORE + ply if in_check else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        killers = self.killers[ply]
+        board = position.board
+        for move in self._ordered(position, moves, table_move, killers):
+            position.make_move(move)
+            score = -self._negamax(position, depth - 1, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if board[move[1]] == EMPTY and not move[2]:
+                            if killers[0] != move:
+                                killers[1] = killers[0]
+                                killers[0] = move
+                            self.history[move[0] * 64 + move[1]] += depth * depth
+                        break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table[index] = (key, depth, _score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def _quiescence(self, position, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self._check_stop()
+
+        stand_pat = self.evaluation(position)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        board = position.board
+        en_passant = position.en_passant
+        captures = [move for move in movegen.pseudo_legal_moves(position)
+                    if board[move[1]] != EMPTY or move[2] or (move[1] == en_passant and abs(board[move[0]]) == PAWN)]
+        captures = movegen.filter_legal(position, captures)
+        captures.sort(key=lambda move: _capture_order(board, move), reverse=True)
+        for move in captures:
+            position.make_move(move)
+            score = -self._quiescence(position, -beta, -alpha, ply + 1)
+            position.unmake_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _ordered(self, position, moves, table_move, killers):
+        board = position.board
+        history = self.history
+
+        def order(move):
+            if move == table_move:
+                return TABLE_MOVE_ORDER
+            if board[move[1]] != EMPTY or move[2]:
+                return CAPTURE_ORDER + _capture_order(board, move)
+            if move in killers:
+                return KILLER_ORDER
+            return history[move[0] * 64 + move[1]]
+
+        return sorted(moves, key=order, reverse=True)
+
+    def _principal_variation(self, position, depth):
+        pv = []
+        for _ in range(depth):
+            entry = self.table[position.key & self.table_mask]
+            if entry is None or entry[0] != position.key or entry[4] is None \
+                    or entry[4] not in movegen.legal_moves(position):
+                break
+            pv.append(entry[4])
+            position.make_move(entry[4])
+        for _ in pv:
+            position.unmake_move()
+        return pv
+
+
+def _capture_order(board, move):
+    # most valuable victim first, then least valuable attacker; an empty target without promotion is en passant
+    start, target, promotion = move
+    victim = abs(board[target]) if board[target] != EMPTY else (EMPTY if promotion else PAWN)
+    return 10 * PIECE_VALUES[victim] + PIECE_VALUES[promotion] - abs(board[start])
+
+
+def _is_repetition(position):
+    history = position.history
+    key = position.key
+    for index in range(len(history) - 2, max(len(history) - position.halfmove_clock, 0) - 1, -2):
+        if history[index][4] == key:
+            return True
+    return False
+
+
+def _score_to_table(score, ply):
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
@@ -0,0 +1,45 @@
+"""
+zobrist.py
+This module provides:
+- the random 64-bit keys for Zobrist hashing of positions
+- `compute_key(position)`: a method to calculate the Zobrist key of a position from scratch
+
+The key of a position is the XOR of the keys of every piece on its square, the side to move, the castling rights
+and the file of the en passant square. `Position.make_move` and `Position.unmake_move` keep it up to date
+incrementally, so the key identifies a position for transposition tables, repetition detection and caching.
+"""
+
+import random
+
+_random = random.Random(2023)
+
+# PIECE_KEYS[piece][square]: white pieces use the indices 1 to 6, black pieces the negative indices -1 to -6
+PIECE_KEYS = [[_random.getrandbits(64) for _ in range(64)] for _ in range(13)]
+# XORed into the key when black is to move
+BLACK_TO_MOVE_KEY = _random.getrandbits(64)
+# CASTLING_KEYS[castling rights]
+CASTLING_KEYS = [0] + [_random.getrandbits(64) for _ in range(15)]
+# EN_PASSANT_KEYS[file of the en passant square]
+EN_PASSANT_KEYS = [_random.getrandbits(64) for _ in range(8)]
+
+
+def compute_key(position):
+    """
+    Calculates the Zobrist key of a position from scratch.
+
+    Args:
+        position (Position): the position
+
+    Returns:
+        int: 64-bit key of the position
+    """
+    key = 0
+    for square, piece in enumerate(position.board):
+        if piece:
+            key ^= PIECE_KEYS[piece][square]
+    if not position.turn:
+        key ^= BLACK_TO_MOVE_KEY
+    key ^= CASTLING_KEYS[position.castling]
+    if position.en_passant is not None:
+        key ^= EN_PASSANT_KEYS[position.en_passant % 8]
+    return key
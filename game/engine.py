@@ -0,0 +1,89 @@
+"""
+engine.py
+This module provides:
+- `EngineWorker`: a class to let the search engine think in a background thread
+- `ENGINE_MOVE_EVENT`: the type of the pygame event the worker posts when it has chosen a move
+
+The engine searches a copy of the position, so the figures of the game are only changed by the main loop when it
+receives the event. Meanwhile the main loop keeps drawing and handling events at its frame rate.
+"""
+
+import threading
+
+import pygame
+
+from game.core.search import Searcher
+
+ENGINE_MOVE_EVENT = pygame.event.custom_type()
+
+
+class EngineWorker:
+    """
+    Runs searches of `game.core.search.Searcher` in a background thread, one at a time. The result of a search is
+    posted as an `ENGINE_MOVE_EVENT` with the attributes `move`, `ply`, `search_id` and `info` (the `SearchInfo`).
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=64, searcher=None):
+        """
+        Args:
+            time_limit (float): seconds the engine may think about a move
+            max_depth (int): maximal depth of the search in plies
+            searcher (Searcher or None): the engine, a new one if not given
+        """
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.searcher = searcher or Searcher()
+        self.thread = None
+        self.stop_event = threading.Event()
+        # Number of the current search; events of older searches are outdated
+        self.search_id = 0
+
+    @property
+    def is_thinking(self):
+        """
+        Returns:
+            bool: whether a search is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, position, ply):
+        """
+        Starts searching the best move of a position. A search that is still running is cancelled first.
+
+        Args:
+            position (Position): position to search, which belongs to the worker from now on
+            ply (int): ply of the game the position is at, passed back with the move
+        """
+        self.cancel()
+        self.stop_event = threading.Event()
+        self.search_id += 1
+        self.thread = threading.Thread(target=self._search, args=(position, ply, self.search_id, self.stop_event),
+                                       name="engine", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """
+        Stops the running search, if there is one, and waits for the thread to finish. A move that has been posted
+        already becomes outdated.
+        """
+        self.search_id += 1
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def is_current(self, event):
+        """
+        Args:
+            event (Event): an `ENGINE_MOVE_EVENT`
+
+        Returns:
+            bool: whether the event comes from the latest search and has not been cancelled
+        """
+        return event.search_id == self.search_id
+
+    def _search(self, position, ply, search_id, stop_event):
+        info = self.searcher.search(position, self.max_depth, self.time_limit, stop_event)
+        if not stop_event.is_set():
+            pygame.event.post(pygame.event.Event(ENGINE_MOVE_EVENT, move=info.move, ply=ply, search_id=search_id,
+                                                 info=info))
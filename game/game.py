@@ -2,46 +2,264 @@
 game.py
 This module provides:
 - `Game`: a class representing the Model and the Controller of the game (MVC)
+- `UndoEntry`: a named tuple with what is needed to take back a move
 """
 
-from typing import Optional
+import warnings
+from typing import NamedTuple, Optional
 
 import pygame
 
-from game.utils.game_status_handler import GameStatusHandler
+from game.core import bitboard, draws, movegen
+from game.core.bitboard import BitboardPosition
+from game.core.cache import StatusCache
+from game.core.evaluation import EvaluatedPosition
+from game.core.perft import move_to_uci
+from game.core.position import Position, WHITE, KING, PAWN, QUEEN, START_FEN, to_coords, to_square
+from game.core.record import GameRecord
 from game.utils.fen import FenConverter
 from game.board import Board
+from game.engine import ENGINE_MOVE_EVENT, EngineWorker
 from models.figure import Figure
 
+# Keys stepping through the moves of the game: (key, Ctrl held, Shift held) -> method of `Game` taking the step.
+# The arrow keys work with any modifiers.
+STEP_KEYS = {
+    (pygame.K_z, True, False): "undo",
+    (pygame.K_y, True, False): "redo",
+    (pygame.K_y, True, True): "redo",
+    (pygame.K_z, True, True): "redo",
+}
+STEP_KEYS.update({(key, ctrl, shift): action for key, action in ((pygame.K_LEFT, "undo"), (pygame.K_RIGHT, "redo"))
+                  for ctrl in (False, True) for shift in (False, True)})
+
+
+class UndoEntry(NamedTuple):
+    """
+    A move on the undo stack of the game, with the state of the game before it.
+    """
+    move: tuple
+    figure: Figure
+    captured: Optional[Figure]
+    been_moved: bool
+    en_passant: Optional[Figure]
+    halfmove_clock: int
+
 
 class Game:
     """
     Contains all information about the game. Keeps the game running.
     """
 
-    def __init__(self):
+    # Milliseconds to wait for an event before the loop runs again
+    IDLE_WAIT = 500
+
+    def __init__(self, fen=START_FEN, engine_color=None, engine_time=1.0, bitboards=False):
+        """
+        Args:
+            fen (str): FEN of the position to start from, the initial position if not given
+            engine_color (int or None): side / color the computer plays, None if both sides are played by humans
+            engine_time (float): seconds the computer may think about a move
+            bitboards (bool): whether the moves of the figures and the game status are evaluated with the bitboard
+                backend
+        """
         pygame.init()
         self.FPS = 40
         self.clock = pygame.time.Clock()
+        self.redraw_needed = True
+        self.status_outdated = True
 
         self.selected_figure: Optional[Figure] = None
         self.keep_doing = True
 
         self.board = Board(self)
 
-        self.turn = 1
-        self.figures = FenConverter.fen_converter(self, "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR")
+        self.bitboards = bitboards
+        self.status_cache = StatusCache(rules=bitboard if bitboards else movegen)
+        self.engine_color = engine_color
+        self.engine = EngineWorker(engine_time) if engine_color is not None else None
+        # Ply the engine has been asked to move at, None if it is not thinking about the current position
+        self.engine_ply = None
+
+        # The position of the game, set up by `load_fen` and `load_position`
+        self.record: Optional[GameRecord] = None
+        self.ply = 0
+        self.figures: set[Figure] = set()
+        self.squares: list[Optional[Figure]] = [None] * 64
+        self.turn = WHITE
+        self.en_passant: Optional[Figure] = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self.undo_stack: list[UndoEntry] = []
+        # Status and legal move targets of the current position, until the next move
+        self.status = None
+        self.legal_targets = None
+        self.load_fen(fen)
+
+    def load_fen(self, fen):
+        """
+        Starts a new game from the position described by a FEN.
+
+        Args:
+            fen (str): FEN of the position
+
+        Raises:
+            ValueError: The FEN is malformed.
+        """
+        # the positions of the record are searched by the engine, which evaluates them incrementally
+        self.record = GameRecord(fen, position_class=EvaluatedPosition)
+        self.ply = 0
+        self.load_position(self.record.tip)
+
+    def load_position(self, position):
+        """
+        Sets up a position: the figures, the side to move, the castling rights, the en passant pawn and the move
+        clocks. The record of the game is not changed and the engine stops thinking.
+
+        Args:
+            position (Position): the position to set up
+        """
+        self.stop_engine()
+        self.figures = FenConverter.position_to_figures(self, position)
+        self.squares = [None] * 64
+        for figure in self.figures:
+            self.squares[to_square(figure.x, figure.y)] = figure
+
+        self.turn = position.turn
+        self.en_passant = FenConverter.en_passant_pawn(position, self.figures)
+        self.halfmove_clock = position.halfmove_clock
+        self.fullmove_number = position.fullmove_number
+        self.selected_figure = None
+        self.undo_stack = []
+        self.board.invalidate()
+        self.mark_moved()
+
+    def record_move(self, move):
+        """
+        Adds a move played in the current position to the record of the game and remembers on the undo stack what is
+        needed to take it back. It has to be called before the figures are moved.
+        If the game has been stepped back and the move is not the next recorded move, the moves after the current
+        ply are forgotten.
+
+        Args:
+            move (tuple(int, int, int)): start square, target square and the promotion piece type (0 if none)
+        """
+        start, target, _ = move
+        figure = self.squares[start]
+        captured = self.squares[target]
+        if captured is None and figure.kind == PAWN and start % 8 != target % 8:
+            captured = self.squares[start - start % 8 + target % 8]
+        self.undo_stack.append(UndoEntry(move, figure, captured, figure.been_moved, self.en_passant,
+                                         self.halfmove_clock))
+
+        if self.ply < len(self.record) and self.record.moves[self.ply] == move:
+            self.ply += 1
+            return
+        self.record.truncate(self.ply)
+        self.record.append(move)
+        self.ply += 1
+
+    def go_to_ply(self, ply):
+        """
+        Sets up the position after the given number of moves of the record. The figures are created anew, so the
+        undo stack is cleared.
+
+        Args:
+            ply (int): number of moves from the start of the game, from 0 to the number of recorded moves
+
+        Raises:
+            IndexError: The ply is not in the record.
+        """
+        self.load_position(self.record.position_at(ply))
+        self.ply = ply
+
+    def undo(self):
+        """
+        Takes back the last move. The figures are put back from the undo stack, the captured figure returns to the
+        board and a promoted pawn replaces its queen again. The move stays in the record, so it can be redone.
+
+        Returns:
+            bool: True if there was a move to take back, False if the game is at its start
+        """
+        self.stop_engine()
+        if not self.undo_stack:
+            if self.ply == 0:
+                return False
+            self.go_to_ply(self.ply - 1)
+            return True
+
+        entry = self.undo_stack.pop()
+        start, target, promotion = entry.move
+        figure = entry.figure
+        if promotion:
+            self.remove_figure(self.squares[target])
+            figure.x, figure.y = to_coords(start)
+            self.add_figure(figure)
+        else:
+            self.move_figure(figure, to_coords(start))
+        if figure.kind == KING and abs(target - start) == 2:
+            rook_start, rook_target = (target + 1, target - 1) if target > start else (target - 2, target + 1)
+            self.move_figure(self.squares[rook_target], to_coords(rook_start))
+        if entry.captured is not None:
+            self.add_figure(entry.captured)
+
+        figure.been_moved = entry.been_moved
+        self.en_passant = entry.en_passant
+        self.halfmove_clock = entry.halfmove_clock
+        self.turn = figure.color
+        if not figure.color:
+            self.fullmove_number -= 1
+        self.ply -= 1
+        self.deselect_figure()
+        self.mark_moved()
+        return True
+
+    def redo(self):
+        """
+        Plays the next recorded move again after it has been taken back.
 
-        self.en_passant = None
+        Returns:
+            bool: True if there was a recorded move to play, False if the game is at its last move
+        """
+        self.stop_engine()
+        if self.ply == len(self.record):
+            return False
+        start, target, promotion = self.record.moves[self.ply]
+        self.deselect_figure()
+        self.squares[start].move(*to_coords(target), promotion or QUEEN)
+        return True
+
+    def deselect_figure(self):
+        """Deselects the selected figure, if there is one."""
+        if self.selected_figure is not None:
+            self.selected_figure.deselect()
+            self.selected_figure = None
+
+    def get_fen(self):
+        """
+        Returns:
+            str: FEN of the current position with all six fields
+        """
+        return self.get_position().to_fen()
 
     def run(self):
-        """Starts and runs the game."""
+        """
+        Starts and runs the game. The loop sleeps until the user does something: the board is only redrawn when
+        something on it has changed, and the game status is only recomputed after a move.
+        """
         while self.keep_doing:
+            if self.status_outdated:
+                self.status_outdated = False
+                self.handle_game_status()
+            if self.redraw_needed and self.keep_doing:
+                self.redraw_needed = False
+                self.draw()
+            if self.keep_doing:
+                self.start_engine_if_needed()
             self.clock.tick(self.FPS)
-            self.draw()
             self.process_events()
-            self.handle_game_status()
 
+        self.stop_engine()
         pygame.quit()
 
     def draw(self):
@@ -49,10 +267,94 @@ class Game:
         self.board.draw()
 
     def process_events(self):
-        """Processes all possible user interactions (events) during the game."""
-        for event in pygame.event.get():
+        """
+        Waits up to `IDLE_WAIT` milliseconds for user interactions (events) and processes all of them.
+        """
+        events = [pygame.event.wait(self.IDLE_WAIT)] + pygame.event.get()
+        for event in events:
             self.process_exit_event(event)
+            self.process_window_event(event)
+            self.process_key_down_event(event)
             self.process_mouse_button_down_event(event)
+            self.process_engine_move_event(event)
+
+    def is_engine_turn(self):
+        """
+        Returns:
+            bool: whether the computer plays the side to move
+        """
+        return self.engine is not None and int(self.turn) == self.engine_color
+
+    def start_engine_if_needed(self):
+        """
+        Lets the engine think in the background if it is to move and has not been asked about this position yet.
+        The main loop keeps running; the move arrives as an `ENGINE_MOVE_EVENT`. The moves since the last capture or
+        pawn move stay on the undo stack of the position, so the engine sees the repetitions of the game.
+        """
+        if self.is_engine_turn() and self.engine_ply != self.ply and self.get_result() is None:
+            self.engine_ply = self.ply
+            self.engine.start(self.record.position_at(self.ply, self.halfmove_clock), self.ply)
+
+    def stop_engine(self):
+        """Cancels the search of the engine, if it is thinking."""
+        if self.engine is not None:
+            self.engine.cancel()
+            self.engine_ply = None
+
+    def process_engine_move_event(self, event):
+        """
+        Plays the move the engine has chosen, unless the game has changed since the engine started thinking.
+        If the figures reject the move, the failure is reported and the engine thinks about the position again.
+
+        Args:
+            event (Event): pygame event to process
+        """
+        if event.type != ENGINE_MOVE_EVENT or self.engine is None or not self.engine.is_current(event):
+            return
+        if event.ply == self.ply and event.move is not None:
+            start, target, promotion = event.move
+            self.deselect_figure()
+            figure = self.squares[start]
+            if figure is None or not figure.move(*to_coords(target), promotion or QUEEN):
+                warnings.warn(f"The engine move {move_to_uci(event.move)} is not legal on the board", RuntimeWarning)
+                self.engine_ply = None
+
+    def process_window_event(self, event):
+        """
+        Process an event in case the window has to be drawn again, e.g. after it has been covered.
+
+        Args:
+            event (Event): pygame event to process
+        """
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+            self.board.invalidate()
+            self.redraw_needed = True
+
+    def process_key_down_event(self, event):
+        """
+        Process an event in case the user takes back a move with Ctrl+Z or the left arrow key, or plays it again
+        with Ctrl+Y, Ctrl+Shift+Z or the right arrow key. When playing against the engine, the move of the engine
+        is taken back or played again together with the move of the user.
+
+        Args:
+            event (Event): pygame event to process
+        """
+        if event.type != pygame.KEYDOWN:
+            return
+        action = STEP_KEYS.get((event.key, bool(event.mod & pygame.KMOD_CTRL), bool(event.mod & pygame.KMOD_SHIFT)))
+        if action is not None:
+            step = getattr(self, action)
+            if step() and self.is_engine_turn():
+                step()
+
+    def mark_moved(self):
+        """
+        Marks that a move has been completed: the game status has to be recomputed and the board drawn again.
+        """
+        self.status_outdated = True
+        self.redraw_needed = True
+        self.status = None
+        self.legal_targets = None
 
     def process_exit_event(self, event):
         """
@@ -63,6 +365,7 @@ class Game:
         """
         if event.type == pygame.QUIT:
             self.keep_doing = False
+            self.stop_engine()
 
     def process_mouse_button_down_event(self, event):
         """
@@ -73,6 +376,7 @@ class Game:
             event (Event): pygame event to process
         """
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.redraw_needed = True
             mouse_x, mouse_y = self.board.convert_mouse_coordinates_to_board_coordinates(pygame.mouse.get_pos())
             self.figure_selection_events(mouse_x, mouse_y)
             if self.selected_figure is not None:
@@ -114,7 +418,7 @@ class Game:
             mouse_y (int): The y coordinate of the mouse.
         """
         figure = self.get_figure_in_coords((mouse_x, mouse_y))
-        if figure is not None and figure.color == self.turn:
+        if figure is not None and figure.color == self.turn and not self.is_engine_turn():
             self.selected_figure = figure
             figure.select()
 
@@ -128,44 +432,155 @@ class Game:
         Returns:
             Figure or None: The figure if there is one in the given coordinates, or None if not.
         """
-        for figure in self.figures:
-            if figure.x == coords[0] and figure.y == coords[1]:
-                return figure
+        if 0 <= coords[0] <= 7 and 0 <= coords[1] <= 7:
+            return self.squares[to_square(*coords)]
         return None
 
+    def get_position(self):
+        """
+        Returns:
+            Position: the current position of the game built from its figures, with its Zobrist key in `key`;
+            a `BitboardPosition` if the game uses the bitboard backend
+        """
+        position_class = BitboardPosition if self.bitboards else Position
+        return position_class.from_figures(self.figures, self.turn, self.en_passant, self.halfmove_clock,
+                                           self.fullmove_number)
+
+    def add_figure(self, figure):
+        """
+        Puts a figure on the board in its coordinates.
+
+        Args:
+            figure (Figure): The figure to add.
+        """
+        self.figures.add(figure)
+        self.squares[to_square(figure.x, figure.y)] = figure
+
+    def remove_figure(self, figure):
+        """
+        Takes a figure off the board.
+
+        Args:
+            figure (Figure): The figure to remove.
+        """
+        self.figures.discard(figure)
+        if self.squares[to_square(figure.x, figure.y)] is figure:
+            self.squares[to_square(figure.x, figure.y)] = None
+
+    def move_figure(self, figure, coords):
+        """
+        Moves a figure to the given coordinates, without checking whether the move is legal.
+
+        Args:
+            figure (Figure): The figure to move.
+            coords (tuple): The new coordinates of the figure.
+        """
+        self.squares[to_square(figure.x, figure.y)] = None
+        figure.x, figure.y = coords
+        self.squares[to_square(*coords)] = figure
+
+    def get_status(self):
+        """
+        Returns:
+            PositionStatus: check, mate and stalemate status and legal moves of the side to move, which are computed
+            once per position and then served from the status cache
+        """
+        if self.status is None:
+            self.status = self.status_cache.get(self.get_position())
+        return self.status
+
+    def get_legal_targets(self, figure):
+        """
+        Serves the legal moves of a figure of the side to move from the moves of the whole position, which are
+        generated once per position.
+
+        Args:
+            figure (Figure): The figure whose moves are needed.
+
+        Returns:
+            list[tuple(int, int)]: coordinates the figure can move to
+        """
+        if self.legal_targets is None:
+            self.legal_targets = {}
+            for start, target, _ in self.get_status().legal_moves:
+                targets = self.legal_targets.setdefault(start, [])
+                if to_coords(target) not in targets:
+                    targets.append(to_coords(target))
+        return self.legal_targets.get(to_square(figure.x, figure.y), [])
+
     def is_mate(self):
         """
         Returns:
             bool: whether the game has reached checkmate or not
         """
-        arrangement = GameStatusHandler(self.figures)
-        return arrangement.is_mate(0) or arrangement.is_mate(1)
+        return self.get_status().mate
 
     def is_check(self):
         """
         Returns:
-            bool: whether any of two sides is in check right now or not
+            bool: whether the side to move is in check right now or not
         """
-        arrangement = GameStatusHandler(self.figures)
-        return arrangement.is_check(0) or arrangement.is_check(1)
+        return self.get_status().check
 
     def is_stalemate(self):
         """
         Returns:
             bool: whether the game has reached stalemate or not
         """
-        arrangement = GameStatusHandler(self.figures)
-        return arrangement.is_stalemate(0) or arrangement.is_stalemate(1)
+        return self.get_status().stalemate
 
-    def handle_game_status(self):
+    def is_threefold_repetition(self):
         """
-        Checks if game has reached checkmate or stalemate and ends it if that is the case.
+        Returns:
+            bool: whether the current position has occurred three times in the game, which is counted from the
+            hashed positions of the record of the game
+        """
+        return self.record.repetitions(self.ply) >= 3
+
+    def is_fifty_move_rule(self):
+        """
+        Returns:
+            bool: whether fifty moves have been played by both sides without a capture or a pawn move
+        """
+        return draws.is_fifty_move_rule(self.get_position())
+
+    def is_insufficient_material(self):
+        """
+        Returns:
+            bool: whether neither side has enough material left to mate
+        """
+        return draws.is_insufficient_material(self.get_position())
+
+    def get_draw_reason(self):
+        """
+        Returns:
+            str or None: the reason why the game is drawn besides stalemate, or None if it is not
+        """
+        if self.is_threefold_repetition():
+            return draws.THREEFOLD_REPETITION
+        if self.is_fifty_move_rule():
+            return draws.FIFTY_MOVE_RULE
+        if self.is_insufficient_material():
+            return draws.INSUFFICIENT_MATERIAL
+        return None
+
+    def get_result(self):
+        """
+        Returns:
+            str or None: "checkmate", "stalemate" or the reason of a draw if the game is over, None if it is not
         """
         if self.is_mate():
-            self.keep_doing = False
-            self.board.draw()
-            self.board.draw_result("checkmate")
+            return "checkmate"
         if self.is_stalemate():
+            return "stalemate"
+        return self.get_draw_reason()
+
+    def handle_game_status(self):
+        """
+        Checks if game has reached checkmate, stalemate or a draw and ends it if that is the case.
+        """
+        result = self.get_result()
+        if result is not None:
             self.keep_doing = False
             self.board.draw()
-            self.board.draw_result("stalemate")
+            self.board.draw_result(result)
@@ -4,6 +4,9 @@ This module provides a utility class:
 - `FenConverter` processes the FEN
 """
 
+from game.core import batch
+from game.core.position import Position, CASTLING_ROOKS, FEN_SYMBOLS, KING, PAWN, ROOK, WHITE, WHITE_SHORT, \
+    WHITE_LONG, BLACK_SHORT, BLACK_LONG, piece_color, to_coords
 from models.bishop import Bishop
 from models.king import King
 from models.knight import Knight
@@ -16,85 +19,120 @@ class FenConverter:
     """
     Class to handle the Forsyth–Edwards Notation to describe a particular board position in the game.
     https://en.wikipedia.org/wiki/Forsyth%E2%80%93Edwards_Notation
+    The FEN is parsed and written by `game.core.position.Position`, this class converts it from and into figures.
     """
 
-    piece_to_letter = {
-        "p": Pawn,
-        "r": Rook,
-        "n": Knight,
-        "b": Bishop,
-        "q": Queen,
-        "k": King,
-    }
+    # Figure classes indexed by the piece type of `game.core.position`
+    kind_to_figure = [None, Pawn, Knight, Bishop, Rook, Queen, King]
+
+    # Translation of the symbols of a piece placement into one character per square, whose code is the piece as
+    # an unsigned byte, and the characters it can produce
+    placement_table = str.maketrans({symbol: "".join(chr(piece & 0xFF) for piece in pieces)
+                                     for symbol, pieces in FEN_SYMBOLS.items()})
+    placement_squares = frozenset("".join(placement_table.values()) + "/")
 
     @classmethod
     def fen_converter(cls, game, fen):
         """
-        Converts a FEN string into a set of figures.
+        Converts a FEN string into a set of figures. Kings and rooks without castling rights are marked as moved.
+        If the FEN consists of the piece placement only, no figure is marked as moved.
 
         Args:
             game (Game): The game that figures will be a part of.
-            fen (str): The string with the FEN to be converted.
+            fen (str): The string with the FEN to be converted, either the piece placement only or more fields.
 
         Returns:
             set: A set of objects of figure subclasses.
         """
+        position = Position.from_fen(fen)
+        if len(fen.split()) == 1:
+            position.castling = WHITE_SHORT | WHITE_LONG | BLACK_SHORT | BLACK_LONG
+        return cls.position_to_figures(game, position)
 
-        rows = fen.split("/")
-        figures = set()
-
-        x, y = 0, 0
-        for row in rows:
-            for symbol in row:
-                if symbol.isdigit():
-                    x += int(symbol)
-                    continue
+    @classmethod
+    def position_to_figures(cls, game, position):
+        """
+        Creates the figures of a position. Kings and rooks that stand on their initial squares, but do not have
+        the respective castling rights, are marked as moved.
 
-                figures.add(cls.piece_to_letter[symbol.lower()](game, x, y, int(symbol.isupper())))
-                x += 1
+        Args:
+            game (Game): The game that figures will be a part of.
+            position (Position): The position to create the figures of.
 
-            x = 0
-            y += 1
+        Returns:
+            set: A set of objects of figure subclasses.
+        """
+        unmoved = set()
+        for king_square, rook_square, right in CASTLING_ROOKS:
+            if position.castling & right:
+                unmoved.update((king_square, rook_square))
 
+        figures = set()
+        for square, piece in enumerate(position.board):
+            if piece:
+                kind = abs(piece)
+                figure = cls.kind_to_figure[kind](game, *to_coords(square), piece_color(piece))
+                figure.been_moved = kind in (KING, ROOK) and square not in unmoved
+                figures.add(figure)
         return figures
 
     @classmethod
-    def into_fen_converter(cls, figures):
+    def en_passant_pawn(cls, position, figures):
+        """
+        Finds the pawn that can be taken en passant in a position.
+
+        Args:
+            position (Position): The position with the en passant square.
+            figures (Iterable[Figure]): The figures of the position.
+
+        Returns:
+            Pawn or None: The pawn that has just been moved two squares to the front, or None if there is none.
+        """
+        if position.en_passant is None:
+            return None
+        coords = to_coords(position.en_passant + (8 if position.turn == WHITE else -8))
+        return next((figure for figure in figures if (figure.x, figure.y) == coords and figure.kind == PAWN), None)
+
+    @classmethod
+    def into_fen_converter(cls, figures, turn=WHITE, en_passant=None, halfmove_clock=0, fullmove_number=1):
         """
         Converts a given position on the board into a FEN.
 
         Args:
             figures (set): The set of figures representing the position to be converted into FEN.
+            turn (int): The side / color to move.
+            en_passant (Pawn or None): The pawn that has just been moved two squares to the front.
+            halfmove_clock (int): Plies since the last capture or pawn move.
+            fullmove_number (int): Number of the move.
+
+        Returns:
+            str: A string with the FEN with all six fields.
+        """
+        return Position.from_figures(figures, turn, en_passant, halfmove_clock, fullmove_number).to_fen()
+
+    @classmethod
+    def fens_to_boards(cls, fens):
+        """
+        Converts FENs into a batch of boards for the vectorised queries of `game.core.batch`, which needs NumPy.
+        Only the piece placement is read: every symbol is translated into the bytes of its squares, so no `Position`
+        is built and the other fields are not checked.
+
+        Args:
+            fens (Iterable[str]): The FENs, either the piece placement only or more fields.
 
         Returns:
-            str: A string with the FEN.
+            np.ndarray: An N x 64 array of int8 with the pieces of every position, indexed by square.
+
+        Raises:
+            ValueError: The piece placement of a FEN is malformed.
+            ImportError: NumPy is not installed.
         """
-        fen = ""
-        empty_count = 0
-
-        for y in range(8):
-            for x in range(8):
-                square_empty = True
-                for figure in figures:
-                    if figure.x == x and figure.y == y:
-                        square_empty = False
-                        symbol = cls.piece_to_letter.get(type(figure), "")
-                        if figure.color == 1:
-                            symbol = symbol.upper()
-                        fen += symbol
-
-                if square_empty:
-                    empty_count += 1
-                else:
-                    if empty_count > 0:
-                        fen += str(empty_count)
-                        empty_count = 0
-
-            if empty_count > 0:
-                fen += str(empty_count)
-                empty_count = 0
-
-            if y < 7:
-                fen += "/"
-
-        return fen
+        rows = []
+        for fen in fens:
+            placement = fen.split(maxsplit=1)[0] if fen else ""
+            squares = placement.translate(cls.placement_table)
+            # 8 rows of 8 squares separated by 7 slashes
+            if len(squares) != 71 or squares[8::9] != "///////" or not cls.placement_squares.issuperset(squares):
+                raise ValueError(f"Invalid piece placement in FEN: {placement!r}")
+            rows.append(squares.replace("/", ""))
+        return batch.boards_from_bytes("".join(rows).encode("latin-1"))
@@ -1,48 +1,32 @@
 """
 game_status_handler.py
 This module provides:
-- `create_new_arrangement(current_arrangement, figure_to_move, move)`: a method to create a new arrangement according
-to the move
 - `GameStatusHandler`: a class to process legality of moves and arrangements in the game
 """
 
-
-def create_new_arrangement(current_arrangement, figure_to_move, move):
-    """
-    Converts the current arrangement of the board into a new one based on the figure being moved and
-    the move performed.
-
-    Args:
-        current_arrangement (set[Figures]): The current arrangement of the board.
-        figure_to_move (Figure): The figure that the player is moving.
-        move (tuple): The new coordinates of the figure.
-
-    Returns:
-        set[Figures]: The new arrangement of the board.
-    """
-    new_arrangement = []
-    for figure in current_arrangement:
-        if figure.x == move[0] and figure.y == move[1] and figure.color != figure_to_move.color:
-            continue
-
-        if figure == figure_to_move:
-            new_arrangement.append(type(figure)(figure.game, move[0], move[1], figure.color))
-        else:
-            new_arrangement.append(type(figure)(figure.game, figure.x, figure.y, figure.color))
-
-    return new_arrangement
+from game.core import bitboard, draws, movegen
+from game.core.position import Position, WHITE, WHITE_SHORT, WHITE_LONG, BLACK_SHORT, BLACK_LONG, \
+    to_square, to_coords
 
 
 class GameStatusHandler:
     """
     Handles the aspects regarding the legality of the moves and board arrangements.
+    The figures are converted into a `Position` once, and all the rules are evaluated on it.
     """
-    def __init__(self, arrangement):
+    def __init__(self, arrangement, turn=WHITE, en_passant=None, bitboards=False):
         """
         Args:
             arrangement (set[Figures]): The current board arrangement.
+            turn (int): The side to move.
+            en_passant (Pawn or None): The pawn that can be taken en passant.
+            bitboards (bool): Whether to evaluate the rules with the bitboard backend.
         """
         self.figures = arrangement.copy()
+        self.squares = {(figure.x, figure.y): figure for figure in self.figures}
+        self.rules = bitboard if bitboards else movegen
+        position_class = bitboard.BitboardPosition if bitboards else Position
+        self.position = position_class.from_figures(self.figures, turn, en_passant)
 
     def find_king_pos(self, given_side):
         """
@@ -54,11 +38,10 @@ class GameStatusHandler:
         Returns:
             tuple(int, int): A list containing the coordinates of the king as two integers.
         """
-        for figure in self.figures:
-            if figure.is_king and figure.color == given_side:
-                return figure.x, figure.y
-
-        raise RuntimeError("There is no king of the given color on the board")
+        king_square = self.position.kings[given_side]
+        if king_square is None:
+            raise RuntimeError("There is no king of the given color on the board")
+        return to_coords(king_square)
 
     def find_king(self, given_side):
         """
@@ -70,11 +53,7 @@ class GameStatusHandler:
         Returns:
             King: The object of the King.
         """
-        for figure in self.figures:
-            if figure.is_king and figure.color == given_side:
-                return figure
-
-        raise RuntimeError("There is no king of the given color on the board")
+        return self.squares[self.find_king_pos(given_side)]
 
     def is_any_figure_in_coords(self, coords):
         """
@@ -86,34 +65,32 @@ class GameStatusHandler:
         Returns:
             Figure or None: The figure if there is any figure in the given coordinates, or None if not.
         """
-        for figure in self.figures:
-            if figure.x == coords[0] and figure.y == coords[1]:
-                return figure
-        return None
+        return self.squares.get(tuple(coords))
 
     def get_moves(self, figure):
         """
-        Calculates all legal moves of a figure in the current arrangement.
+        Calculates all moves of a figure in the current arrangement, which follow its movement rules and are not
+        blocked by other figures. The moves may still leave the king in check.
 
         Args:
             figure (Figure): The figure whose moves need to be calculated.
 
         Returns:
-            list: A list containing lists of coordinates (int, int) representing all legal moves of the figure.
+            list: A list of coordinates (int, int) representing the moves of the figure.
         """
-        possible_moves = figure.calculate_moves()
-        legal_moves = []
+        return self._to_coordinates(self.rules.piece_moves(self._position_for(figure.color), self._square(figure)))
 
-        for direction in possible_moves:
-            for move in direction:
-                is_figure_in_way = self.is_any_figure_in_coords(move)
-                if is_figure_in_way is not None:
-                    if is_figure_in_way.color != figure.color:
-                        legal_moves.append(move)
-                    break
-                legal_moves.append(move)
+    def get_legal_moves(self, figure):
+        """
+        Calculates all legal moves of a figure in the current arrangement, including castling.
+
+        Args:
+            figure (Figure): The figure whose moves need to be calculated.
 
-        return legal_moves
+        Returns:
+            list: A list of coordinates (int, int) representing all legal moves of the figure.
+        """
+        return self._to_coordinates(self.rules.legal_moves(self._position_for(figure.color), self._square(figure)))
 
     def is_check(self, given_side):
         """
@@ -125,11 +102,7 @@ class GameStatusHandler:
         Returns:
             bool: True if the side is in check, False if not.
         """
-        king_pos = self.find_king_pos(given_side)
-        for figure in self.figures:
-            if figure.color != given_side and king_pos in self.get_moves(figure):
-                return True
-        return False
+        return self.rules.is_check(self.position, given_side)
 
     def is_mate(self, given_side):
         """
@@ -141,15 +114,7 @@ class GameStatusHandler:
         Returns:
             bool: True if the side is in mate, False if not.
         """
-        if self.is_check(given_side):
-            for figure in self.figures:
-                if figure.color == given_side:
-                    for move in self.get_moves(figure):
-                        new_arrangement = GameStatusHandler(create_new_arrangement(self.figures, figure, move))
-                        if not new_arrangement.is_check(given_side):
-                            return False
-            return True
-        return False
+        return self.rules.is_mate(self.position, given_side)
 
     def is_stalemate(self, given_side):
         """
@@ -161,15 +126,16 @@ class GameStatusHandler:
         Returns:
             bool: True if the side is in stalemate, False if not.
         """
-        if not self.is_check(given_side):
-            for figure in self.figures:
-                if figure.color == given_side:
-                    for move in self.get_moves(figure):
-                        new_arrangement = GameStatusHandler(create_new_arrangement(self.figures, figure, move))
-                        if not new_arrangement.is_check(given_side):
-                            return False
-            return True
-        return False
+        return self.rules.is_stalemate(self.position, given_side)
+
+    def is_insufficient_material(self):
+        """
+        Examines whether neither side has enough material left to mate.
+
+        Returns:
+            bool: True if no side can mate, False if not.
+        """
+        return draws.is_insufficient_material(self.position)
 
     def is_move_legal(self, figure, move):
         """
@@ -182,109 +148,48 @@ class GameStatusHandler:
         Returns:
             bool: True if the move is legal, False if not.
         """
-        arrangement_after_move = GameStatusHandler(create_new_arrangement(self.figures, figure, move))
-        if not arrangement_after_move.is_check(figure.color):
-            return True
-        return False
+        return self.rules.is_legal(self.position, (self._square(figure), to_square(*move), 0))
 
     def is_long_castle_possible(self, given_side):
-        if given_side == 1:
-            rook = None
-            for figure in self.figures:
-                if figure.color == given_side and (figure.x, figure.y) == (0, 7) and not figure.been_moved:
-                    rook = figure
-
-            if not self.find_king(given_side).been_moved and rook is not None:
-                coordinates_between = [(1, 7), (2, 7), (3, 7)]
-                no_pieces_between = True
-                for coordinates in coordinates_between:
-                    if self.is_any_figure_in_coords(coordinates) is not None:
-                        no_pieces_between = False
-
-                coordinates_king_passes = [(2, 7), (3, 7), (4, 7)]
-                no_checks_between = True
-                for coordinates in coordinates_king_passes:
-                    temp_figures = create_new_arrangement(self.figures, self.find_king(given_side), coordinates)
-                    temp_arrangement = GameStatusHandler(temp_figures)
-                    if temp_arrangement.is_check(given_side):
-                        no_checks_between = False
-
-                if no_pieces_between and no_checks_between:
-                    return True
-            return False
+        """
+        Args:
+            given_side (int): The color of the side to examine for.
 
-        else:
-            rook = None
-            for figure in self.figures:
-                if figure.color == given_side and (figure.x, figure.y) == (0, 0) and not figure.been_moved:
-                    rook = figure
-
-            if not self.find_king(given_side).been_moved and rook is not None:
-                coordinates_between = [(1, 0), (2, 0), (3, 0)]
-                no_pieces_between = True
-                for coordinates in coordinates_between:
-                    if self.is_any_figure_in_coords(coordinates) is not None:
-                        no_pieces_between = False
-
-                coordinates_king_passes = [(2, 0), (3, 0), (4, 0)]
-                no_checks_between = True
-                for coordinates in coordinates_king_passes:
-                    temp_figures = create_new_arrangement(self.figures, self.find_king(given_side), coordinates)
-                    temp_arrangement = GameStatusHandler(temp_figures)
-                    if temp_arrangement.is_check(given_side):
-                        no_checks_between = False
-
-                if no_pieces_between and no_checks_between:
-                    return True
-            return False
+        Returns:
+            bool: True if the side can castle to the queen side now, False if not.
+        """
+        return self._is_castle_possible(given_side, WHITE_LONG if given_side == WHITE else BLACK_LONG)
 
     def is_short_castle_possible(self, given_side):
-        if given_side == 1:
-            rook = None
-            for figure in self.figures:
-                if figure.color == given_side and (figure.x, figure.y) == (7, 7) and not figure.been_moved:
-                    rook = figure
-
-            if not self.find_king(given_side).been_moved and rook is not None:
-                coordinates_between = [(5, 7), (6, 7)]
-                no_pieces_between = True
-                for coordinates in coordinates_between:
-                    if self.is_any_figure_in_coords(coordinates) is not None:
-                        no_pieces_between = False
-
-                coordinates_king_passes = [(4, 7), (5, 7), (6, 7)]
-                no_checks_between = True
-                for coordinates in coordinates_king_passes:
-                    temp_figures = create_new_arrangement(self.figures, self.find_king(given_side), coordinates)
-                    temp_arrangement = GameStatusHandler(temp_figures)
-                    if temp_arrangement.is_check(given_side):
-                        no_checks_between = False
-
-                if no_pieces_between and no_checks_between:
-                    return True
-            return False
+        """
+        Args:
+            given_side (int): The color of the side to examine for.
+
+        Returns:
+            bool: True if the side can castle to the king side now, False if not.
+        """
+        return self._is_castle_possible(given_side, WHITE_SHORT if given_side == WHITE else BLACK_SHORT)
 
-        else:
-            rook = None
-            for figure in self.figures:
-                if figure.color == given_side and (figure.x, figure.y) == (7, 0) and not figure.been_moved:
-                    rook = figure
-
-            if not self.find_king(given_side).been_moved and rook is not None:
-                coordinates_between = [(5, 0), (6, 0)]
-                no_pieces_between = True
-                for coordinates in coordinates_between:
-                    if self.is_any_figure_in_coords(coordinates) is not None:
-                        no_pieces_between = False
-
-                coordinates_king_passes = [(4, 0), (5, 0), (6, 0)]
-                no_checks_between = True
-                for coordinates in coordinates_king_passes:
-                    temp_figures = create_new_arrangement(self.figures, self.find_king(given_side), coordinates)
-                    temp_arrangement = GameStatusHandler(temp_figures)
-                    if temp_arrangement.is_check(given_side):
-                        no_checks_between = False
-
-                if no_pieces_between and no_checks_between:
-                    return True
+    def _is_castle_possible(self, given_side, right):
+        position = self._position_for(given_side)
+        king_square = position.kings[given_side]
+        if king_square is None or not position.castling & right:
             return False
+        target = king_square + (2 if right in (WHITE_SHORT, BLACK_SHORT) else -2)
+        return (king_square, target, 0) in self.rules.legal_moves(position, king_square)
+
+    def _position_for(self, given_side):
+        return movegen.with_turn(self.position, given_side)
+
+    @staticmethod
+    def _square(figure):
+        return to_square(figure.x, figure.y)
+
+    @staticmethod
+    def _to_coordinates(moves):
+        coordinates = []
+        for _, target, _ in moves:
+            coords = to_coords(target)
+            if coords not in coordinates:
+                coordinates.append(coords)
+        return coordinates
@@ -0,0 +1,213 @@
+"""
+pgn.py
+This module provides:
+- `PgnGame`: a named tuple with the tags, the moves in SAN and the result of one game in Portable Game Notation
+- `read_games(stream)`: a generator that reads the games of a PGN file one by one
+- `format_game(game)` and `write_game(game, stream)`: methods to write a game in PGN
+- `game_from_moves(moves, tags, fen)`: a method to create a `PgnGame` from moves of the move generator
+
+The reader only keeps the game it is reading in memory, so files of any size can be replayed game by game.
+Comments, variations and numeric annotation glyphs are skipped.
+https://en.wikipedia.org/wiki/Portable_Game_Notation
+"""
+
+import re
+from typing import NamedTuple
+
+from game.core import movegen
+from game.core.position import Position, START_FEN
+from game.core.record import GameRecord
+from game.core.san import move_to_san, parse_san
+
+# Tags every game has, in the order they are written
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+TAG_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*]')
+TOKEN_PATTERN = re.compile(r"\{[^}]*}?|;.*|\(|\)|\$\d+|[^\s{;()$]+")
+MOVE_NUMBER_PATTERN = re.compile(r"^\d+\.*")
+
+
+class PgnGame(NamedTuple):
+    """
+    One game of a PGN file.
+    """
+    tags: dict
+    moves: list
+    result: str
+
+    def start_position(self):
+        """
+        Returns:
+            Position: the position the game starts from, given by the "FEN" tag or the initial position
+        """
+        return Position.from_fen(self.tags.get("FEN", START_FEN))
+
+    def replay(self):
+        """
+        Plays all the moves of the game.
+
+        Returns:
+            Position: the final position of the game, with the moves in the undo stack of the position
+
+        Raises:
+            ValueError: A move is malformed or illegal.
+        """
+        position = self.start_position()
+        for san in self.moves:
+            position.make_move(parse_san(position, san))
+        return position
+
+    def record(self, checkpoint_interval=16):
+        """
+        Plays all the moves of the game into a record, which allows to seek to any ply of the game quickly.
+
+        Args:
+            checkpoint_interval (int): number of plies between two snapshots of the position
+
+        Returns:
+            GameRecord: record of the moves of the game
+
+        Raises:
+            ValueError: A move is malformed or illegal.
+        """
+        record = GameRecord(self.tags.get("FEN", START_FEN), checkpoint_interval)
+        for san in self.moves:
+            record.append(parse_san(record.tip, san))
+        return record
+
+
+def read_games(stream):
+    """
+    Reads the games of a PGN file one by one.
+
+    Args:
+        stream (Iterable[str]): lines of the PGN, e.g. an open file
+
+    Yields:
+        PgnGame: every game of the file in order
+    """
+    tags, moves = {}, []
+    in_comment = False
+    variation_depth = 0
+
+    for line in stream:
+        line = line.lstrip("\ufeff")
+        if in_comment:
+            end = line.find("}")
+            if end < 0:
+                continue
+            line = line[end + 1:]
+            in_comment = False
+        elif line.startswith("%"):
+            continue
+        if variation_depth == 0 and line.startswith("["):
+            match = TAG_PATTERN.match(line)
+            if match:
+                if moves:
+                    yield PgnGame(tags, moves, tags.get("Result", "*"))
+                    tags, moves = {}, []
+                tags[match.group(1)] = re.sub(r"\\(.)", r"\1", match.group(2))
+                continue
+
+        for token in TOKEN_PATTERN.findall(line):
+            if token[0] in "{;":
+                # a comment, which continues on the next lines if it is not closed
+                in_comment = token[0] == "{" and not token.endswith("}")
+            elif token == "(":
+                variation_depth += 1
+            elif token == ")":
+                variation_depth -= 1
+            elif variation_depth or token.startswith("$"):
+                continue
+            elif token in RESULTS:
+                yield PgnGame(tags, moves, token)
+                tags, moves = {}, []
+            else:
+                san = MOVE_NUMBER_PATTERN.sub("", token)
+                if san:
+                    moves.append(san)
+
+    if tags or moves:
+        yield PgnGame(tags, moves, tags.get("Result", "*"))
+
+
+def game_from_moves(moves, tags=None, fen=START_FEN, result="*"):
+    """
+    Creates a PGN game from moves of the move generator.
+
+    Args:
+        moves (Iterable[tuple(int, int, int)]): legal moves played from the start position
+        tags (dict or None): tags of the game, e.g. the names of the players
+        fen (str): FEN of the start position
+        result (str): result of the game, "1-0", "0-1", "1/2-1/2" or "*" if the game is not finished
+
+    Returns:
+        PgnGame: the game with the moves in SAN
+    """
+    tags = dict(tags or {})
+    if fen != START_FEN:
+        tags.setdefault("SetUp", "1")
+        tags.setdefault("FEN", fen)
+    tags["Result"] = result
+
+    position = Position.from_fen(fen)
+    san_moves = []
+    for move in moves:
+        san_moves.append(move_to_san(position, move, movegen.legal_moves(position)))
+        position.make_move(move)
+    return PgnGame(tags, san_moves, result)
+
+
+def format_game(game, line_length=80):
+    """
+    Args:
+        game (PgnGame): the game to write
+        line_length (int): maximal length of the lines of the movetext
+
+    Returns:
+        str: the game in PGN, with the seven tag roster first and an empty line after the game
+    """
+    tags = {name: "?" for name in SEVEN_TAG_ROSTER}
+    tags.update(game.tags)
+    tags["Result"] = game.result
+    names = list(SEVEN_TAG_ROSTER) + [name for name in tags if name not in SEVEN_TAG_ROSTER]
+    lines = [f'[{name} "{_escape(tags[name])}"]' for name in names]
+    lines.append("")
+
+    start = game.start_position()
+    number, white = start.fullmove_number, start.turn
+    tokens = []
+    for index, san in enumerate(game.moves):
+        if white:
+            tokens.append(f"{number}.")
+        elif index == 0:
+            tokens.append(f"{number}...")
+        tokens.append(san)
+        if not white:
+            number += 1
+        white = not white
+    tokens.append(game.result)
+
+    text = ""
+    for token in tokens:
+        if text and len(text) + 1 + len(token) > line_length:
+            lines.append(text)
+            text = token
+        else:
+            text = f"{text} {token}" if text else token
+    lines.append(text)
+    return "\n".join(lines) + "\n\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def write_game(game, stream):
+    """
+    Args:
+        game (PgnGame): the game to write
+        stream (TextIO): stream to write to
+    """
+    stream.write(format_game(game))
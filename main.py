@@ -1,8 +1,22 @@
+import argparse
+
+from game.core.position import BLACK, START_FEN, WHITE
 from game.game import Game
 
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(description="Plays chess.")
+    parser.add_argument("--fen", default=START_FEN, help="position to start from (default: the initial position)")
+    parser.add_argument("--engine", choices=("white", "black"), default=None,
+                        help="side the computer plays (default: both sides are played by humans)")
+    parser.add_argument("--engine-time", type=float, default=1.0,
+                        help="seconds the computer may think about a move (default: 1)")
+    parser.add_argument("--bitboards", action="store_true",
+                        help="evaluate the moves and the game status with the bitboard backend")
+    args = parser.parse_args()
+
+    engine_color = {"white": WHITE, "black": BLACK}.get(args.engine)
+    game = Game(args.fen, engine_color, args.engine_time, args.bitboards)
     game.run()
 
 
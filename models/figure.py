@@ -4,41 +4,33 @@ This module provides:
 - `Figure`: a parent class for all the pieces in the game.
 """
 
-import pygame
+import os
 
+from game.core.position import PAWN, QUEEN, to_square
+from game.path import get_img_folder_path
 from game.utils.game_status_handler import GameStatusHandler
 
 
 class Figure:
     """
     Class that describes a generic piece. The attributes are coordinates, color and the game.
+    Importing the figures does not import pygame: the images are only loaded when a figure is drawn first.
     """
 
-    @property
-    def picture_white(self):
-        """
-        Get the picture of the white figure associated with this object.
-
-        This property is intended to be implemented in subclasses.
-        Subclasses should provide the black picture by loading it from img folder.
+    picture_white_file = None
+    """Name of the image file of the white figure in the img folder. Subclasses have to provide it."""
+    picture_black_file = None
+    """Name of the image file of the black figure in the img folder. Subclasses have to provide it."""
 
-        Raises:
-            NotImplementedError: This property is not implemented in the base class.
-        """
-        raise NotImplementedError()
+    kind = None
+    """Type of the piece in `game.core.position` (PAWN, KNIGHT, BISHOP, ROOK, QUEEN or KING)."""
 
-    @property
-    def picture_black(self):
-        """
-        Get the picture of the black figure associated with this object.
-
-        This property is intended to be implemented in subclasses.
-        Subclasses should provide the black picture by loading it from img folder.
-
-        Raises:
-            NotImplementedError: This property is not implemented in the base class.
-        """
-        raise NotImplementedError()
+    scale = 1.6
+    """Scale of the figure images relative to the image files."""
+    selected_scale = 1.1
+    """Scale of the image of a selected figure relative to the normal image."""
+    sprites = {}
+    """Scaled images shared by all figures, keyed by the type of figure, its color and whether it is selected."""
 
     @property
     def is_king(self):
@@ -63,12 +55,7 @@ class Figure:
         self.color = color  # 1 white  0 black
         self.is_selected = False
         self.been_moved = False
-        if color:
-            self.image = pygame.transform.rotozoom(self.picture_white, 0, 1.6)
-            self.factor = 1
-        else:
-            self.image = pygame.transform.rotozoom(self.picture_black, 0, 1.6)
-            self.factor = -1
+        self.factor = 1 if color else -1
 
     def __repr__(self):
         raise NotImplementedError
@@ -77,248 +64,136 @@ class Figure:
         """Draws the figure on the screen in its coordinates."""
         self.game.board.display.blit(self.image, (self.x * 100 + 35, self.y * 100 + 35))
 
+    @classmethod
+    def load_picture(cls, color):
+        """
+        Loads the image file of this type of figure from the img folder.
+
+        Args:
+            color (int): side / color of the figure
+
+        Returns:
+            pygame.Surface: the image as it is stored in the file
+
+        Raises:
+            NotImplementedError: The base class has no image files.
+        """
+        import pygame  # pylint: disable=import-outside-toplevel
+
+        file_name = cls.picture_white_file if color else cls.picture_black_file
+        if file_name is None:
+            raise NotImplementedError()
+        return pygame.image.load(os.path.join(get_img_folder_path(), file_name))
+
+    @classmethod
+    def get_sprite(cls, color, selected=False):
+        """
+        Returns the scaled image of this type of figure. Every image is scaled only once and then shared by all the
+        figures of the same type and color.
+
+        Args:
+            color (int): side / color of the figure
+            selected (bool): whether the bigger image of a selected figure is needed
+
+        Returns:
+            pygame.Surface: the scaled image
+        """
+        import pygame  # pylint: disable=import-outside-toplevel
+
+        key = (cls, color, selected)
+        sprite = Figure.sprites.get(key)
+        if sprite is None:
+            if selected:
+                sprite = pygame.transform.rotozoom(cls.get_sprite(color), 0, Figure.selected_scale)
+            else:
+                sprite = pygame.transform.rotozoom(cls.load_picture(color), 0, Figure.scale)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            Figure.sprites[key] = sprite
+        return sprite
+
+    @property
+    def image(self):
+        """
+        Returns:
+            pygame.Surface: the image of the figure, bigger if it is selected
+        """
+        return self.get_sprite(self.color, self.is_selected)
+
     def select(self):
         """Makes the image of the figure bigger, when it's selected."""
-        if self.is_selected:
-            return
         self.is_selected = True
-        self.image = pygame.transform.rotozoom(self.image, 0, 1.1)
 
     def deselect(self):
         """Makes the image of the figure normal, when it's deselected."""
         self.is_selected = False
-        if self.color:
-            self.image = pygame.transform.rotozoom(self.picture_white, 0, 1.6)
-        else:
-            self.image = pygame.transform.rotozoom(self.picture_black, 0, 1.6)
 
-    def move(self, mouse_x, mouse_y):
+    def move(self, mouse_x, mouse_y, promotion=QUEEN):
         """
         Moves the figure to the given coordinates if it is possible.
 
         Args:
             mouse_x (int): x coordinate of the field, where the player tries to move the figure
             mouse_y (int): y coordinate of the field, where the player tries to move the figure
+            promotion (int): piece type a pawn turns into on the last row, a queen if not given
 
         Returns:
             bool: True if move was possible (legal) and the figure was moved and False is not
         """
         mouse_coordinates = (mouse_x, mouse_y)
         if mouse_coordinates in self.get_legal_moves():
+            promotion = promotion if self.kind == PAWN and mouse_y in (0, 7) else 0
+            self.game.record_move((to_square(self.x, self.y), to_square(*mouse_coordinates), promotion))
             figure_in_coords = self.game.get_figure_in_coords(mouse_coordinates)
             if figure_in_coords:
-                for figure in self.game.figures:
-                    if figure == figure_in_coords:
-                        self.game.figures.remove(figure_in_coords)
-                        break
-            self.x, self.y = mouse_coordinates
+                self.game.remove_figure(figure_in_coords)
+            self.game.move_figure(self, mouse_coordinates)
             if not self.been_moved:
                 self.been_moved = True
 
+            self.game.halfmove_clock = 0 if figure_in_coords or self.kind == PAWN else self.game.halfmove_clock + 1
+            if not self.color:
+                self.game.fullmove_number += 1
             self.game.turn = not self.color
             self.deselect()
             self.game.selected_figure = None
 
             self.game.en_passant = None
+            self.game.mark_moved()
+            return True
+        return False
 
     def draw_possible_moves(self):
         """Draws the possible moves of the figure as circles in the respective coordinates."""
         for move in self.get_legal_moves():
-            pygame.draw.circle(self.game.board.display, (80, 80, 80), (move[0] * 100 + 85, move[1] * 100 + 85), 20)
-
-    def calculate_moves(self):
-        """
-        Calculates all possible moves of the figure, ignoring its legality and other figures. Only considers the
-        edges of the board or specific rules on how the figure can move (e.g. King, Pawn, knight).
-        This method should be overwritten for each subclass of Figure, since all figures move differently.
-
-        Returns:
-            list[tuple(int, int)]: possible moves
-        """
-        raise NotImplementedError("This method should be implemented in child classes")
+            self.game.board.draw_move_marker(move)
 
     def get_all_moves(self):
         """
-        If the path to the move is blocked by a different figure, that move and all the next moves on the same path
-        are removed from possible moves. If the figure blocking the path is the figure of the opposing color, that move
-        is still added to the possible moves (representing capturing the figure), but all the following ones are not.
+        Calculates the moves that follow the movement rules of the figure. If the path to the move is blocked by a
+        different figure, that move and all the next moves on the same path are not included. If the figure blocking
+        the path is the figure of the opposing color, that move is still included (representing capturing the figure).
 
         Returns:
             list[tuple(int, int)]: moves that are not blocked by other figures
         """
-        possible_moves = self.calculate_moves()
-        legal_moves = []
-
-        for direction in possible_moves:
-            for move in direction:
-                is_figure_in_way = self.game.get_figure_in_coords(move)
-                if is_figure_in_way:
-                    if is_figure_in_way.color != self.color:
-                        legal_moves.append(move)
-                    break
-                legal_moves.append(move)
-
-        return legal_moves
+        return self.get_status_handler().get_moves(self)
 
     def get_legal_moves(self):
         """
-        If the move is not legal, or rather will put you in check, such move is not added to legal moves.
-        Also add castling moves to the possible moves if self is the king and castling is possible.
+        Calculates the moves of the figure that do not put its own king in check, including castling for the king.
+        The moves of the side to move are served from the moves the game generates once per position.
 
         Returns:
             list[tuple(int, int)]: list with legal moves
         """
-        possible_moves = self.get_all_moves()
-        legal_moves = []
-        for move in possible_moves:
-            current_arrangement = GameStatusHandler(self.game.figures)
-            if current_arrangement.is_move_legal(self, move):
-                legal_moves.append(move)
-
-        if self.is_king:
-            arrangement = GameStatusHandler(self.game.figures)
-
-            if arrangement.is_short_castle_possible(self.color):
-                if self.color == 1:
-                    legal_moves.append((6, 7))
-                else:
-                    legal_moves.append((6, 0))
-            if arrangement.is_long_castle_possible(self.color):
-                if self.color == 1:
-                    legal_moves.append((2, 7))
-                else:
-                    legal_moves.append((2, 0))
-
-        return legal_moves
-
-    def moves_right(self):
-        """
-        Calculates the possible moves of the figure from current position to the right end of the board (horizontally)
-        (ignoring the pieces). Only considers the edges of the board.
-
-        Returns:
-            list[tuple(int, int)]: possible moves
-        """
-        possible_moves = []
-        temp_x = self.x + 1
-        while temp_x <= 7:
-            possible_moves.append((temp_x, self.y))
-            temp_x += 1
-
-        return possible_moves
-
-    def moves_left(self):
-        """
-        Calculates the possible moves of the figure from current position to the left end of the board (horizontally)
-        (ignoring the pieces). Only considers the edges of the board.
-
-        Returns:
-            list[tuple(int, int)]: possible moves
-        """
-        possible_moves = []
-        temp_x = self.x - 1
-        while temp_x >= 0:
-            possible_moves.append((temp_x, self.y))
-            temp_x -= 1
-
-        return possible_moves
-
-    def moves_up(self):
-        """
-        Calculates the possible moves of the figure from current position to the top end of the board (vertically)
-        (ignoring the pieces). Only considers the edges of the board.
-
-        Returns:
-            list[tuple(int, int)]: possible moves
-        """
-        possible_moves = []
-        temp_y = self.y - 1
-        while temp_y >= 0:
-            possible_moves.append((self.x, temp_y))
-            temp_y -= 1
-
-        return possible_moves
-
-    def moves_down(self):
-        """
-        Calculates the possible moves of the figure from current position to the bottom end of the board (vertically)
-        (ignoring the pieces). Only considers the edges of the board.
-
-        Returns:
-            list[tuple(int, int)]: possible moves
-        """
-        possible_moves = []
-        temp_y = self.y + 1
-        while temp_y <= 7:
-            possible_moves.append((self.x, temp_y))
-            temp_y += 1
-
-        return possible_moves
-
-    def moves_up_right(self):
-        """
-        Calculates the possible moves of the figure from current position going up and right (diagonally)
-        (ignoring the pieces). Only considers the edges of the board.
+        if self.color == self.game.turn and self.game.get_figure_in_coords((self.x, self.y)) is self:
+            return self.game.get_legal_targets(self)
+        return self.get_status_handler().get_legal_moves(self)
 
-        Returns:
-            list[tuple(int, int)]: possible moves
-        """
-        possible_moves = []
-        temp_x, temp_y = self.x + 1, self.y - 1
-        while temp_x <= 7 and temp_y >= 0:
-            possible_moves.append((temp_x, temp_y))
-            temp_x += 1
-            temp_y -= 1
-
-        return possible_moves
-
-    def moves_up_left(self):
-        """
-        Calculates the possible moves of the figure from current position going up and left (diagonally)
-        (ignoring the pieces). Only considers the edges of the board.
-
-        Returns:
-            list[tuple(int, int)]: possible moves
+    def get_status_handler(self):
         """
-        possible_moves = []
-        temp_x, temp_y = self.x - 1, self.y - 1
-        while temp_x >= 0 and temp_y >= 0:
-            possible_moves.append((temp_x, temp_y))
-            temp_x -= 1
-            temp_y -= 1
-
-        return possible_moves
-
-    def moves_down_right(self):
-        """
-        Calculates the possible moves of the figure from current position going down and right (diagonally)
-        (ignoring the pieces). Only considers the edges of the board.
-
-        Returns:
-            list[tuple(int, int)]: possible moves
-        """
-        possible_moves = []
-        temp_x, temp_y = self.x + 1, self.y + 1
-        while temp_x <= 7 and temp_y <= 7:
-            possible_moves.append((temp_x, temp_y))
-            temp_x += 1
-            temp_y += 1
-
-        return possible_moves
-
-    def moves_down_left(self):
-        """
-        Calculates the possible moves of the figure from current position going down and left (diagonally)
-        (ignoring the pieces). Only considers the edges of the board.
-
         Returns:
-            list[tuple(int, int)]: possible moves
+            GameStatusHandler: handler over the current arrangement of the game this figure is a part of
         """
-        possible_moves = []
-        temp_x, temp_y = self.x - 1, self.y + 1
-        while temp_x >= 0 and temp_y <= 7:
-            possible_moves.append((temp_x, temp_y))
-            temp_x -= 1
-            temp_y += 1
-
-        return possible_moves
+        return GameStatusHandler(self.game.figures, self.game.turn, self.game.en_passant, self.game.bitboards)
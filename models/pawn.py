@@ -4,109 +4,39 @@ This module provides:
 - `Pawn(Figure)`: a class to specifically represent a pawn in the game.
 """
 
-import os
-
-import pygame
-
-from game.path import get_img_folder_path
-from game.utils.game_status_handler import GameStatusHandler
+from game.core.position import PAWN, KNIGHT, BISHOP, ROOK, QUEEN
+from models.bishop import Bishop
 from models.figure import Figure
+from models.knight import Knight
 from models.queen import Queen
+from models.rook import Rook
 
 
 class Pawn(Figure):
     """
-    This class represents a pawn. calculate_moves() is overwritten according to how a pawn moves.
+    This class represents a pawn. Its moves are generated by `game.core.movegen`.
     """
-    picture_white = pygame.image.load(os.path.join(get_img_folder_path(), "pawn.png"))
-    picture_black = pygame.image.load(os.path.join(get_img_folder_path(), "black_pawn.png"))
-
-    def calculate_moves(self):
-        return self.basic_move() + self.diagonal_take() + self.calculate_en_passant()
-
-    def diagonal_take(self):
-        """
-        If there is a piece of the opposing color diagonally from a pawn that this move is added to
-        possible moves.
-
-        Returns:
-            list[list[tuple(int, int)]]: possible moves diagonally
-        """
-        arrangement = GameStatusHandler(self.game.figures)
-        extra_moves = []
-
-        if self.color == 1:
-            possible_figure1 = arrangement.is_any_figure_in_coords((self.x - 1, self.y - 1))
-            possible_figure2 = arrangement.is_any_figure_in_coords((self.x + 1, self.y - 1))
-
-            if possible_figure1 is not None and possible_figure1.color == 0:
-                extra_moves.append([(self.x - 1, self.y - 1)])
-            if possible_figure2 is not None and possible_figure2.color == 0:
-                extra_moves.append([(self.x + 1, self.y - 1)])
-        else:
-            possible_figure1 = arrangement.is_any_figure_in_coords((self.x - 1, self.y + 1))
-            possible_figure2 = arrangement.is_any_figure_in_coords((self.x + 1, self.y + 1))
-
-            if possible_figure1 is not None and possible_figure1.color == 1:
-                extra_moves.append([(self.x - 1, self.y + 1)])
-            if possible_figure2 is not None and possible_figure2.color == 1:
-                extra_moves.append([(self.x + 1, self.y + 1)])
-
-        return extra_moves
-
-    def basic_move(self):
-        """
-        Calculates the basic moves of a pawn. Either just one square, or if the pawn is on the starting rank
-        also two squares to the front.
-
-        Returns:
-            list[list[tuple(int, int)]]: possible moves forward
-        """
-        moves = []
-        arrangement = GameStatusHandler(self.game.figures)
-
-        if self.color == 1:
-            if arrangement.is_any_figure_in_coords((self.x, self.y - 1)) is None:
-                moves.append([(self.x, self.y - 1)])
-                if self.y == 6 and arrangement.is_any_figure_in_coords((self.x, self.y - 2)) is None:
-                    moves.append([(self.x, self.y - 2)])
-        else:
-            if arrangement.is_any_figure_in_coords((self.x, self.y + 1)) is None:
-                moves.append([(self.x, self.y + 1)])
-                if self.y == 1 and arrangement.is_any_figure_in_coords((self.x, self.y + 2)) is None:
-                    moves.append([(self.x, self.y + 2)])
-
-        return moves
-
-    def calculate_en_passant(self):
-        """
-        Calculates whether there is a possibility for en passant for this pawn right now.
-
-        Returns:
-            list[list[tuple(int, int)]]: en passant moves to take other pawns
-        """
-        en_passant_moves = []
-        if self.game.en_passant is not None:
-            if self.color == 1:
-                if self.game.en_passant.x in [self.x - 1, self.x + 1] and self.game.en_passant.y == self.y:
-                    en_passant_moves.append([(self.game.en_passant.x, self.game.en_passant.y - 1)])
-            else:
-                if self.game.en_passant.x in [self.x - 1, self.x + 1] and self.game.en_passant.y == self.y:
-                    en_passant_moves.append([(self.game.en_passant.x, self.game.en_passant.y + 1)])
-        return en_passant_moves
+    picture_white_file = "pawn.png"
+    picture_black_file = "black_pawn.png"
+    kind = PAWN
 
     def __repr__(self):
         return f"Pawn_Object_at_{self.x}/{self.y}"
 
-    def move(self, mouse_x, mouse_y):
+    # Figure classes a pawn can be promoted to, by the piece type
+    promotion_figures = {KNIGHT: Knight, BISHOP: Bishop, ROOK: Rook, QUEEN: Queen}
+
+    def move(self, mouse_x, mouse_y, promotion=QUEEN):
         prev_x, prev_y = self.x, self.y
-        super().move(mouse_x, mouse_y)
-        self.remove_figure_after_en_passant(prev_x, prev_y)
+        en_passant = self.game.en_passant
+        moved = super().move(mouse_x, mouse_y, promotion)
+        self.remove_figure_after_en_passant(prev_x, prev_y, en_passant)
         self.set_en_passant(prev_y)
-        # Turning Pawn into Queen if it's on the end of the board
+        # Turning the Pawn into the promotion piece if it's on the end of the board
         if isinstance(self, Pawn) and ((self.y == 0 and self.color == 1) or (self.y == 7 and self.color == 0)):
-            self.pawn_to_queen()
+            self.promote(promotion)
             self.game.pawn_switched_to_queen = True
+        return moved
 
     def set_en_passant(self, prev_y):
         """
@@ -118,26 +48,27 @@ class Pawn(Figure):
         if abs(prev_y - self.y) == 2:
             self.game.en_passant = self
 
-    def remove_figure_after_en_passant(self, prev_x, prev_y):
+    def remove_figure_after_en_passant(self, prev_x, prev_y, en_passant):
         """
-        If this pawn has been moved in the en passant shape (1 forward and 1 to the side) a piece has to be removed
-        since en passant always is a take.
+        If this pawn has been moved in the en passant shape (1 forward and 1 to the side) behind the pawn that
+        could be taken en passant, that pawn has to be removed since en passant always is a take.
 
         Args:
             prev_x (int): previous x position of this pawn
             prev_y (int): previous y position of this pawn
+            en_passant (Pawn or None): the pawn that could be taken en passant before this move
         """
         if abs(prev_x - self.x) == 1 and abs(prev_y - self.y) == 1:
             figure_in_coords = self.game.get_figure_in_coords((self.x, prev_y))
-            if figure_in_coords:
-                for figure in self.game.figures:
-                    if figure == figure_in_coords:
-                        self.game.figures.remove(figure_in_coords)
-                        break
+            if figure_in_coords is not None and figure_in_coords is en_passant:
+                self.game.remove_figure(figure_in_coords)
 
-    def pawn_to_queen(self):
+    def promote(self, kind=QUEEN):
         """
-        Replaces the object of the pawn with the object of a Queen in the same coordinates.
+        Replaces the object of the pawn with a figure of the given type in the same coordinates.
+
+        Args:
+            kind (int): piece type of the new figure (KNIGHT, BISHOP, ROOK or QUEEN)
         """
-        self.game.figures.add(Queen(self.game, self.x, self.y, self.color))
-        self.game.figures.remove(self)
+        self.game.remove_figure(self)
+        self.game.add_figure(self.promotion_figures[kind](self.game, self.x, self.y, self.color))
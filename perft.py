@@ -0,0 +1,45 @@
+"""
+Command-line tool to count the nodes of the legal move tree of a position, e.g.
+
+    python perft.py 4 --fen "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+It prints the number of nodes below every root move, the total number of nodes and the nodes per second.
+With `--workers N` the root moves are split across N processes.
+"""
+
+import argparse
+import time
+
+from game.core.perft import divide, move_to_uci, parallel_divide
+from game.core.position import Position, START_FEN
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Counts the nodes of the legal move tree of a position.")
+    parser.add_argument("depth", type=int, help="depth of the tree in plies")
+    parser.add_argument("--fen", default=START_FEN, help="position to start from (default: the initial position)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes to split the root moves across, 0 for one per CPU")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("the depth has to be at least 1")
+
+    position = Position.from_fen(args.fen)
+    start = time.perf_counter()
+    if args.workers == 1:
+        counts = divide(position, args.depth)
+    else:
+        counts = parallel_divide(position, args.depth, args.workers or None)
+    elapsed = time.perf_counter() - start
+
+    for move, nodes in sorted(counts.items(), key=lambda item: move_to_uci(item[0])):
+        print(f"{move_to_uci(move)}: {nodes}")
+    total = sum(counts.values())
+    print()
+    print(f"Nodes: {total}")
+    print(f"Time: {elapsed:.3f} s")
+    print(f"Nodes per second: {total / elapsed if elapsed > 0 else 0:.0f}")
+
+
+if __name__ == "__main__":
+    main()
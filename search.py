@@ -0,0 +1,54 @@
+"""
+Command-line tool to search the best move of a position with the engine, e.g.
+
+    python search.py --fen "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5Q2/PPPP1PPP/RNB1K1NR w KQkq - 2 3" --depth 4
+
+It prints the depth, score, nodes, nodes per second and principal variation after every iteration of the search,
+which makes it the throughput check of the engine.
+"""
+
+import argparse
+
+from game.core.perft import move_to_uci
+from game.core.evaluation import EvaluatedPosition
+from game.core.position import START_FEN
+from game.core.search import Searcher, MATE_BOUND, MATE_SCORE
+
+
+def format_score(score):
+    """
+    Args:
+        score (int): score of the search
+
+    Returns:
+        str: the score in centipawns, or the number of moves to a mate
+    """
+    if score > MATE_BOUND:
+        return f"mate {(MATE_SCORE - score + 1) // 2}"
+    if score < -MATE_BOUND:
+        return f"mate -{(MATE_SCORE + score + 1) // 2}"
+    return f"cp {score}"
+
+
+def print_info(info):
+    """
+    Args:
+        info (SearchInfo): result of one iteration of the search
+    """
+    print(f"depth {info.depth} score {format_score(info.score)} nodes {info.nodes} nps {info.nps:.0f} "
+          f"time {info.time:.3f} pv {' '.join(move_to_uci(move) for move in info.pv)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Searches the best move of a position.")
+    parser.add_argument("--fen", default=START_FEN, help="position to search (default: the initial position)")
+    parser.add_argument("--depth", type=int, default=5, help="maximal depth in plies (default: 5)")
+    parser.add_argument("--time", type=float, default=None, help="maximal time in seconds (default: no limit)")
+    args = parser.parse_args()
+
+    result = Searcher().search(EvaluatedPosition.from_fen(args.fen), args.depth, args.time, on_iteration=print_info)
+    print(f"bestmove {move_to_uci(result.move) if result.move else '(none)'}")
+
+
+if __name__ == "__main__":
+    main()
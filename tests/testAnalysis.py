@@ -0,0 +1,52 @@
+import io
+import json
+import unittest
+
+from analyse import write_csv, write_json_lines
+from game.core.analysis import analyse_lines, parse_line
+from game.core.position import BLACK
+
+LINES = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1\n",
+    "\n",
+    "# Fool's mate\n",
+    'rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - bm Kf2; id "fool";\n',
+    "7k/5Q2/6K1/8/8/8/8/8 b - -\n",
+    "8/8/8/8/8/8/8/8 w - - 0 1\n",
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkx - 0 1\n",
+]
+
+
+class AnalysisTest(unittest.TestCase):
+
+    def test_one(self):
+        position, epd_id = parse_line('7k/5Q2/6K1/8/8/8/8/8 b - - hmvc 3; id "stalemate 1";')
+        self.assertEqual((position.turn, epd_id), (BLACK, "stalemate 1"))
+        position, epd_id = parse_line("7k/5Q2/6K1/8/8/8/8/8 b - - 3 40")
+        self.assertEqual((position.halfmove_clock, position.fullmove_number, epd_id), (3, 40, None))
+
+    def test_two(self):
+        results = list(analyse_lines(LINES))
+        self.assertEqual([result.line for result in results], [1, 4, 5, 6, 7])
+        self.assertEqual(results[0][3:7], (20, False, False, False))
+        self.assertEqual((results[1].id, results[1].mate), ("fool", True))
+        self.assertEqual((results[2].legal_moves, results[2].stalemate), (0, True))
+        self.assertIsNotNone(results[3].error)
+        self.assertIsNotNone(results[4].error)
+
+    def test_three(self):
+        self.assertEqual(list(analyse_lines(LINES, workers=2, chunk_size=1)), list(analyse_lines(LINES)))
+
+    def test_four(self):
+        lines = iter(LINES[:1] * 10)
+        results = analyse_lines(lines)
+        next(results)
+        self.assertEqual(len(list(lines)), 9)
+
+    def test_five(self):
+        output = io.StringIO()
+        write_json_lines(analyse_lines(LINES[:1]), output)
+        self.assertEqual(json.loads(output.getvalue())["legal_moves"], 20)
+        output = io.StringIO()
+        write_csv(analyse_lines(LINES[:1]), output)
+        self.assertEqual(output.getvalue().splitlines()[0], "line,fen,id,legal_moves,check,mate,stalemate,error")
@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from game.core import batch, movegen
+from game.core.bitboard import BitboardPosition
+from game.core.position import Position, START_FEN, WHITE, BLACK
+from game.utils.fen import FenConverter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+PROMOTIONS = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1"
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class BatchTest(unittest.TestCase):
+
+    def test_one(self):
+        boards = FenConverter.fens_to_boards([START_FEN, KIWIPETE, "4k3/8/8/3q4/8/8/8/3RK3 b - - 0 1"])
+        self.assertEqual((boards.shape, boards.dtype), ((3, 64), np.int8))
+        result = batch.analyse_batch(boards)
+        self.assertEqual(result.material.tolist(), [0, 0, -400])
+        self.assertEqual(result.mobility[0].tolist(), [20, 20])
+        self.assertEqual(result.in_check.tolist(), [[False, False]] * 3)
+        mate = FenConverter.fens_to_boards(["rr6/8/8/7k/8/8/K7/8", "8/8/8/8/8/5k2/6q1/7K"])
+        self.assertEqual(batch.in_check(mate).tolist(), [[False, True], [False, True]])
+        self.assertEqual(boards.tolist(), batch.boards_from_positions(
+            Position.from_fen(fen) for fen in [START_FEN, KIWIPETE, "4k3/8/8/3q4/8/8/8/3RK3 b - - 0 1"]).tolist())
+        self.assertEqual(FenConverter.fens_to_boards([]).shape, (0, 64))
+        for placement in ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN w", "8/8/8/8/8/8/8/7x", "9/7/8/8/8/8/8/8", "",
+                          "8/8/8/8/8/8/8/8/8"]:
+            with self.assertRaises(ValueError):
+                FenConverter.fens_to_boards([placement])
+
+    def test_two(self):
+        random.seed(25)
+        positions = []
+        for fen in [START_FEN, KIWIPETE, PROMOTIONS]:
+            position = Position.from_fen(fen)
+            for _ in range(150):
+                moves = movegen.legal_moves(position)
+                if not moves:
+                    break
+                position.make_move(random.choice(moves))
+                positions.append(position.copy())
+        result = batch.analyse_batch(batch.boards_from_positions(positions))
+        for index, position in enumerate(positions):
+            for side in (WHITE, BLACK):
+                probe = Position(position.board, side)
+                self.assertEqual(result.mobility[index, side], len(movegen.pseudo_legal_moves(probe)))
+                self.assertEqual(result.in_check[index, side], movegen.is_check(position, side))
+
+    def test_three(self):
+        positions = [BitboardPosition.from_fen(fen) for fen in [START_FEN, KIWIPETE, PROMOTIONS]]
+        boards = batch.boards_from_positions(positions)
+        bitboards = batch.bitboards_from_boards(boards)
+        self.assertEqual(bitboards.tolist(), [position.pieces for position in positions])
+        from_boards, from_bitboards = batch.analyse_batch(boards), batch.analyse_batch(bitboards)
+        for answer, expected in zip(from_bitboards, from_boards):
+            self.assertEqual(answer.tolist(), expected.tolist())
+        # castling is not counted
+        self.assertEqual(batch.mobility(boards[2:])[0, BLACK], len(movegen.pseudo_legal_moves(positions[2])) - 1)
+        self.assertRaises(ValueError, batch.material, np.zeros((2, 63), dtype=np.int8))
@@ -0,0 +1,77 @@
+import unittest
+
+from game.core import bitboard, movegen
+from game.core.bitboard import BitboardPosition
+from game.core.position import Position, WHITE, BLACK, to_square
+from game.utils.game_status_handler import GameStatusHandler
+from game.utils.fen import FenConverter
+from game.game import Game
+
+
+class BitboardTest(unittest.TestCase):
+
+    def test_one(self):
+        occupied = 1 << to_square(3, 2) | 1 << to_square(6, 4)
+        attacks = bitboard.rook_attacks(to_square(3, 4), occupied)
+        expected = {(3, 2), (3, 3), (3, 5), (3, 6), (3, 7), (0, 4), (1, 4), (2, 4), (4, 4), (5, 4), (6, 4)}
+        self.assertEqual(set(bitboard.squares_of(attacks)), {to_square(*coords) for coords in expected})
+
+    def test_two(self):
+        attacks = bitboard.bishop_attacks(to_square(0, 0), 1 << to_square(2, 2))
+        self.assertEqual(set(bitboard.squares_of(attacks)), {to_square(1, 1), to_square(2, 2)})
+
+    def test_three(self):
+        game = Game()
+        for fen in ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR",
+                    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R",
+                    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1"]:
+            for side in (WHITE, BLACK):
+                position = Position.from_figures(FenConverter.fen_converter(game, fen), side)
+                bitboard_position = BitboardPosition(position.board, position.turn, position.castling)
+                expected = sorted(movegen.legal_moves(position))
+                self.assertEqual(sorted(bitboard.legal_moves(bitboard_position)), expected)
+
+    def test_four(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "rr6/8/8/7k/8/8/K7/8")
+        util = GameStatusHandler(arrangement, bitboards=True)
+        self.assertEqual(util.is_mate(1), True)
+        self.assertEqual(util.is_stalemate(0), False)
+
+    def test_five(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1")
+        position = BitboardPosition.from_figures(arrangement, BLACK)
+        pieces, occupied = [list(side) for side in position.pieces], list(position.occupied)
+        for move in bitboard.pseudo_legal_moves(position):
+            position.make_move(move)
+            position.unmake_move()
+            self.assertEqual((position.pieces, position.occupied), (pieces, occupied))
+
+    def test_six(self):
+        # the king may not step back along the ray of the rook giving check, nor castle through an attack
+        for fen in ["4r2k/8/8/8/8/8/4K3/8 w - - 0 1", "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1",
+                    "r3k2r/8/8/8/8/8/5n2/R3K2R w KQkq - 0 1", "8/8/8/8/k2Pp2Q/8/8/3K4 b - d3 0 1"]:
+            position = BitboardPosition.from_fen(fen)
+            for move in bitboard.pseudo_legal_moves(position):
+                self.assertEqual(bitboard.is_legal(position, move), movegen.is_legal(Position.from_fen(fen), move))
+            expected = sorted(movegen.legal_moves(Position.from_fen(fen)))
+            self.assertEqual(sorted(bitboard.legal_moves(position)), expected)
+
+    def test_seven(self):
+        # the figures of a game with the bitboard backend get their moves and the status from it
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        games = [Game(fen), Game(fen, bitboards=True)]
+        self.assertIsInstance(games[1].get_position(), BitboardPosition)
+        self.assertIs(games[1].status_cache.rules, bitboard)
+        self.assertIs(next(iter(games[1].figures)).get_status_handler().rules, bitboard)
+        for start, target in [((4, 7), (2, 7)), ((1, 4), (1, 5)), ((3, 3), (3, 2))]:
+            moves = [{(figure.x, figure.y): sorted(figure.get_legal_moves()) for figure in game.figures}
+                     for game in games]
+            self.assertEqual(moves[0], moves[1])
+            for game in games:
+                self.assertTrue(game.get_figure_in_coords(start).move(*target))
+        self.assertEqual(games[0].get_fen(), games[1].get_fen())
+        statuses = [game.get_status() for game in games]
+        self.assertEqual(statuses[0][:3], statuses[1][:3])
+        self.assertEqual(sorted(statuses[0].legal_moves), sorted(statuses[1].legal_moves))
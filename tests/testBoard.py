@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+import pygame
+
+from game.game import Game
+
+
+class BoardTest(unittest.TestCase):
+
+    def test_one(self):
+        game = Game()
+        game.draw()
+        with mock.patch("pygame.display.update") as update:
+            game.draw()
+        update.assert_not_called()
+
+    def test_two(self):
+        game = Game()
+        game.draw()
+        pawn = game.get_figure_in_coords((4, 6))
+        game.selected_figure = pawn
+        pawn.select()
+        with mock.patch("pygame.display.update") as update:
+            game.draw()
+        self.assertEqual(len(update.call_args[0][0]), 3)
+
+        pawn.move(4, 4)
+        with mock.patch("pygame.display.update") as update:
+            game.draw()
+        rects = update.call_args[0][0]
+        self.assertEqual(len(rects), 3)
+        self.assertTrue(all(rect.width <= 110 and rect.height <= 110 for rect in rects))
+
+    def test_three(self):
+        game = Game()
+        game.draw()
+        game.board.invalidate()
+        with mock.patch("pygame.display.flip") as flip:
+            game.draw()
+        flip.assert_called_once()
+        self.assertIsInstance(game.board.background, pygame.Surface)
+
+    def test_four(self):
+        game = Game()
+        game.draw()
+        for start, target in [((6, 7), (5, 5)), ((4, 1), (4, 3)), ((4, 6), (4, 4))]:
+            figure = game.get_figure_in_coords(start)
+            game.selected_figure = figure
+            figure.select()
+            game.draw()
+            figure.move(*target)
+            game.draw()
+        game.selected_figure = game.get_figure_in_coords((3, 0))
+        game.selected_figure.select()
+        game.draw()
+        incremental = pygame.image.tostring(game.board.display, "RGB")
+        game.board.invalidate()
+        game.draw()
+        self.assertEqual(pygame.image.tostring(game.board.display, "RGB"), incremental)
+
+    def test_five(self):
+        game = Game()
+        pawns = [figure for figure in game.figures if figure.kind == 1 and figure.color == 1]
+        self.assertTrue(all(pawn.image is pawns[0].image for pawn in pawns))
+        pawns[0].select()
+        self.assertIsNot(pawns[0].image, pawns[1].image)
+        self.assertGreater(pawns[0].image.get_width(), pawns[1].image.get_width())
+        pawns[0].deselect()
+        self.assertIs(pawns[0].image, pawns[1].image)
@@ -0,0 +1,39 @@
+import unittest
+
+from game.core.cache import StatusCache
+from game.core.position import Position
+from game.game import Game
+
+
+class StatusCacheTest(unittest.TestCase):
+
+    def test_one(self):
+        cache = StatusCache()
+        position = Position.from_fen("rr6/8/8/7k/8/8/K7/8 w - -")
+        status = cache.get(position)
+        self.assertEqual((status.check, status.mate, status.stalemate, status.legal_moves), (True, True, False, ()))
+        self.assertIs(cache.get(position.copy()), status)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_two(self):
+        cache = StatusCache(capacity=2)
+        first = Position.from_fen("1r6/8/8/7k/8/8/7r/K7 w - -")
+        second = Position.from_fen("1r6/8/8/7k/8/7r/8/K7 w - -")
+        third = Position.from_fen("1r6/8/8/7k/8/7r/8/K7 b - -")
+        self.assertTrue(cache.get(first).stalemate)
+        cache.get(second)
+        cache.get(first)
+        cache.get(third)
+        self.assertEqual(len(cache), 2)
+        self.assertIn(first.key, cache.entries)
+        self.assertNotIn(second.key, cache.entries)
+
+    def test_three(self):
+        game = Game()
+        for start, target in [((5, 6), (5, 5)), ((4, 1), (4, 3)), ((6, 6), (6, 4)), ((3, 0), (7, 4))]:
+            self.assertFalse(game.is_mate())
+            game.get_figure_in_coords(start).move(*target)
+        self.assertTrue(game.is_mate())
+        self.assertTrue(game.is_check())
+        self.assertFalse(game.is_stalemate())
+        self.assertEqual(game.status_cache.misses, 5)
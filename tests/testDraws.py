@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+
+from game.core.draws import is_insufficient_material, is_fifty_move_rule
+from game.core.position import Position, parse_square
+from game.core.record import GameRecord
+from game.game import Game
+from game.utils.fen import FenConverter
+from game.utils.game_status_handler import GameStatusHandler
+
+KNIGHT_SHUFFLE = [((6, 7), (5, 5)), ((6, 0), (5, 2)), ((5, 5), (6, 7)), ((5, 2), (6, 0))]
+
+
+def shuffle_moves():
+    return [(parse_square(start), parse_square(target), 0) for start, target in
+            [("g1", "f3"), ("g8", "f6"), ("f3", "g1"), ("f6", "g8")]]
+
+
+class DrawsTest(unittest.TestCase):
+
+    def test_one(self):
+        for fen, expected in [("8/8/8/4k3/8/8/8/4K3 w - -", True), ("8/8/8/4k3/8/8/8/4KN2 w - -", True),
+                              ("8/8/8/4k3/8/8/8/4KB2 w - -", True), ("8/8/8/2b1k3/8/8/8/4KB2 w - -", False),
+                              ("8/8/8/3bk3/8/8/8/4KB2 w - -", True), ("8/8/8/4k3/8/8/8/3NKN2 w - -", False),
+                              ("8/8/8/2n1k3/8/8/8/4KB2 w - -", False), ("8/8/8/4k3/8/8/4P3/4K3 w - -", False),
+                              ("8/8/8/4k3/8/8/8/4K2R w - -", False), ("8/8/8/4k3/8/8/8/q3K3 w - -", False)]:
+            self.assertEqual(is_insufficient_material(Position.from_fen(fen)), expected, fen)
+
+    def test_two(self):
+        self.assertFalse(is_fifty_move_rule(Position.from_fen("8/8/8/4k3/8/8/8/4K2R w - - 99 80")))
+        self.assertTrue(is_fifty_move_rule(Position.from_fen("8/8/8/4k3/8/8/8/4K2R w - - 100 80")))
+
+    def test_three(self):
+        record = GameRecord.from_moves(shuffle_moves() * 2, checkpoint_interval=3)
+        self.assertEqual([record.repetitions(ply) for ply in range(9)], [1, 1, 1, 1, 2, 2, 2, 2, 3])
+        self.assertEqual(record.repetitions(), 3)
+        record.truncate(6)
+        self.assertEqual(record.repetitions(), 2)
+        record.append(shuffle_moves()[2])
+        self.assertEqual(record.repetitions(), 2)
+
+    def test_four(self):
+        game = Game()
+        for start, target in KNIGHT_SHUFFLE * 2:
+            self.assertFalse(game.is_threefold_repetition())
+            game.get_figure_in_coords(start).move(*target)
+        self.assertEqual(game.get_draw_reason(), "threefold repetition")
+        with mock.patch.object(game.board, "draw_result") as draw_result:
+            game.handle_game_status()
+            draw_result.assert_called_once_with("threefold repetition")
+        self.assertFalse(game.keep_doing)
+        game.undo()
+        self.assertIsNone(game.get_result())
+
+    def test_five(self):
+        game = Game("4k3/8/8/8/8/8/4P3/R3K3 w - - 99 70")
+        game.get_figure_in_coords((0, 7)).move(0, 6)
+        self.assertEqual(game.get_result(), "fifty-move rule")
+        game.undo()
+        game.get_figure_in_coords((4, 6)).move(4, 4)
+        self.assertIsNone(game.get_result())
+
+    def test_six(self):
+        game = Game("4k3/8/8/8/8/8/8/r3K2B w - - 0 1")
+        self.assertFalse(game.is_insufficient_material())
+        game.load_fen("4k3/8/8/8/8/8/8/4K2B w - - 0 1")
+        self.assertEqual(game.get_result(), "insufficient material")
+        handler = GameStatusHandler(FenConverter.fen_converter(game, "4k3/8/8/8/8/8/8/4K2B"))
+        self.assertTrue(handler.is_insufficient_material())
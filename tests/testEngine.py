@@ -0,0 +1,106 @@
+import time
+import unittest
+
+import pygame
+
+from game.core.position import Position, BLACK, WHITE, KNIGHT, parse_square, to_coords
+from game.core.search import Searcher
+from game.engine import ENGINE_MOVE_EVENT, EngineWorker
+from game.game import Game
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+def wait_for_engine_move(timeout=5000):
+    event = pygame.event.wait(timeout)
+    while event.type not in (ENGINE_MOVE_EVENT, pygame.NOEVENT):
+        event = pygame.event.wait(timeout)
+    return event
+
+
+class EngineTest(unittest.TestCase):
+
+    def setUp(self):
+        pygame.init()
+        pygame.event.clear()
+
+    def test_one(self):
+        worker = EngineWorker(time_limit=0.2)
+        start = time.perf_counter()
+        worker.start(Position.from_fen(KIWIPETE), 7)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertTrue(worker.is_thinking)
+        event = wait_for_engine_move()
+        self.assertEqual(event.type, ENGINE_MOVE_EVENT)
+        self.assertEqual(event.ply, 7)
+        self.assertTrue(worker.is_current(event))
+        self.assertEqual(event.move, event.info.move)
+
+    def test_two(self):
+        worker = EngineWorker(time_limit=30)
+        worker.start(Position.from_fen(KIWIPETE), 0)
+        start = time.perf_counter()
+        worker.cancel()
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertFalse(worker.is_thinking)
+        self.assertEqual(pygame.event.get(ENGINE_MOVE_EVENT), [])
+
+    def test_three(self):
+        game = Game(engine_color=BLACK, engine_time=0.1)
+        game.start_engine_if_needed()
+        self.assertIsNone(game.engine_ply)
+        game.get_figure_in_coords((4, 6)).move(4, 4)
+        self.assertTrue(game.is_engine_turn())
+        game.handling_figure_selection(4, 1)
+        self.assertIsNone(game.selected_figure)
+        game.start_engine_if_needed()
+        game.process_engine_move_event(wait_for_engine_move())
+        self.assertEqual((game.ply, game.turn), (2, WHITE))
+        self.assertFalse(game.is_engine_turn())
+
+    def test_four(self):
+        game = Game(engine_color=BLACK, engine_time=30)
+        game.get_figure_in_coords((4, 6)).move(4, 4)
+        game.start_engine_if_needed()
+        self.assertTrue(game.engine.is_thinking)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LEFT, mod=0))
+        game.process_events()
+        self.assertFalse(game.engine.is_thinking)
+        self.assertEqual((game.ply, game.engine_ply), (0, None))
+
+    def test_five(self):
+        game = Game(engine_color=WHITE, engine_time=30)
+        game.start_engine_if_needed()
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        game.run()
+        self.assertFalse(game.engine.is_thinking)
+
+    def test_six(self):
+        game = Game("7k/P7/8/8/8/8/8/K7 w - - 0 1", engine_color=WHITE)
+        promotion = (parse_square("a7"), parse_square("a8"), KNIGHT)
+        game.process_engine_move_event(pygame.event.Event(ENGINE_MOVE_EVENT, move=promotion, ply=0,
+                                                          search_id=game.engine.search_id, info=None))
+        self.assertEqual(game.get_fen(), "N6k/8/8/8/8/8/8/K7 b - - 0 1")
+        self.assertEqual(game.record.tip.to_fen(), game.get_fen())
+        self.assertTrue(game.undo() and game.redo())
+        self.assertEqual(game.get_figure_in_coords((0, 0)).kind, KNIGHT)
+        game.undo()
+        illegal = (parse_square("a1"), parse_square("a3"), 0)
+        game.engine_ply = 0
+        with self.assertWarns(RuntimeWarning):
+            game.process_engine_move_event(pygame.event.Event(ENGINE_MOVE_EVENT, move=illegal, ply=0,
+                                                              search_id=game.engine.search_id, info=None))
+        self.assertEqual((game.ply, game.engine_ply), (0, None))
+
+    def test_seven(self):
+        # the knight has gone back and forth once, so b1c3 would repeat the start position a third time
+        game = Game("7k/8/8/8/8/2N5/8/5BK1 b - - 1 1", engine_color=WHITE, engine_time=0.5)
+        for move in ["h8g8", "c3b1", "g8h8", "b1c3", "h8g8", "c3b1", "g8h8"]:
+            game.get_figure_in_coords(to_coords(parse_square(move[:2]))).move(*to_coords(parse_square(move[2:])))
+        repeating = (parse_square("b1"), parse_square("c3"), 0)
+        self.assertEqual(Searcher().search(game.record.position_at(game.ply), 3).move, repeating)
+        game.start_engine_if_needed()
+        game.process_engine_move_event(wait_for_engine_move())
+        self.assertEqual(game.ply, 8)
+        self.assertNotEqual(game.record.moves[-1], repeating)
+        self.assertIsNone(game.get_result())
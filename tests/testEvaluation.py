@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from game.core import evaluation, movegen
+from game.core.evaluation import EvaluatedPosition, evaluate, score_board
+from game.core.position import Position, START_FEN, BLACK, PAWN, KING, parse_square
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+PROMOTIONS = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1"
+
+
+class EvaluationTest(unittest.TestCase):
+
+    def test_one(self):
+        self.assertEqual(evaluate(Position.from_fen(START_FEN)), 0)
+        self.assertEqual(evaluate(EvaluatedPosition.from_fen(START_FEN)), 0)
+        self.assertEqual(EvaluatedPosition.from_fen(START_FEN).phase, evaluation.MAX_PHASE)
+        self.assertGreater(evaluate(Position.from_fen("4k3/8/8/3q4/8/8/8/3RK3 b - - 0 1")), 300)
+
+    def test_two(self):
+        # the same position with the colors swapped scores the same for the side to move
+        for fen, mirrored in [(KIWIPETE, "r3k2r/pppbbppp/2n2q1P/1P2p3/3pn3/BN2PNP1/P1PPQPB1/R3K2R b KQkq - 0 1"),
+                              ("8/8/8/3k4/8/8/4P3/4K3 w - - 0 1", "4k3/4p3/8/8/3K4/8/8/8 b - - 0 1")]:
+            self.assertEqual(evaluate(Position.from_fen(fen)), evaluate(Position.from_fen(mirrored)))
+
+    def test_three(self):
+        # the king belongs to the center in the endgame, but not in the middle game
+        end_game = Position.from_fen("8/8/8/3k4/8/8/8/4K3 w - - 0 1")
+        self.assertLess(evaluate(end_game), 0)
+        middle_game = Position.from_fen("r1bq1rk1/pppp1ppp/2n2n2/4p3/3K4/8/PPPP1PPP/RNBQ1R2 w - - 0 1")
+        castled = Position.from_fen("r1bq1rk1/pppp1ppp/2n2n2/4p3/8/8/PPPP1PPP/RNBQ1RK1 w - - 0 1")
+        self.assertLess(evaluate(middle_game), evaluate(castled))
+        self.assertEqual(evaluation.MIDDLE_GAME_TABLE[(KING + PAWN) * 64 + parse_square("e4")],
+                         -evaluation.MIDDLE_GAME_TABLE[(KING - PAWN) * 64 + parse_square("e5")])
+
+    def test_four(self):
+        random.seed(4)
+        for fen in [START_FEN, KIWIPETE, PROMOTIONS]:
+            position = EvaluatedPosition.from_fen(fen)
+            for _ in range(200):
+                moves = movegen.legal_moves(position)
+                if not moves:
+                    break
+                position.make_move(random.choice(moves))
+                self.assertEqual((position.middle_game, position.end_game, position.phase),
+                                 score_board(position.board))
+                self.assertEqual(evaluate(position), evaluate(Position.from_fen(position.to_fen())))
+            while position.history:
+                position.unmake_move()
+            self.assertEqual((position.middle_game, position.end_game, position.phase), score_board(position.board))
+            self.assertEqual(position.to_fen(), fen)
+
+    def test_five(self):
+        position = EvaluatedPosition.from_fen(PROMOTIONS)
+        self.assertEqual(position.turn, BLACK)
+        for move in movegen.legal_moves(position):
+            position.make_move(move)
+            self.assertEqual((position.middle_game, position.end_game, position.phase),
+                             score_board(position.board))
+            position.unmake_move()
+            self.assertEqual(position.scores, [])
@@ -0,0 +1,92 @@
+import unittest
+
+from game.core import movegen
+from game.core.analysis import analyse_line
+from game.core.position import Position, START_FEN, BLACK, WHITE, KING, WHITE_LONG, BLACK_SHORT, BLACK_LONG
+from game.game import Game
+from game.utils.fen import FenConverter
+
+from models.king import King
+from models.pawn import Pawn
+
+
+class FenTest(unittest.TestCase):
+
+    def test_one(self):
+        game = Game()
+        self.assertEqual(FenConverter.into_fen_converter(game.figures), START_FEN)
+        self.assertEqual(game.get_fen(), START_FEN)
+
+    def test_two(self):
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b Qk - 7 21"
+        game = Game(fen)
+        self.assertEqual(game.turn, BLACK)
+        self.assertEqual((game.halfmove_clock, game.fullmove_number), (7, 21))
+        self.assertEqual(game.get_position().castling, WHITE_LONG | BLACK_SHORT)
+        self.assertEqual(game.get_fen(), fen)
+
+    def test_three(self):
+        fen = "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3"
+        game = Game(fen)
+        self.assertIsInstance(game.en_passant, Pawn)
+        self.assertEqual((game.en_passant.x, game.en_passant.y), (5, 3))
+        self.assertEqual(sorted(game.get_figure_in_coords((4, 3)).get_legal_moves()), [(4, 2), (5, 2)])
+        self.assertEqual(game.get_fen(), fen)
+
+    def test_four(self):
+        game = Game()
+        game.get_figure_in_coords((6, 7)).move(5, 5)
+        self.assertEqual(game.get_fen(), "rnbqkbnr/pppppppp/8/8/8/5N2/PPPPPPPP/RNBQKB1R b KQkq - 1 1")
+        game.get_figure_in_coords((4, 1)).move(4, 3)
+        self.assertEqual(game.get_fen(), "rnbqkbnr/pppp1ppp/8/4p3/8/5N2/PPPPPPPP/RNBQKB1R w KQkq e6 0 2")
+
+    def test_five(self):
+        game = Game()
+        figures = FenConverter.fen_converter(game, "r3k2r/8/8/8/8/8/8/R3K2R w Kq - 0 1")
+        king = next(figure for figure in figures if (figure.x, figure.y) == (4, 7))
+        self.assertIsInstance(king, King)
+        self.assertFalse(king.been_moved)
+        self.assertEqual(FenConverter.into_fen_converter(figures), "r3k2r/8/8/8/8/8/8/R3K2R w Kq - 0 1")
+
+    def test_six(self):
+        for fen in ["rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBN w KQkq - 0 1", "8/8/8/8/8/8/8/K6k x - - 0 1",
+                    "8/8/8/8/8/8/8/K6x w - - 0 1", "8/8/8/8/8/8/8/K6k w KK - 0 1", "8/8/8/8/8/8/8/K6k w - e4 0 1",
+                    "8/8/8/8/8/8/8/K6k w - - a 1", "8/8/8/8/8/8/8/K6k w - - 0 1 2", "8/8/8/8/8/8/8/K5k1k w - - 0 1",
+                    ""]:
+            with self.assertRaises(ValueError):
+                Position.from_fen(fen)
+
+    def test_seven(self):
+        position = Position.from_fen("4k3/8/8/8/8/8/4P3/4K2R w K - 5 9")
+        for move in movegen.legal_moves(position):
+            position.make_move(move)
+            self.assertEqual(position.turn, BLACK)
+            position.unmake_move()
+            self.assertEqual(position.to_fen(), "4k3/8/8/8/8/8/4P3/4K2R w K - 5 9")
+        position.make_move(next(move for move in movegen.legal_moves(position) if move[1] == 44))
+        self.assertEqual(position.halfmove_clock, 0)
+        position.make_move(movegen.legal_moves(position)[0])
+        self.assertEqual((position.halfmove_clock, position.fullmove_number, position.turn), (1, 10, WHITE))
+
+    def test_eight(self):
+        fen = "4k3/8/8/8/8/8/8/4K3 w K - 0 1"
+        position = Position.from_fen(fen)
+        self.assertEqual((position.castling, position.to_fen()), (0, "4k3/8/8/8/8/8/8/4K3 w - - 0 1"))
+        self.assertEqual(len(movegen.legal_moves(position)), 5)
+        self.assertEqual(analyse_line(1, fen).legal_moves, 5)
+        game = Game(fen)
+        king = next(figure for figure in game.figures if figure.kind == KING and figure.color == WHITE)
+        self.assertEqual(len(game.get_legal_targets(king)), 5)
+        self.assertEqual(Position.from_fen("r3k2r/8/8/8/8/8/8/R3K1R1 b KQkq - 0 1").castling,
+                         WHITE_LONG | BLACK_SHORT | BLACK_LONG)
+
+    def test_nine(self):
+        # the en passant square has to be behind a pawn of the side that has just moved
+        for fen in ["4k3/8/8/8/8/8/3P4/4K3 w - e3 0 1", "4k3/8/8/4p3/8/8/8/4K3 w - e3 0 1",
+                    "4k3/8/8/4P3/8/8/8/4K3 w - e6 0 1", "4k3/8/8/8/4p3/8/8/4K3 b - e3 0 1"]:
+            with self.assertRaises(ValueError):
+                Position.from_fen(fen)
+        position = Position.from_fen("4k3/8/8/3Pp3/8/8/8/4K3 w - e6 0 1")
+        self.assertEqual(len(movegen.legal_moves(position)), 7)
+        self.assertEqual(Position.from_fen("4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1").to_fen(),
+                         "4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1")
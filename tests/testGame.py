@@ -0,0 +1,134 @@
+import random
+import unittest
+from unittest import mock
+
+import pygame
+
+from game.core.position import QUEEN, to_coords, to_square
+from game.game import Game
+
+from models.pawn import Pawn
+from models.queen import Queen
+from models.rook import Rook
+
+
+def play(game, start, target):
+    game.get_figure_in_coords(start).move(*target)
+
+
+def assert_index_in_sync(test, game):
+    expected = [None] * 64
+    for figure in game.figures:
+        expected[to_square(figure.x, figure.y)] = figure
+    test.assertEqual(game.squares, expected)
+
+
+class GameTest(unittest.TestCase):
+
+    def test_one(self):
+        game = Game()
+        play(game, (4, 6), (4, 4))
+        self.assertIsInstance(game.get_figure_in_coords((4, 4)), Pawn)
+        self.assertIsNone(game.get_figure_in_coords((4, 6)))
+        assert_index_in_sync(self, game)
+
+    def test_two(self):
+        game = Game()
+        for start, target in [((4, 6), (4, 4)), ((0, 1), (0, 2)), ((4, 4), (4, 3)), ((3, 1), (3, 3)),
+                              ((4, 3), (3, 2))]:
+            play(game, start, target)
+        self.assertIsNone(game.get_figure_in_coords((3, 3)))
+        self.assertEqual(len(game.figures), 31)
+        assert_index_in_sync(self, game)
+
+    def test_three(self):
+        game = Game()
+        for start, target in [((4, 6), (4, 4)), ((4, 1), (4, 3)), ((6, 7), (5, 5)), ((1, 0), (2, 2)),
+                              ((5, 7), (2, 4)), ((6, 0), (5, 2)), ((4, 7), (6, 7))]:
+            play(game, start, target)
+        self.assertIsInstance(game.get_figure_in_coords((5, 7)), Rook)
+        self.assertIsNone(game.get_figure_in_coords((7, 7)))
+        assert_index_in_sync(self, game)
+
+    def test_four(self):
+        game = Game()
+        for start, target in [((7, 6), (7, 4)), ((6, 1), (6, 3)), ((7, 4), (6, 3)), ((7, 1), (7, 2)),
+                              ((6, 3), (6, 2)), ((0, 1), (0, 2)), ((6, 2), (6, 1)), ((0, 2), (0, 3)),
+                              ((6, 1), (7, 0))]:
+            play(game, start, target)
+        self.assertIsInstance(game.get_figure_in_coords((7, 0)), Queen)
+        assert_index_in_sync(self, game)
+
+    def test_five(self):
+        game = Game()
+        game.status_outdated = game.redraw_needed = False
+        self.assertFalse(game.get_figure_in_coords((4, 6)).move(4, 3))
+        self.assertFalse(game.status_outdated)
+        self.assertTrue(game.get_figure_in_coords((4, 6)).move(4, 4))
+        self.assertTrue(game.status_outdated and game.redraw_needed)
+
+    def test_six(self):
+        game = Game()
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        game.run()
+        self.assertFalse(game.keep_doing)
+        self.assertFalse(game.status_outdated)
+
+    def test_seven(self):
+        game = Game()
+        knight = game.get_figure_in_coords((6, 7))
+        game.selected_figure = knight
+        knight.select()
+        self.assertEqual(sorted(game.get_legal_targets(knight)), [(5, 5), (7, 5)])
+        with mock.patch("game.core.movegen.legal_moves") as legal_moves:
+            game.draw()
+            game.draw()
+            self.assertEqual(sorted(knight.get_legal_moves()), [(5, 5), (7, 5)])
+            legal_moves.assert_not_called()
+        knight.move(5, 5)
+        self.assertIsNone(game.legal_targets)
+        self.assertEqual(sorted(game.get_figure_in_coords((6, 0)).get_legal_moves()), [(5, 2), (7, 2)])
+
+    def test_eight(self):
+        game = Game("r3k2r/1P4p1/8/3pP3/8/8/8/R3K2R w KQkq d6 0 30")
+        figures = set(game.figures)
+        generator = random.Random(1)
+        fens = [game.get_fen()]
+        for _ in range(30):
+            moves = [move for move in game.get_status().legal_moves if move[2] in (0, QUEEN)]
+            if not moves:
+                break
+            start, target, _ = generator.choice(moves)
+            game.get_figure_in_coords(to_coords(start)).move(*to_coords(target))
+            fens.append(game.get_fen())
+            assert_index_in_sync(self, game)
+        for fen in reversed(fens[:-1]):
+            self.assertTrue(game.undo())
+            self.assertEqual(game.get_fen(), fen)
+            assert_index_in_sync(self, game)
+        self.assertFalse(game.undo())
+        self.assertEqual(game.figures, figures)
+        for fen in fens[1:]:
+            self.assertTrue(game.redo())
+            self.assertEqual(game.get_fen(), fen)
+        self.assertFalse(game.redo())
+        self.assertEqual(len(game.record), len(fens) - 1)
+
+    def test_nine(self):
+        game = Game()
+        play(game, (4, 6), (4, 4))
+        play(game, (4, 1), (4, 3))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_z, mod=pygame.KMOD_LCTRL))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_LEFT, mod=0))
+        game.process_events()
+        self.assertEqual(game.ply, 0)
+        self.assertIsNotNone(game.get_figure_in_coords((4, 6)))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_y, mod=pygame.KMOD_LCTRL))
+        game.process_events()
+        self.assertEqual((game.ply, game.turn), (1, 0))
+        self.assertIsNotNone(game.get_figure_in_coords((4, 4)))
+        redo_event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_z, mod=pygame.KMOD_RCTRL | pygame.KMOD_LSHIFT)
+        pygame.event.post(redo_event)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_z, mod=0))
+        game.process_events()
+        self.assertEqual(game.ply, 2)
@@ -88,3 +88,25 @@ class LegalMoveTest(unittest.TestCase):
         f = get_figure(arrangement, King, 7, 1)
         util = GameStatusHandler(arrangement)
         self.assertEqual(util.is_move_legal(f, (6, 1)), False)
+
+    def test_eleven(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "4r2k/8/8/8/8/8/4B3/4K3")
+        f = get_figure(arrangement, Bishop, 4, 6)
+        util = GameStatusHandler(arrangement)
+        self.assertEqual(util.get_legal_moves(f), [])
+
+    def test_twelve(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "4r2k/8/8/8/8/3n4/3Q4/4K3")
+        f = get_figure(arrangement, Queen, 3, 6)
+        util = GameStatusHandler(arrangement)
+        self.assertEqual(util.get_legal_moves(f), [])
+        self.assertEqual(sorted(util.get_legal_moves(util.find_king(1))), [(3, 7), (5, 7)])
+
+    def test_thirteen(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "7k/8/8/8/r3K3/8/3P4/8")
+        f = get_figure(arrangement, Pawn, 3, 6)
+        util = GameStatusHandler(arrangement)
+        self.assertEqual(sorted(util.get_legal_moves(f)), [(3, 4)])
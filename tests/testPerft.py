@@ -0,0 +1,69 @@
+import unittest
+
+from game.core import bitboard
+from game.core.bitboard import BitboardPosition
+from game.core.perft import perft, divide, move_to_uci, parallel_divide
+from game.core.position import Position
+
+START = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+POSITION_3 = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+POSITION_4 = "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"
+POSITION_5 = "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"
+POSITION_6 = "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"
+
+
+class PerftTest(unittest.TestCase):
+
+    def check(self, fen, expected):
+        for depth, nodes in enumerate(expected, start=1):
+            self.assertEqual(perft(Position.from_fen(fen), depth), nodes)
+
+    def test_one(self):
+        self.check(START, [20, 400, 8902, 197281])
+
+    def test_two(self):
+        self.check(KIWIPETE, [48, 2039, 97862])
+
+    def test_three(self):
+        self.check(POSITION_3, [14, 191, 2812, 43238])
+
+    def test_four(self):
+        self.check(POSITION_4, [6, 264, 9467])
+
+    def test_five(self):
+        self.check(POSITION_5, [44, 1486, 62379])
+
+    def test_six(self):
+        self.check(POSITION_6, [46, 2079, 89890])
+
+    def test_seven(self):
+        self.assertEqual(perft(BitboardPosition.from_fen(KIWIPETE), 3), 97862)
+        for fen, nodes in [(START, 8902), (KIWIPETE, 97862), (POSITION_3, 2812), (POSITION_4, 9467)]:
+            position = BitboardPosition.from_fen(fen)
+            self.assertEqual(perft(position, 3, bitboard), nodes)
+            self.assertEqual(position.to_fen(), fen)
+            self.assertEqual(position.toggles, [])
+
+    def test_eight(self):
+        position = Position.from_fen(START)
+        counts = {move_to_uci(move): nodes for move, nodes in divide(position, 3).items()}
+        self.assertEqual(len(counts), 20)
+        self.assertEqual(counts["e2e4"], 600)
+        self.assertEqual(sum(counts.values()), 8902)
+        self.assertEqual(position.history, [])
+
+    def test_nine(self):
+        position = Position.from_fen(KIWIPETE)
+        self.assertEqual(parallel_divide(position, 2, workers=2), divide(position, 2))
+
+    def test_ten(self):
+        position = Position.from_fen(START)
+        self.assertEqual(perft(position, 0), 1)
+        self.assertEqual(perft(position, -1), 1)
+        for depth in (0, -1):
+            with self.assertRaises(ValueError):
+                divide(position, depth)
+            with self.assertRaises(ValueError):
+                parallel_divide(position, depth, workers=2)
+        self.assertEqual(position.history, [])
@@ -0,0 +1,90 @@
+import io
+import random
+import unittest
+
+from game.core import movegen
+from game.core.position import Position, START_FEN
+from game.utils.pgn import PgnGame, game_from_moves, format_game, read_games, write_game
+
+PGN = """[Event "F/S Return Match"]
+[Site "Belgrade, Serbia JUG"]
+[Date "1992.11.04"]
+[Round "29"]
+[White "Fischer, Robert J."]
+[Black "Spassky, Boris V."]
+[Result "1/2-1/2"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 {This opening is called the Ruy Lopez.} 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3
+O-O 9. h3 Nb8 10. d4 Nbd7 11. c4 c6 12. cxb5 axb5 13. Nc3 Bb7 14. Bg5 b4 15. Nb1 h6 16. Bh4 c5 17. dxe5
+Nxe4 18. Bxe7 Qxe7 19. exd6 Qf6 20. Nbd2 Nxd6 21. Nc4 Nxc4 22. Bxc4 Nb6 23. Ne5 Rae8 24. Bxf7+ Rxf7 25. Nxf7
+Rxe1+ 26. Qxe1 Kxf7 27. Qe3 Qg5 28. Qxg5 hxg5 29. b3 Ke6 30. a3 Kd6 31. axb4 cxb4 32. Ra5 Nd5 33. f3 Bc8 34. Kf2
+Bf5 35. Ra7 g6 36. Ra6+ Kc5 37. Ke1 Nf4 38. g3 Nxh3 39. Kd2 Kb5 40. Rd6 Kc5 41. Ra6 Nf2 42. g4 Bd3 43. Re6 1/2-1/2
+
+[Event "Annotated \\"test\\""]
+[SetUp "1"]
+[FEN "4k3/1P6/8/8/8/8/8/4K2R b K - 0 40"]
+
+40... Kd7 $1 (40... Kf7 41. b8=Q) 41. b8=N+ {a comment
+over two lines} Kc7 ; the rest of the line is a comment 1. e4
+42. O-O *
+"""
+
+
+class PgnTest(unittest.TestCase):
+
+    def test_one(self):
+        games = list(read_games(io.StringIO(PGN)))
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games[0].tags["White"], "Fischer, Robert J.")
+        self.assertEqual((len(games[0].moves), games[0].result), (85, "1/2-1/2"))
+        self.assertEqual(games[0].replay().to_fen(), "8/8/4R1p1/2k3p1/1p4P1/1P1b1P2/3K1n2/8 b - - 2 43")
+
+    def test_two(self):
+        game = list(read_games(io.StringIO(PGN)))[1]
+        self.assertEqual(game.tags["Event"], 'Annotated "test"')
+        self.assertEqual((game.moves, game.result), (["Kd7", "b8=N+", "Kc7", "O-O"], "*"))
+        self.assertEqual(game.replay().to_fen(), "1N6/2k5/8/8/8/8/8/5RK1 b - - 2 42")
+
+    def test_three(self):
+        for game in read_games(io.StringIO(PGN)):
+            output = io.StringIO()
+            write_game(game, output)
+            self.assertEqual(list(read_games(io.StringIO(output.getvalue()))), [game._replace(
+                tags={**{name: "?" for name in ("Event", "Site", "Date", "Round", "White", "Black")}, **game.tags,
+                      "Result": game.result})])
+            self.assertTrue(all(len(line) <= 80 for line in output.getvalue().splitlines()))
+
+    def test_four(self):
+        generator = random.Random(7)
+        for _ in range(10):
+            position = Position.from_fen(START_FEN)
+            moves = []
+            for _ in range(80):
+                legal_moves = movegen.legal_moves(position)
+                if not legal_moves:
+                    break
+                moves.append(generator.choice(legal_moves))
+                position.make_move(moves[-1])
+            game = next(read_games(io.StringIO(format_game(game_from_moves(moves)))))
+            self.assertEqual([entry[0] for entry in game.replay().history], moves)
+
+    def test_five(self):
+        game = game_from_moves([(12, 28, 0)], {"White": "A"}, "4k3/4p3/8/8/8/8/8/4K3 b - - 0 1")
+        self.assertEqual(game, PgnGame({"White": "A", "SetUp": "1", "FEN": "4k3/4p3/8/8/8/8/8/4K3 b - - 0 1",
+                                        "Result": "*"}, ["e5"], "*"))
+        self.assertIn("\n1... e5 *\n", format_game(game))
+
+    def test_six(self):
+        game = next(read_games(io.StringIO("1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7#\n")))
+        self.assertEqual(game.result, "*")
+        self.assertTrue(movegen.is_mate(game.replay(), 0))
+        with self.assertRaises(ValueError):
+            PgnGame({}, ["e4", "e4"], "*").replay()
+
+    def test_seven(self):
+        game = next(read_games(io.StringIO(PGN)))
+        record = game.record(checkpoint_interval=10)
+        self.assertEqual(len(record), 85)
+        self.assertEqual(record.position_at(85).to_fen(), game.replay().to_fen())
+        self.assertEqual(record.position_at(7).to_fen(),
+                         "r1bqkbnr/1ppp1ppp/p1n5/4p3/B3P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 1 4")
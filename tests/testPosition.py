@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from game.core import movegen
+from game.core.position import Position, WHITE, BLACK, KING, ROOK, WHITE_SHORT, WHITE_LONG, BLACK_SHORT, \
+    BLACK_LONG, to_square
+from game.utils.fen import FenConverter
+from game.game import Game
+
+
+class PositionTest(unittest.TestCase):
+
+    def test_one(self):
+        game = Game()
+        position = Position.from_figures(game.figures)
+        self.assertEqual(len(movegen.legal_moves(position)), 20)
+        self.assertEqual(position.castling, WHITE_SHORT | WHITE_LONG | BLACK_SHORT | BLACK_LONG)
+
+    def test_two(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "r3k2r/8/8/8/8/8/8/R3K2R")
+        for figure in arrangement:
+            if (figure.x, figure.y) == (7, 7):
+                figure.been_moved = True
+        position = Position.from_figures(arrangement)
+        self.assertEqual(position.castling, WHITE_LONG | BLACK_SHORT | BLACK_LONG)
+
+    def test_three(self):
+        board = [0] * 64
+        board[to_square(4, 7)] = KING
+        board[to_square(7, 7)] = ROOK
+        board[to_square(4, 0)] = -KING
+        position = Position(board, WHITE, WHITE_SHORT)
+        position.make_move((to_square(4, 7), to_square(6, 7), 0))
+        self.assertEqual(position.board[to_square(5, 7)], ROOK)
+        self.assertEqual(position.kings[WHITE], to_square(6, 7))
+        self.assertEqual(position.castling, 0)
+        self.assertEqual(position.turn, BLACK)
+
+    def test_four(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "4k3/8/8/3pP3/8/8/8/4K3")
+        pawn = next(figure for figure in arrangement if (figure.x, figure.y) == (3, 3))
+        position = Position.from_figures(arrangement, WHITE, pawn)
+        self.assertIn((to_square(4, 3), to_square(3, 2), 0), movegen.legal_moves(position))
+
+    def test_five(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "r3k2r/p1ppqPb1/bn2pnp1/3PN3/Pp2P3/2N2Q1p/1PPBBPpP/R3K2R")
+        pawn = next(figure for figure in arrangement if (figure.x, figure.y) == (0, 4))
+        position = Position.from_figures(arrangement, BLACK, pawn)
+        board, castling, en_passant = list(position.board), position.castling, position.en_passant
+        for move in movegen.pseudo_legal_moves(position):
+            position.make_move(move)
+            self.assertEqual(position.unmake_move(), move)
+            self.assertEqual(position.board, board)
+            self.assertEqual((position.castling, position.en_passant, position.turn), (castling, en_passant, BLACK))
+        self.assertEqual(position.history, [])
+
+    def test_six(self):
+        game = Game()
+        arrangement = FenConverter.fen_converter(game, "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1")
+        position = Position.from_figures(arrangement)
+        for side in (WHITE, BLACK):
+            looked_up = {square for square in range(64) if movegen.is_square_attacked(position, square, side)}
+            self.assertEqual(looked_up, movegen.attacked_squares(position, side))
+
+    def test_seven(self):
+        for fen in ["rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1", "8/8/8/8/8/8/8/K6k w - - 37 80",
+                    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w Kq - 3 12"]:
+            self.assertEqual(Position.from_fen(fen).to_fen(), fen)
+        self.assertEqual(Position.from_fen("8/8/8/8/8/8/8/K6k w - -").to_fen(), "8/8/8/8/8/8/8/K6k w - - 0 1")
+
+    def test_eight(self):
+        code = ("import sys; sys.modules['pygame'] = None; "
+                "import models.pawn, models.king, game.utils.fen, game.utils.game_status_handler, game.core.perft, "
+                "game.utils.pgn")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=False)
+        self.assertEqual(result.returncode, 0, result.stderr)
@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from game.core import movegen
+from game.core.position import Position, START_FEN
+from game.core.record import GameRecord
+from game.game import Game
+
+
+def random_moves(seed, plies):
+    generator = random.Random(seed)
+    position = Position.from_fen(START_FEN)
+    fens, moves = [position.to_fen()], []
+    for _ in range(plies):
+        legal_moves = movegen.legal_moves(position)
+        if not legal_moves:
+            break
+        moves.append(generator.choice(legal_moves))
+        position.make_move(moves[-1])
+        fens.append(position.to_fen())
+    return moves, fens
+
+
+class RecordTest(unittest.TestCase):
+
+    def test_one(self):
+        moves, fens = random_moves(3, 100)
+        record = GameRecord.from_moves(moves, checkpoint_interval=8)
+        self.assertEqual(len(record.checkpoints), len(moves) // 8 + 1)
+        for ply, fen in enumerate(fens):
+            self.assertEqual(record.position_at(ply).to_fen(), fen)
+        with self.assertRaises(IndexError):
+            record.position_at(len(moves) + 1)
+
+    def test_two(self):
+        moves, fens = random_moves(5, 60)
+        record = GameRecord.from_moves(moves, checkpoint_interval=10)
+        plies = [59, 3, 0, 21, 22, 40, 41]
+        self.assertEqual([(ply, position.to_fen()) for ply, position in record.positions_at(plies)],
+                         [(ply, fens[ply]) for ply in sorted(plies)])
+
+    def test_three(self):
+        moves, fens = random_moves(11, 50)
+        record = GameRecord.from_moves(moves, checkpoint_interval=4)
+        record.truncate(20)
+        self.assertEqual((len(record), len(record.checkpoints)), (20, 6))
+        self.assertEqual(record.tip.to_fen(), fens[20])
+        record.append(moves[20])
+        self.assertEqual(record.position_at(21).to_fen(), fens[21])
+        position = record.position_at(21, 9)
+        self.assertEqual(position.to_fen(), fens[21])
+        self.assertGreaterEqual(len(position.history), 9)
+        self.assertEqual([entry[0] for entry in position.history], record.moves[21 - len(position.history):])
+
+    def test_four(self):
+        game = Game()
+        for start, target in [((4, 6), (4, 4)), ((4, 1), (4, 3)), ((6, 7), (5, 5))]:
+            game.get_figure_in_coords(start).move(*target)
+        self.assertEqual((len(game.record), game.ply), (3, 3))
+        self.assertEqual(game.record.tip.to_fen(), game.get_fen())
+        self.assertTrue(game.undo())
+        self.assertEqual(game.get_fen(), "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq e6 0 2")
+        self.assertTrue(game.undo() and game.undo())
+        self.assertFalse(game.undo())
+        self.assertEqual(game.get_fen(), START_FEN)
+        self.assertTrue(game.redo())
+        self.assertEqual(game.get_fen(), "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1")
+        game.get_figure_in_coords((3, 1)).move(3, 3)
+        self.assertEqual((len(game.record), game.ply), (2, 2))
+        self.assertFalse(game.redo())
+        self.assertEqual(game.record.tip.to_fen(), game.get_fen())
@@ -0,0 +1,59 @@
+import unittest
+
+from game.core import movegen
+from game.core.position import Position, QUEEN, KNIGHT, parse_square
+from game.core.san import move_to_san, parse_san
+
+
+def san_moves(fen):
+    position = Position.from_fen(fen)
+    return {move_to_san(position, move): move for move in movegen.legal_moves(position)}
+
+
+class SanTest(unittest.TestCase):
+
+    def test_one(self):
+        moves = san_moves("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        self.assertEqual(len(moves), 20)
+        self.assertIn("e4", moves)
+        self.assertIn("Nf3", moves)
+
+    def test_two(self):
+        moves = san_moves("7k/8/8/8/1N3N2/8/1N6/K7 w - - 0 1")
+        for san in ("Nb4d3", "N2d3", "Nfd3", "Nbd5", "Nfd5", "Na4"):
+            self.assertIn(san, moves)
+        self.assertNotIn("Nd3", moves)
+
+    def test_three(self):
+        moves = san_moves("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        self.assertIn("O-O", moves)
+        self.assertIn("O-O-O", moves)
+        self.assertIn("Qxf6", moves)
+        self.assertIn("dxe6", moves)
+        self.assertIn("Bxa6", moves)
+
+    def test_four(self):
+        moves = san_moves("4k3/1P6/8/8/8/8/8/4K2R w K - 0 1")
+        for san in ("b8=Q+", "b8=N", "Rh8+", "O-O"):
+            self.assertIn(san, moves)
+        self.assertIn("Ra8#", san_moves("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"))
+
+    def test_five(self):
+        position = Position.from_fen("4k3/1P6/8/8/8/8/8/4K2R w K - 0 1")
+        self.assertEqual(parse_san(position, "b8=Q+"), (parse_square("b7"), parse_square("b8"), QUEEN))
+        self.assertEqual(parse_san(position, "b8N"), (parse_square("b7"), parse_square("b8"), KNIGHT))
+        self.assertEqual(parse_san(position, "0-0"), (parse_square("e1"), parse_square("g1"), 0))
+        self.assertEqual(parse_san(position, "Rh8+!?"), (parse_square("h1"), parse_square("h8"), 0))
+        for san in ("O-O-O", "b8", "Nf3", "e4", "xyz", "Kd1d2"):
+            with self.assertRaises(ValueError):
+                parse_san(position, san)
+
+    def test_six(self):
+        position = Position.from_fen("7k/8/8/8/1N3N2/8/1N6/K7 w - - 0 1")
+        with self.assertRaises(ValueError):
+            parse_san(position, "Nd3")
+        with self.assertRaises(ValueError):
+            parse_san(position, "Nbd3")
+        self.assertEqual(parse_san(position, "Nb2d3"), (parse_square("b2"), parse_square("d3"), 0))
+        for move in movegen.legal_moves(position):
+            self.assertEqual(parse_san(position, move_to_san(position, move)), move)
@@ -0,0 +1,63 @@
+import threading
+import unittest
+
+from game.core import search
+from game.core.position import Position, parse_square
+from game.core.evaluation import EvaluatedPosition
+from game.core.search import Searcher, MATE_BOUND
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+def square_move(start, target):
+    return parse_square(start), parse_square(target), 0
+
+
+class SearchTest(unittest.TestCase):
+
+    def test_one(self):
+        result = Searcher().search(Position.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), 4)
+        self.assertEqual(result.move, square_move("a1", "a8"))
+        self.assertGreater(result.score, MATE_BOUND)
+
+    def test_two(self):
+        result = Searcher().search(Position.from_fen("1k1r4/pp6/8/8/8/8/1q3PPP/3R2K1 w - - 0 1"), 3)
+        self.assertEqual(result.move, square_move("d1", "d8"))
+        result = Searcher().search(Position.from_fen("4k3/8/8/3q4/8/8/8/3RK3 w - - 0 1"), 3)
+        self.assertEqual(result.move, square_move("d1", "d5"))
+
+    def test_three(self):
+        self.assertIsNone(Searcher().search(Position.from_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1"), 3).move)
+        position = EvaluatedPosition.from_fen(KIWIPETE)
+        self.assertEqual(Searcher().search(position, 3).move, Searcher().search(Position.from_fen(KIWIPETE), 3).move)
+        self.assertEqual(position.scores, [])
+
+    def test_four(self):
+        infos = []
+        position = Position.from_fen(KIWIPETE)
+        result = Searcher().search(position, 3, on_iteration=infos.append)
+        self.assertEqual([info.depth for info in infos], [1, 2, 3])
+        self.assertEqual(result, infos[-1])
+        self.assertGreater(result.nodes, 0)
+        self.assertGreater(result.nps, 0)
+        self.assertEqual(result.pv[0], result.move)
+        self.assertEqual(position.to_fen(), KIWIPETE)
+
+    def test_five(self):
+        position = Position.from_fen(KIWIPETE)
+        result = Searcher().search(position, 64, time_limit=0.3)
+        self.assertIsNotNone(result.move)
+        self.assertLess(result.time, 1.0)
+        self.assertEqual((position.to_fen(), position.history), (KIWIPETE, []))
+        stop_event = threading.Event()
+        stop_event.set()
+        result = Searcher().search(position, 64, stop_event=stop_event)
+        self.assertIsNotNone(result.move)
+        self.assertEqual(position.to_fen(), KIWIPETE)
+
+    def test_six(self):
+        position = Position.from_fen("6k1/8/8/8/8/8/8/1N4K1 w - - 0 1")
+        for move in [("b1", "c3"), ("g8", "h8"), ("c3", "b1"), ("h8", "g8")]:
+            self.assertFalse(search._is_repetition(position))
+            position.make_move(square_move(*move))
+        self.assertTrue(search._is_repetition(position))
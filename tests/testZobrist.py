@@ -0,0 +1,43 @@
+import unittest
+
+from game.core import movegen, zobrist
+from game.core.bitboard import BitboardPosition
+from game.core.position import Position, parse_square
+from game.game import Game
+
+
+def walk(test, position, depth):
+    test.assertEqual(position.key, zobrist.compute_key(position))
+    if depth == 0:
+        return
+    for move in movegen.legal_moves(position):
+        position.make_move(move)
+        walk(test, position, depth - 1)
+        position.unmake_move()
+
+
+class ZobristTest(unittest.TestCase):
+
+    def test_one(self):
+        position = Position.from_fen("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        key = position.key
+        walk(self, position, 2)
+        self.assertEqual(position.key, key)
+
+    def test_two(self):
+        walk(self, BitboardPosition.from_fen("r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"), 2)
+
+    def test_three(self):
+        first = Position.from_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+        second = first.copy()
+        for start, target in [("g1", "f3"), ("g8", "f6"), ("b1", "c3")]:
+            first.make_move((parse_square(start), parse_square(target), 0))
+        for start, target in [("b1", "c3"), ("g8", "f6"), ("g1", "f3")]:
+            second.make_move((parse_square(start), parse_square(target), 0))
+        self.assertEqual(first.key, second.key)
+        self.assertNotEqual(first.key, Position.from_fen(first.to_fen().replace(" b ", " w ")).key)
+
+    def test_four(self):
+        game = Game()
+        self.assertEqual(game.get_position().key, Position.from_fen(
+            "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1").key)